@@ -0,0 +1,24 @@
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent
+
+# Components whose tests/ import their siblings as top-level modules
+COMPONENTS = [ROOT / 'scraper', ROOT / 'training', ROOT / 'web' / 'backend']
+
+def use_component(component):
+    """
+    Put component first on sys.path and drop any same-named module another
+    component's tests imported (scraper, training and the backend each have
+    their own positions, store, ... modules).
+    """
+    sys.path.insert(0, str(component))
+    for name in [p.stem for p in component.glob('*.py')] + [p.parent.name for p in component.glob('*/__init__.py')]:
+        mod = sys.modules.get(name)
+        if mod is not None and not str(getattr(mod, '__file__', '') or '').startswith(str(component)):
+            del sys.modules[name]
+
+def pytest_collectstart(collector):
+    path = getattr(collector, 'path', None)
+    if path is not None and path.name == 'tests' and path.parent in COMPONENTS:
+        use_component(path.parent)
@@ -0,0 +1,94 @@
+"""
+Offline scraper benchmarks.
+
+    python bench.py record 2015          # fetch a draft class live, saving every page
+    python bench.py run 2015 --repeat 3  # time the extractors against the recording
+
+Recordings live under raw-data/replay/<year>; `run` never touches the network.
+"""
+import argparse
+import logging
+import os
+import statistics
+import time
+
+import network
+import extractors
+from replay import Recorder, ReplayTransport, REPLAY_DIR
+from scraper import get_draft_picks, get_player_meta, get_college_stats, process_player
+from store import SummaryStore
+
+logger = logging.getLogger(__name__)
+
+def record(year, fixture_dir):
+    """
+    Scrape a full draft class with a Recorder attached to get_soup. The
+    summary stores and the response cache are bypassed so every page the
+    replay will ask for is actually fetched, and therefore recorded.
+    """
+    extractors.team_summaries = SummaryStore()
+    extractors.college_summaries = SummaryStore()
+    network.USE_CACHE = False
+    network.recorder = Recorder(fixture_dir)
+    picks = [p for p in get_draft_picks(year) if p['name'] != '']
+    for pick in picks:
+        process_player(pick, year)
+    logger.info(f"Recorded {len(network.recorder.index)} pages for {year} in {fixture_dir}")
+
+def timed(timings, name, fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    timings.setdefault(name, []).append(time.perf_counter() - start)
+    return result
+
+def run_once(year, timings):
+    """
+    Time each extractor over a recorded draft class, with the summary
+    stores reset so team pages are parsed every pass.
+    """
+    extractors.team_summaries = SummaryStore()
+    extractors.college_summaries = SummaryStore()
+    picks = timed(timings, 'get_draft_picks', get_draft_picks, year)
+    for pick in picks:
+        if pick['name'] == '':
+            continue
+        _, cbb_url, _, _, _, main_team = timed(timings, 'get_player_meta', get_player_meta, pick['bbref_url'])
+        if not cbb_url:
+            continue
+        timed(timings, 'get_college_stats', get_college_stats, cbb_url, pick['team'], pick['college'])
+        timed(timings, 'get_team_summary', extractors.get_team_summary, main_team, year)
+
+def report(timings):
+    print(f"{'function':<20}{'calls':>7}{'total s':>10}{'mean ms':>10}{'p95 ms':>10}")
+    for name, samples in timings.items():
+        ordered = sorted(samples)
+        p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+        print(f"{name:<20}{len(samples):>7}{sum(samples):>10.2f}"
+              f"{statistics.mean(samples) * 1000:>10.1f}{p95 * 1000:>10.1f}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Record or replay a draft class to benchmark the scraper.")
+    parser.add_argument('command', choices=['record', 'run'])
+    parser.add_argument('year', type=int)
+    parser.add_argument('--fixtures', default=REPLAY_DIR, help="directory holding per-year recordings")
+    parser.add_argument('--repeat', type=int, default=1, help="replay passes to time")
+    parser.add_argument('--parse-mode', choices=['fast', 'full'], default=network.PARSE_MODE)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s — %(levelname)s — %(message)s")
+    fixture_dir = os.path.join(args.fixtures, str(args.year))
+    network.PARSE_MODE = args.parse_mode
+
+    if args.command == 'record':
+        record(args.year, fixture_dir)
+        return
+
+    network.transport = ReplayTransport(fixture_dir)
+    timings = {}
+    for _ in range(args.repeat):
+        run_once(args.year, timings)
+    print(f"{args.year} draft class, parse mode {args.parse_mode}, {args.repeat} pass(es)")
+    report(timings)
+
+if __name__ == "__main__":
+    main()
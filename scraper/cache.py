@@ -0,0 +1,191 @@
+import hashlib
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+import zlib
+from datetime import date
+
+logger = logging.getLogger(__name__)
+
+CACHE_DIR = os.path.join("raw-data", "http-cache")
+MAX_CACHE_BYTES = 500 * 1024 * 1024  # compressed bytes kept on disk before LRU eviction
+
+# TTLs in seconds; None means the page never changes once its season is over
+IMMUTABLE = None
+PLAYER_TTL = 7 * 24 * 3600   # NBA career tables grow during the season
+CURRENT_TTL = 24 * 3600      # current-season draft/team pages and anything unrecognised
+
+# URL classes: (name, pattern). The first capture group, if any, is the season year.
+URL_CLASSES = [
+    ('draft',        re.compile(r'/draft/NBA_(\d{4})\.html')),
+    ('team',         re.compile(r'/teams/[A-Z]{3}/(\d{4})\.html')),
+    ('college_team', re.compile(r'/cbb/schools/[^/]+/(?:men/)?(\d{4})\.html')),
+    ('college',      re.compile(r'/cbb/players/')),
+    ('player',       re.compile(r'/players/')),
+]
+
+def url_class(url):
+    """
+    Return the URL class name ('draft', 'team', 'player', ...) or 'other'.
+    """
+    for name, pattern in URL_CLASSES:
+        if pattern.search(url or ''):
+            return name
+    return 'other'
+
+def season_finished(year, today=None):
+    """
+    Seasons are named by the year they end in; treat one as final after June.
+    """
+    today = today or date.today()
+    return year < today.year or (year == today.year and today.month >= 7)
+
+def ttl_for(url):
+    """
+    TTL policy per URL class: finished seasons and college careers are
+    immutable, NBA player pages and current seasons expire.
+    """
+    for name, pattern in URL_CLASSES:
+        m = pattern.search(url or '')
+        if not m:
+            continue
+        if name == 'college':
+            return IMMUTABLE
+        if name == 'player':
+            return PLAYER_TTL
+        return IMMUTABLE if season_finished(int(m.group(1))) else CURRENT_TTL
+    return CURRENT_TTL
+
+class CacheEntry:
+    def __init__(self, text, etag, last_modified, expires_at):
+        self.text = text
+        self.etag = etag
+        self.last_modified = last_modified
+        self.expires_at = expires_at
+
+    @property
+    def fresh(self):
+        return self.expires_at is None or self.expires_at > time.time()
+
+    def validators(self):
+        """
+        Conditional request headers for revalidating a stale entry.
+        """
+        headers = {}
+        if self.etag:
+            headers['If-None-Match'] = self.etag
+        if self.last_modified:
+            headers['If-Modified-Since'] = self.last_modified
+        return headers
+
+class ResponseCache:
+    """
+    Content-addressed HTML cache: zlib-compressed bodies stored as files
+    named by the SHA-256 of the URL, with an SQLite index holding
+    validators, expiry and last access for LRU eviction.
+    """
+    def __init__(self, cache_dir=CACHE_DIR, max_bytes=MAX_CACHE_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+        os.makedirs(cache_dir, exist_ok=True)
+        self.db = sqlite3.connect(
+            os.path.join(cache_dir, 'index.sqlite'), check_same_thread=False, timeout=60
+        )
+        self.db.execute("""
+            CREATE TABLE IF NOT EXISTS entries (
+                key           TEXT PRIMARY KEY,
+                url           TEXT NOT NULL,
+                etag          TEXT,
+                last_modified TEXT,
+                expires_at    REAL,
+                size          INTEGER NOT NULL,
+                last_access   REAL NOT NULL
+            )
+        """)
+        self.db.commit()
+
+    @staticmethod
+    def key(url):
+        return hashlib.sha256(url.encode('utf-8')).hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, key[:2], f"{key}.html.z")
+
+    def get(self, url):
+        """
+        Return a CacheEntry for url (fresh or stale), or None if not cached.
+        """
+        key = self.key(url)
+        with self.lock:
+            row = self.db.execute(
+                "SELECT etag, last_modified, expires_at FROM entries WHERE key = ?", (key,)
+            ).fetchone()
+            if not row:
+                return None
+            try:
+                with open(self._path(key), 'rb') as f:
+                    text = zlib.decompress(f.read()).decode('utf-8')
+            except (OSError, zlib.error):
+                self.db.execute("DELETE FROM entries WHERE key = ?", (key,))
+                self.db.commit()
+                return None
+            self.db.execute("UPDATE entries SET last_access = ? WHERE key = ?", (time.time(), key))
+            self.db.commit()
+        return CacheEntry(text, *row)
+
+    def put(self, url, text, etag=None, last_modified=None):
+        """
+        Store a response body and its validators, then evict down to max_bytes.
+        """
+        key = self.key(url)
+        ttl = ttl_for(url)
+        expires_at = None if ttl is IMMUTABLE else time.time() + ttl
+        blob = zlib.compress(text.encode('utf-8'), 6)
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with self.lock:
+            tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp, 'wb') as f:
+                f.write(blob)
+            os.replace(tmp, path)
+            self.db.execute(
+                "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, url, etag, last_modified, expires_at, len(blob), time.time())
+            )
+            self.db.commit()
+            self._evict()
+
+    def renew(self, url):
+        """
+        Reset the expiry of an entry after a 304 Not Modified.
+        """
+        ttl = ttl_for(url)
+        expires_at = None if ttl is IMMUTABLE else time.time() + ttl
+        with self.lock:
+            self.db.execute(
+                "UPDATE entries SET expires_at = ?, last_access = ? WHERE key = ?",
+                (expires_at, time.time(), self.key(url))
+            )
+            self.db.commit()
+
+    def _evict(self):
+        total = self.db.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for key, size in self.db.execute(
+            "SELECT key, size FROM entries ORDER BY last_access ASC"
+        ).fetchall():
+            try:
+                os.remove(self._path(key))
+            except OSError:
+                pass
+            self.db.execute("DELETE FROM entries WHERE key = ?", (key,))
+            total -= size
+            if total <= self.max_bytes:
+                break
+        self.db.commit()
+        logger.debug(f"Evicted cache entries down to {total} bytes")
@@ -1,42 +1,117 @@
+import logging
+import os
 import re
+from concurrent.futures import ThreadPoolExecutor
+import requests
 from bs4 import BeautifulSoup
-from network import get_soup
+from network import get_soup, MAX_WORKERS, RateLimited
+from cache import season_finished
+from store import SummaryStore
+
+logger = logging.getLogger(__name__)
 
 BBREF_BASE = 'https://www.basketball-reference.com'
 
-def get_team_summary(team_abbr: str, season_year: int) -> dict:
+# Team-season summaries shared across the run and persisted between runs
+TEAM_SUMMARY_PATH = os.path.join("raw-data", "team-summaries.sqlite")
+team_summaries = SummaryStore(TEAM_SUMMARY_PATH)
+
+# College team-season summaries, keyed on (school slug, season)
+COLLEGE_SUMMARY_PATH = os.path.join("raw-data", "college-summaries.sqlite")
+college_summaries = SummaryStore(COLLEGE_SUMMARY_PATH)
+COLLEGE_TEAM_LINK = re.compile(r'/cbb/schools/([^/]+)/(?:men/)?(\d{4})\.html')
+
+# Current franchise abbreviations, remapped per season by normalize_team_abbr
+NBA_TEAMS = [
+    'ATL', 'BOS', 'BRK', 'CHI', 'CHO', 'CLE', 'DAL', 'DEN', 'DET', 'GSW',
+    'HOU', 'IND', 'LAC', 'LAL', 'MEM', 'MIA', 'MIL', 'MIN', 'NOP', 'NYK',
+    'OKC', 'ORL', 'PHI', 'PHO', 'POR', 'SAC', 'SAS', 'TOR', 'UTA', 'WAS'
+]
+
+# Fields returned by get_team_summary and get_college_team_summary
+TEAM_SUMMARY_FIELDS = [
+    'PREV_YR_Win%', 'PREV_YR_PTS/G', 'PREV_YR_OPTS/G', 'PREV_YR_SRS', 'PREV_YR_Pace',
+    'PREV_YR_ORtg', 'PREV_YR_DRtg', 'PREV_YR_NRtg', 'PREV_YR_Expected_Win%',
+]
+COLLEGE_SUMMARY_FIELDS = ['CT_Win%', 'CT_PTS/G', 'CT_PTSA/G', 'CT_SRS', 'CT_SOS', 'CT_ORtg', 'CT_DRtg']
+
+# BBRef abbreviation history of renamed or relocated franchises: (first
+# season, abbreviation) pairs, newest first. '' marks seasons the franchise
+# didn't play, and seasons before the last entry have no team either.
+FRANCHISE_HISTORY = {
+    # Brooklyn Nets were the New Jersey Nets until 2013
+    'BRK': [(2013, 'BRK'), (1978, 'NJN')],
+    # Hornets were the Bobcats from 2005 to 2014; the original Hornets left for New Orleans after 2002
+    'CHO': [(2015, 'CHO'), (2005, 'CHA'), (2003, ''), (1989, 'CHH')],
+    # Grizzlies moved from Vancouver in 2002
+    'MEM': [(2002, 'MEM'), (1996, 'VAN')],
+    # Pelicans were the Hornets, playing in Oklahoma City in 2006 and 2007
+    'NOP': [(2014, 'NOP'), (2008, 'NOH'), (2006, 'NOK'), (2003, 'NOH')],
+    # Thunder were the Seattle SuperSonics until 2009
+    'OKC': [(2009, 'OKC'), (1968, 'SEA')],
+    # Wizards were the Bullets until 1998
+    'WAS': [(1998, 'WAS'), (1975, 'WSB')],
+}
+
+def normalize_team_abbr(team_abbr: str, season_year: int) -> str:
     """
-    Scrape the team page for {team_abbr}/{season_year} and return key
-    performance metrics in a flat dict, ensuring each field is present (defaulting to 0.0).
+    Map a franchise abbreviation to the one BBRef used in season_year, or
+    '' if the franchise didn't play that season.
     """
-    # Handle historical abbreviation changes relevant for 2011 to 2024
+    history = FRANCHISE_HISTORY.get(team_abbr)
+    if not history:
+        return team_abbr
+    for first_season, abbr in history:
+        if season_year >= first_season:
+            return abbr
+    return ''
 
-    # Brooklyn Nets (BRK) were New Jersey Nets (NJN) until 2013
-    if team_abbr == "BRK" and season_year < 2013:
-        team_abbr = "NJN"
-    # Pelicans (NOP) were the Hornets (NOH) until 2014
-    if team_abbr == "NOP" and season_year < 2014:
-        team_abbr = "NOH"
-    # Hornets (CHO) were the Bobcats (CHA) until 2015
-    if team_abbr == "CHO" and season_year < 2015:
-        team_abbr = "CHA"
+def get_team_summary(team_abbr: str, season_year: int) -> dict:
+    """
+    Return key performance metrics for {team_abbr}/{season_year} in a flat
+    dict, ensuring each field is present (defaulting to 0.0). Summaries are
+    memoized on the normalized (abbr, year) for the whole run, and finished
+    seasons are persisted to TEAM_SUMMARY_PATH.
+    """
+    team_abbr = normalize_team_abbr(team_abbr, season_year)
 
     # Player did not play for an NBA team despite getting drafted
     if team_abbr == '':
-        return {
-            'PREV_YR_Win%': 0,
-            'PREV_YR_PTS/G': 0,
-            'PREV_YR_OPTS/G': 0,
-            'PREV_YR_SRS': 0,
-            'PREV_YR_Pace': 0,
-            'PREV_YR_ORtg': 0,
-            'PREV_YR_DRtg': 0,
-            'PREV_YR_NRtg': 0,
-            'PREV_YR_Expected_Win%': 0
-        }
+        return {field: 0.0 for field in TEAM_SUMMARY_FIELDS}
     
+    return team_summaries.get_or_compute(
+        f"{team_abbr}-{season_year}",
+        lambda: fetch_team_summary(team_abbr, season_year),
+        persist=season_finished(season_year)
+    )
+
+def prefetch_team_summaries(season_year: int, max_workers=MAX_WORKERS):
+    """
+    Pull the team pages of every franchise that played in a season into
+    the summary store up front. A team whose page can't be fetched (an
+    HTTP error, or its host blocked after a 429) is logged and skipped,
+    leaving it to the players' own lookups.
+    """
+    teams = {normalize_team_abbr(t, season_year) for t in NBA_TEAMS} - {''}
+
+    def fetch(team):
+        try:
+            get_team_summary(team, season_year)
+        except (requests.HTTPError, RateLimited) as e:
+            logger.warning(f"Skipping {team} {season_year} team page: {e}")
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        list(pool.map(fetch, sorted(teams)))
+
+def fetch_team_summary(team_abbr: str, season_year: int) -> dict:
+    """
+    Scrape the team page for an already-normalized {team_abbr}/{season_year}.
+    Returns None if the page could not be fetched.
+    """
     url = f"{BBREF_BASE}/teams/{team_abbr}/{season_year}.html"    
     soup = get_soup(url)
+    if not soup:
+        return None
     summary = soup.find('div', {'data-template': 'Partials/Teams/Summary'})
 
     def team_stat(label: str) -> float:
@@ -92,119 +167,116 @@ def extract_sr_cbb_link(soup):
         return anchor['href'].split('?')[0]
     return None
 
-def get_stat(row, stat):
+# ─── Column maps: output field -> data-stat of the source <td> ─────────────
+ADVANCED_COLUMNS = {
+    'C_PER': 'per', 'C_TS%': 'ts_pct', 'C_3PAr': 'fg3a_per_fga_pct',
+    'C_FTr': 'fta_per_fga_pct', 'C_PProd': 'pprod',
+    'C_ORB%': 'orb_pct', 'C_DRB%': 'drb_pct', 'C_TRB%': 'trb_pct',
+    'C_AST%': 'ast_pct', 'C_STL%': 'stl_pct', 'C_BLK%': 'blk_pct',
+    'C_TOV%': 'tov_pct', 'C_USG%': 'usg_pct',
+    'C_OWS': 'ows', 'C_DWS': 'dws', 'C_WS': 'ws', 'C_WS/40': 'ws_per_40',
+    'C_OBPM': 'obpm', 'C_DBPM': 'dbpm', 'C_BPM': 'bpm',
+}
+
+PER40_COLUMNS = {
+    'C_FG/40': 'fg_per_min', 'C_FGA/40': 'fga_per_min',
+    'C_3P/40': 'fg3_per_min', 'C_3PA/40': 'fg3a_per_min',
+    'C_FT/40': 'ft_per_min', 'COLLEGE_FTA/40': 'fta_per_min',
+    'COLLEGE_ORB/40': 'orb_per_min', 'COLLEGE_DRB/40': 'drb_per_min',
+    'C_TRB/40': 'trb_per_min', 'C_AST/40': 'ast_per_min',
+    'C_STL/40': 'stl_per_min', 'C_BLK/40': 'blk_per_min',
+    'C_TOV/40': 'tov_per_min', 'C_PF/40': 'pf_per_min',
+    'C_PTS/40': 'pts_per_min',
+}
+
+PER100_COLUMNS = {
+    'C_FG/100': 'fg_per_poss', 'C_FGA/100': 'fga_per_poss',
+    'C_3P/100': 'fg3_per_poss', 'C_3PA/100': 'fg3a_per_poss',
+    'C_FT/100': 'ft_per_poss', 'C_FTA/100': 'fta_per_poss',
+    'C_ORB/100': 'orb_per_poss', 'C_DRB/100': 'drb_per_poss',
+    'C_TRB/100': 'trb_per_poss', 'C_AST/100': 'ast_per_poss',
+    'C_STL/100': 'stl_per_poss', 'C_BLK/100': 'blk_per_poss',
+    'C_TOV/100': 'tov_per_poss', 'C_PF/100': 'pf_per_poss',
+    'C_PTS/100': 'pts_per_poss', 'C_ORtg': 'off_rtg', 'C_DRtg': 'def_rtg',
+}
+
+COLLEGE_PER_GAME_COLUMNS = {
+    'COLLEGE_G': 'games', 'COLLEGE_GS': 'games_started',
+    'COLLEGE_MPG': 'mp_per_g',
+    'COLLEGE_FG': 'fg_per_g', 'COLLEGE_FGA': 'fga_per_g', 'COLLEGE_FG%': 'fg_pct',
+    'COLLEGE_3P': 'fg3_per_g', 'COLLEGE_3PA': 'fg3a_per_g', 'COLLEGE_3P%': 'fg3_pct',
+    'COLLEGE_FT': 'ft_per_g', 'COLLEGE_FTA': 'fta_per_g', 'COLLEGE_FT%': 'ft_pct',
+    'COLLEGE_DRB': 'drb_per_g', 'COLLEGE_ORB': 'orb_per_g', 'COLLEGE_TRB': 'trb_per_g',
+    'COLLEGE_AST': 'ast_per_g', 'COLLEGE_STL': 'stl_per_g', 'COLLEGE_BLK': 'blk_per_g',
+    'COLLEGE_TOV': 'tov_per_g', 'COLLEGE_PF': 'pf_per_g', 'COLLEGE_PTS': 'pts_per_g',
+}
+
+NBA_CAREER_COLUMNS = {
+    'NBA_G': 'games', 'NBA_GS': 'games_started', 'NBA_MP/G': 'mp_per_g',
+    'NBA_FG/G': 'fg_per_g', 'NBA_FGA/G': 'fga_per_g', 'NBA_FG%': 'fg_pct',
+    'NBA_3P/G': 'fg3_per_g', 'NBA_3PA/G': 'fg3a_per_g', 'NBA_3P%': 'fg3_pct',
+    'NBA_2P/G': 'fg2_per_g', 'NBA_2PA/G': 'fg2a_per_g', 'NBA_2P%': 'fg2_pct',
+    'NBA_eFG%': 'efg_pct',
+    'NBA_FT/G': 'ft_per_g', 'NBA_FTA/G': 'fta_per_g', 'NBA_FT%': 'ft_pct',
+    'NBA_ORB/G': 'orb_per_g', 'NBA_DRB/G': 'drb_per_g', 'NBA_TRB/G': 'trb_per_g',
+    'NBA_AST/G': 'ast_per_g', 'NBA_STL/G': 'stl_per_g', 'NBA_BLK/G': 'blk_per_g',
+    'NBA_TOV/G': 'tov_per_g', 'NBA_PF/G': 'pf_per_g', 'NBA_PTS/G': 'pts_per_g',
+}
+
+def decode_row(row) -> dict:
     """
-    Given a <tr> row and a data-stat name, return float value or 0.0.
+    Walk a <tr> once and return {data-stat: float} for every numeric cell.
+    Empty and non-numeric cells are left out, so lookups default to 0.0.
     """
-    cell = row.find('td', {'data-stat': stat})
-    return float(cell.text.strip()) if cell and cell.text.strip() else 0.0
+    values = {}
+    for cell in row.find_all('td', recursive=False):
+        text = cell.get_text(strip=True)
+        if not text:
+            continue
+        try:
+            values[cell.get('data-stat')] = float(text)
+        except ValueError:
+            pass
+    return values
 
-def get_advanced_stats(soup):
+def map_columns(values: dict, columns: dict) -> dict:
     """
-    Parse the last row of the "players_advanced" table and return a dict of advanced stats.
+    Project a decoded row onto a column map, defaulting missing stats to 0.0.
     """
-    table = soup.find('table', id='players_advanced')
-    if not table:
-        return {}
+    return {field: values.get(stat, 0.0) for field, stat in columns.items()}
+
+def last_table_row(soup, table_id):
+    """
+    Return the last non-header <tr> in the tbody of table#table_id, or None.
+    """
+    table = soup.find('table', id=table_id)
+    if not table or not table.find('tbody'):
+        return None
     rows = table.find('tbody').find_all('tr')
     # filter out header rows
     rows = [r for r in rows if not r.get('class') or 'thead' not in r.get('class')]
-    if not rows:
-        return {}
-    last_row = rows[-1]
-    def adv_stat(stat):
-        cell = last_row.find('td', {'data-stat': stat})
-        return float(cell.text.strip()) if cell and cell.text.strip() else 0.0
-    return {
-        'C_PER': adv_stat('per'),
-        'C_TS%': adv_stat('ts_pct'),
-        'C_3PAr': adv_stat('fg3a_per_fga_pct'),
-        'C_FTr': adv_stat('fta_per_fga_pct'),
-        'C_PProd': adv_stat('pprod'),
-        'C_ORB%': adv_stat('orb_pct'),
-        'C_DRB%': adv_stat('drb_pct'),
-        'C_TRB%': adv_stat('trb_pct'),
-        'C_AST%': adv_stat('ast_pct'),
-        'C_STL%': adv_stat('stl_pct'),
-        'C_BLK%': adv_stat('blk_pct'),
-        'C_TOV%': adv_stat('tov_pct'),
-        'C_USG%': adv_stat('usg_pct'),
-        'C_OWS': adv_stat('ows'),
-        'C_DWS': adv_stat('dws'),
-        'C_WS': adv_stat('ws'),
-        'C_WS/40': adv_stat('ws_per_40'),
-        'C_OBPM': adv_stat('obpm'),
-        'C_DBPM': adv_stat('dbpm'),
-        'C_BPM': adv_stat('bpm')
-    }
+    return rows[-1] if rows else None
+
+def get_advanced_stats(soup):
+    """
+    Parse the last row of the "players_advanced" table and return a dict of advanced stats.
+    """
+    last_row = last_table_row(soup, 'players_advanced')
+    return map_columns(decode_row(last_row), ADVANCED_COLUMNS) if last_row else {}
 
 def get_per40_stats(soup):
     """
     Parse the last row of the "players_per_min" table and return per-40-minute stats.
     """
-    table = soup.find('table', id='players_per_min')
-    if not table:
-        return {}
-    rows = table.find('tbody').find_all('tr')
-    rows = [r for r in rows if not r.get('class') or 'thead' not in r.get('class')]
-    if not rows:
-        return {}
-    last_row = rows[-1]
-    def per40(stat):
-        cell = last_row.find('td', {'data-stat': stat})
-        return float(cell.text.strip()) if cell and cell.text.strip() else 0.0
-    return {
-        'C_FG/40': per40('fg_per_min'),
-        'C_FGA/40': per40('fga_per_min'),
-        'C_3P/40': per40('fg3_per_min'),
-        'C_3PA/40': per40('fg3a_per_min'),
-        'C_FT/40': per40('ft_per_min'),
-        'COLLEGE_FTA/40': per40('fta_per_min'),
-        'COLLEGE_ORB/40': per40('orb_per_min'),
-        'COLLEGE_DRB/40': per40('drb_per_min'),
-        'C_TRB/40': per40('trb_per_min'),
-        'C_AST/40': per40('ast_per_min'),
-        'C_STL/40': per40('stl_per_min'),
-        'C_BLK/40': per40('blk_per_min'),
-        'C_TOV/40': per40('tov_per_min'),
-        'C_PF/40': per40('pf_per_min'),
-        'C_PTS/40': per40('pts_per_min')
-    }
+    last_row = last_table_row(soup, 'players_per_min')
+    return map_columns(decode_row(last_row), PER40_COLUMNS) if last_row else {}
 
 def get_per100_stats(soup):
     """
     Parse the last row of the "players_per_poss" table and return per-100-possession stats.
     """
-    table = soup.find('table', id='players_per_poss')
-    if not table:
-        return {}
-    rows = table.find('tbody').find_all('tr')
-    rows = [r for r in rows if not r.get('class') or 'thead' not in r.get('class')]
-    if not rows:
-        return {}
-    last_row = rows[-1]
-    def per100(stat):
-        cell = last_row.find('td', {'data-stat': stat})
-        return float(cell.text.strip()) if cell and cell.text.strip() else 0.0
-    return {
-        'C_FG/100': per100('fg_per_poss'),
-        'C_FGA/100': per100('fga_per_poss'),
-        'C_3P/100': per100('fg3_per_poss'),
-        'C_3PA/100': per100('fg3a_per_poss'),
-        'C_FT/100': per100('ft_per_poss'),
-        'C_FTA/100': per100('fta_per_poss'),
-        'C_ORB/100': per100('orb_per_poss'),
-        'C_DRB/100': per100('drb_per_poss'),
-        'C_TRB/100': per100('trb_per_poss'),
-        'C_AST/100': per100('ast_per_poss'),
-        'C_STL/100': per100('stl_per_poss'),
-        'C_BLK/100': per100('blk_per_poss'),
-        'C_TOV/100': per100('tov_per_poss'),
-        'C_PF/100': per100('pf_per_poss'),
-        'C_PTS/100': per100('pts_per_poss'),
-        'C_ORtg': per100('off_rtg'),
-        'C_DRtg': per100('def_rtg')
-    }
+    last_row = last_table_row(soup, 'players_per_poss')
+    return map_columns(decode_row(last_row), PER100_COLUMNS) if last_row else {}
 
 def get_college_season_summary(soup: BeautifulSoup) -> dict:
     """
@@ -259,42 +331,62 @@ def get_college_season_summary(soup: BeautifulSoup) -> dict:
         'CT_DRtg':  col_stat('DRtg'),
     }
 
+def college_summary_key(team_link):
+    """
+    Return (school slug, season) for a SR/CBB team link, or None.
+    """
+    m = COLLEGE_TEAM_LINK.search(team_link or '')
+    return (m.group(1), int(m.group(2))) if m else None
+
+def get_college_team_summary(team_link) -> dict:
+    """
+    Return get_college_season_summary for a SR/CBB team link, memoized on
+    (school slug, season) in memory for the run and on disk for finished
+    seasons. Returns {} if there is no link or the page can't be fetched.
+    """
+    if not team_link:
+        return {}
+    key = college_summary_key(team_link)
+    if not key:
+        soup = get_soup(team_link)
+        return get_college_season_summary(soup) if soup else {}
+
+    def fetch():
+        soup = get_soup(team_link)
+        return get_college_season_summary(soup) if soup else None
+
+    slug, season = key
+    return college_summaries.get_or_compute(
+        f"{slug}-{season}", fetch, persist=season_finished(season)
+    ) or {}
+
+def prefetch_college_summaries(team_links, max_workers=MAX_WORKERS):
+    """
+    Fetch the college team summaries for a whole draft class up front,
+    requesting each (school slug, season) only once.
+    Failures are logged and left for the players' own lookups to retry.
+    """
+    unique = {}
+    for link in team_links:
+        key = college_summary_key(link)
+        if key and key not in unique:
+            unique[key] = link
+
+    def fetch(link):
+        try:
+            get_college_team_summary(link)
+        except Exception as e:
+            logger.warning(f"Prefetching {link} failed: {e}")
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        list(pool.map(fetch, unique.values()))
+
 def get_nba_career_stats(career_tr, nba_seasons) -> dict:
     """
     Parse the career <tr> row and return a dict of career per-game stats
     from 'g' through 'pts_per_g', plus the total number of seasons under 'seasons'.
     Missing or empty cells are treated as 0.0.
     """
-    def stat(key: str) -> float:
-        cell = career_tr.find('td', {'data-stat': key})
-        text = cell.get_text(strip=True) if cell else ''
-        return float(text) if text else 0.0
-
-    return {
-        'NBA_seasons': nba_seasons,
-        'NBA_G':     stat('games'),
-        'NBA_GS':    stat('games_started'),
-        'NBA_MP/G':  stat('mp_per_g'),
-        'NBA_FG/G':  stat('fg_per_g'),
-        'NBA_FGA/G': stat('fga_per_g'),
-        'NBA_FG%':   stat('fg_pct'),
-        'NBA_3P/G':  stat('fg3_per_g'),
-        'NBA_3PA/G': stat('fg3a_per_g'),
-        'NBA_3P%':   stat('fg3_pct'),
-        'NBA_2P/G':  stat('fg2_per_g'),
-        'NBA_2PA/G': stat('fg2a_per_g'),
-        'NBA_2P%':   stat('fg2_pct'),
-        'NBA_eFG%':  stat('efg_pct'),
-        'NBA_FT/G':  stat('ft_per_g'),
-        'NBA_FTA/G': stat('fta_per_g'),
-        'NBA_FT%':   stat('ft_pct'),
-        'NBA_ORB/G': stat('orb_per_g'),
-        'NBA_DRB/G': stat('drb_per_g'),
-        'NBA_TRB/G': stat('trb_per_g'),
-        'NBA_AST/G': stat('ast_per_g'),
-        'NBA_STL/G': stat('stl_per_g'),
-        'NBA_BLK/G': stat('blk_per_g'),
-        'NBA_TOV/G': stat('tov_per_g'),
-        'NBA_PF/G':  stat('pf_per_g'),
-        'NBA_PTS/G': stat('pts_per_g'),
-    }
\ No newline at end of file
+    stats = {'NBA_seasons': nba_seasons}
+    stats.update(map_columns(decode_row(career_tr), NBA_CAREER_COLUMNS))
+    return stats
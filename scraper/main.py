@@ -1,32 +1,160 @@
+import argparse
+import json
+import multiprocessing
 import os
 import logging
-from scraper import get_draft_picks, process_player, write_record
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+from scraper import get_draft_picks, process_picks, RECORD_COLUMNS
+from extractors import prefetch_team_summaries
+from manifest import JobManifest
+from sink import RecordSink, FORMATS
+from network import RateLimited, shared_limiters, install_limiters
+from metrics import metrics, ProgressReporter
 
 logging.basicConfig(
     level=logging.DEBUG,
     format="%(asctime)s — %(levelname)s — %(message)s"
 )
 
+DATA_DIR = "raw-data"
+PARTITION_DIR = os.path.join(DATA_DIR, "partitions")
+MANIFEST_PATH = os.path.join(DATA_DIR, "drafts.manifest.sqlite")
+DEDUP_KEY = ["Draft Year", "Pick Number"]
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Scrape NBA draft classes into a CSV, Parquet or Arrow file.")
+    parser.add_argument('--start', type=int, default=2025, help="first draft year")
+    parser.add_argument('--end', type=int, default=None, help="last draft year (defaults to --start)")
+    parser.add_argument('--workers', type=int, default=1,
+                        help="worker processes, one draft year each; host rate limits are shared")
+    parser.add_argument('--resume', action='store_true',
+                        help="skip picks the manifest marks finished and retry failed ones")
+    parser.add_argument('--format', choices=sorted(FORMATS), default='csv',
+                        help="output file format (parquet/arrow need pyarrow)")
+    parser.add_argument('--progress', type=float, default=0, metavar='SECONDS',
+                        help="log a throughput line every SECONDS (0 disables)")
+    parser.add_argument('--prefetch-teams', action='store_true',
+                        help="pull every team page of a season before its picks")
+    args = parser.parse_args()
+    args.end = args.end or args.start
+    return args
+
+def partition_path(year, fmt):
+    return os.path.join(PARTITION_DIR, f"drafts-{year}{FORMATS[fmt]}")
+
+def scrape_year(year, fmt='csv', resume=False, progress=0, prefetch_teams=False):
+    """
+    Scrape one draft class into its own partition file, recording each
+    pick in the shared manifest. prefetch_teams pulls the season's team
+    pages up front. Returns the shard's metrics summary.
+    """
+    metrics.reset()
+    manifest = JobManifest(MANIFEST_PATH)
+
+    # CSV resumes by appending; Arrow formats are rewritten from the manifest's finished rows
+    sink = RecordSink(partition_path(year, fmt), RECORD_COLUMNS, fmt, append=resume and fmt == 'csv')
+    if resume and fmt != 'csv':
+        for record in manifest.done_records([year]):
+            sink.write(record)
+    # records are only marked done once the sink has flushed them
+    unflushed = []
+
+    def mark_flushed():
+        for pick, record in unflushed:
+            manifest.mark_done(year, pick, record)
+        unflushed.clear()
+
+    reporter = ProgressReporter(metrics, progress).start()
+    if not (resume and manifest.has_year(year)):
+        manifest.reset_year(year)
+        manifest.add_tasks(year, get_draft_picks(year))
+    picks = manifest.unfinished(year)
+    if not picks:
+        logging.info(f"{year}: all picks already finished")
+    elif prefetch_teams:
+        prefetch_team_summaries(year)
+
+    # picks cut off by a 429 stay failed in the manifest; --resume retries them
+    rate_limited = 0
+    for pick, record, error in process_picks(picks, year):
+        if error:
+            rate_limited += isinstance(error, RateLimited)
+            manifest.mark_failed(year, pick, error)
+        elif record:
+            unflushed.append((pick, record))
+            metrics.incr('players')
+            with metrics.timer('write'):
+                flushed = sink.write(record)
+            if flushed:
+                mark_flushed()
+        else:
+            manifest.mark_skipped(year, pick)
+    if rate_limited:
+        logging.error(f"{year}: {rate_limited} picks hit a rate-limited host; rerun with --resume once the block lifts")
+
+    with metrics.timer('write'):
+        sink.close()
+    mark_flushed()
+    reporter.stop()
+    manifest.close()
+    return metrics.log_summary()
+
+def read_partition(path, fmt):
+    if fmt == 'parquet':
+        return pd.read_parquet(path)
+    if fmt == 'arrow':
+        return pd.read_feather(path)
+    return pd.read_csv(path)
+
+def merge_partitions(years, fmt, output_file):
+    """
+    Combine the year partitions into one dataset, keeping the latest row
+    for each (Draft Year, Pick Number).
+    """
+    frames = [read_partition(partition_path(y, fmt), fmt)
+              for y in years if os.path.exists(partition_path(y, fmt))]
+    if not frames:
+        logging.warning("No partitions to merge.")
+        return
+    df = pd.concat(frames, ignore_index=True)
+    df = df.drop_duplicates(subset=DEDUP_KEY, keep='last').sort_values(DEDUP_KEY)
+    if fmt == 'parquet':
+        df.to_parquet(output_file, index=False)
+    elif fmt == 'arrow':
+        df.reset_index(drop=True).to_feather(output_file)
+    else:
+        df.to_csv(output_file, index=False)
+    logging.info(f"Merged {len(frames)} partitions ({len(df)} players) into {output_file}")
+
 def main():
-    start_year, end_year = 2025, 2025
-    data_dir = "raw-data"
-    os.makedirs(data_dir, exist_ok=True)
-
-    # build filename in format: "drafts_2008_2024.csv"
-    filename = f"drafts-{start_year}-to-{end_year}.csv"
-    output_file = os.path.join(data_dir, filename)
-    header_written = False
-
-    for year in range(start_year, end_year + 1):
-        picks = get_draft_picks(year)
-        for pick in picks:
-            if pick['name'] == '':
-                continue
-            record = process_player(pick, year)
-            if record:
-                header_written = write_record(record, output_file, header_written)
-
-    logging.info("Finished scraping all years.")
+    args = parse_args()
+    years = list(range(args.start, args.end + 1))
+    os.makedirs(PARTITION_DIR, exist_ok=True)
+
+    # build filename in format: "drafts-2008-to-2024.csv"
+    filename = f"drafts-{args.start}-to-{args.end}{FORMATS[args.format]}"
+    output_file = os.path.join(DATA_DIR, filename)
+
+    if args.workers > 1 and len(years) > 1:
+        ctx = multiprocessing.get_context('spawn')
+        limiters = shared_limiters(ctx)
+        with ProcessPoolExecutor(min(args.workers, len(years)), mp_context=ctx,
+                                 initializer=install_limiters, initargs=(limiters,)) as pool:
+            futures = {y: pool.submit(scrape_year, y, args.format, args.resume, args.progress,
+                                      args.prefetch_teams) for y in years}
+            summaries = {y: f.result() for y, f in futures.items()}
+    else:
+        summaries = {y: scrape_year(y, args.format, args.resume, args.progress, args.prefetch_teams)
+                     for y in years}
+
+    merge_partitions(years, args.format, output_file)
+    with JobManifest(MANIFEST_PATH) as manifest:
+        logging.info(f"Finished scraping all years. Tasks: {manifest.counts()}")
+    with open(os.path.join(DATA_DIR, f"drafts-{args.start}-to-{args.end}.metrics.json"), 'w') as f:
+        json.dump(summaries, f, indent=2)
 
 if __name__ == "__main__":
     main()
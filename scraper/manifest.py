@@ -0,0 +1,106 @@
+import json
+import sqlite3
+import time
+
+# Task states; 'skipped' means the player was processed but produced no record
+PENDING, DONE, SKIPPED, FAILED = 'pending', 'done', 'skipped', 'failed'
+
+class JobManifest:
+    """
+    SQLite record of every (year, pick, url) scraping task: its status,
+    attempt count, last error and output row. Lets an interrupted run resume
+    without refetching players that already finished.
+    """
+    def __init__(self, path):
+        self.path = path
+        # worker processes share one manifest; wait on each other's writes
+        self.db = sqlite3.connect(path, timeout=60)
+        self.db.execute("""
+            CREATE TABLE IF NOT EXISTS tasks (
+                year       INTEGER NOT NULL,
+                pick       TEXT,
+                url        TEXT NOT NULL,
+                info       TEXT NOT NULL,
+                status     TEXT NOT NULL DEFAULT 'pending',
+                attempts   INTEGER NOT NULL DEFAULT 0,
+                error      TEXT,
+                record     TEXT,
+                updated_at REAL,
+                PRIMARY KEY (year, url)
+            )
+        """)
+        self.db.commit()
+
+    def has_year(self, year):
+        return self.db.execute(
+            "SELECT 1 FROM tasks WHERE year = ? LIMIT 1", (year,)
+        ).fetchone() is not None
+
+    def add_tasks(self, year, picks):
+        """
+        Register the picks of a draft class; existing tasks keep their state.
+        """
+        self.db.executemany(
+            "INSERT OR IGNORE INTO tasks (year, pick, url, info, updated_at) VALUES (?, ?, ?, ?, ?)",
+            [(year, p['pick'], p['bbref_url'], json.dumps(p), time.time()) for p in picks]
+        )
+        self.db.commit()
+
+    def reset_year(self, year):
+        self.db.execute("DELETE FROM tasks WHERE year = ?", (year,))
+        self.db.commit()
+
+    def unfinished(self, year):
+        """
+        Return the pick dicts for a year that are pending or failed, in pick order.
+        """
+        rows = self.db.execute(
+            "SELECT info FROM tasks WHERE year = ? AND status IN (?, ?) ORDER BY rowid",
+            (year, PENDING, FAILED)
+        ).fetchall()
+        return [json.loads(info) for (info,) in rows]
+
+    def done_records(self, years):
+        """
+        Return the stored output rows of finished tasks for the given years.
+        """
+        years = list(years)
+        rows = self.db.execute(
+            f"SELECT record FROM tasks WHERE status = ? AND year IN ({','.join('?' * len(years))}) "
+            "ORDER BY year, rowid",
+            (DONE, *years)
+        ).fetchall()
+        return [json.loads(record) for (record,) in rows]
+
+    def _update(self, year, pick, status, error=None, record=None):
+        self.db.execute(
+            "UPDATE tasks SET status = ?, attempts = attempts + 1, error = ?, record = ?, updated_at = ? "
+            "WHERE year = ? AND url = ?",
+            (status, error, json.dumps(record, default=float) if record is not None else None,
+             time.time(), year, pick['bbref_url'])
+        )
+        self.db.commit()
+
+    def mark_done(self, year, pick, record):
+        self._update(year, pick, DONE, record=record)
+
+    def mark_skipped(self, year, pick):
+        self._update(year, pick, SKIPPED)
+
+    def mark_failed(self, year, pick, error):
+        self._update(year, pick, FAILED, error=str(error))
+
+    def counts(self):
+        """
+        Return {status: number of tasks} across all years.
+        """
+        return dict(self.db.execute("SELECT status, COUNT(*) FROM tasks GROUP BY status").fetchall())
+
+    def close(self):
+        self.db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
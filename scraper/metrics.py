@@ -0,0 +1,135 @@
+import logging
+import threading
+import time
+from contextlib import contextmanager
+
+logger = logging.getLogger(__name__)
+
+# Stages whose time is spent inside get_soup; process_player's remaining time is 'extract'
+IO_STAGES = ('wait', 'fetch', 'parse')
+
+class ScrapeMetrics:
+    """
+    Thread-safe counters and per-stage timings for a scraping run. Stages are
+    'wait' (rate-limit sleeps), 'fetch', 'parse', 'extract' and 'write', each
+    grouped by URL class where one applies.
+    """
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.local = threading.local()
+        self.reset()
+
+    def reset(self):
+        with self.lock:
+            self.started = time.monotonic()
+            self.timings = {}   # (stage, url_class) -> [count, total seconds, max seconds]
+            self.counters = {}  # name -> count
+            self.by_class = {}  # (name, url_class) -> count
+
+    def record(self, stage, seconds, url_class=''):
+        with self.lock:
+            t = self.timings.setdefault((stage, url_class), [0, 0.0, 0.0])
+            t[0] += 1
+            t[1] += seconds
+            t[2] = max(t[2], seconds)
+        if stage in IO_STAGES:
+            self.local.io = self.thread_io() + seconds
+
+    @contextmanager
+    def timer(self, stage, url_class=''):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(stage, time.perf_counter() - start, url_class)
+
+    def thread_io(self):
+        """
+        Seconds this thread has spent in IO_STAGES; used to split out extract time.
+        """
+        return getattr(self.local, 'io', 0.0)
+
+    def incr(self, name, n=1, url_class=None):
+        with self.lock:
+            self.counters[name] = self.counters.get(name, 0) + n
+            if url_class is not None:
+                key = (name, url_class)
+                self.by_class[key] = self.by_class.get(key, 0) + n
+
+    def summary(self):
+        """
+        Return a structured snapshot of the run so far.
+        """
+        with self.lock:
+            elapsed = time.monotonic() - self.started
+            counters = dict(self.counters)
+            stages = {}
+            for (stage, url_class), (count, total, worst) in sorted(self.timings.items()):
+                stages.setdefault(stage, {})[url_class or 'all'] = {
+                    'count': count,
+                    'total_s': round(total, 3),
+                    'mean_ms': round(total / count * 1000, 1) if count else 0.0,
+                    'max_ms': round(worst * 1000, 1),
+                }
+            by_class = {}
+            for (name, url_class), n in sorted(self.by_class.items()):
+                by_class.setdefault(url_class, {})[name] = n
+
+        lookups = counters.get('cache_hits', 0) + counters.get('requests', 0)
+        return {
+            'elapsed_s': round(elapsed, 1),
+            'players': counters.get('players', 0),
+            'players_per_min': round(counters.get('players', 0) / elapsed * 60, 2) if elapsed else 0.0,
+            'requests': counters.get('requests', 0),
+            'cache_hits': counters.get('cache_hits', 0),
+            'cache_hit_rate': round(counters.get('cache_hits', 0) / lookups, 3) if lookups else 0.0,
+            'not_modified': counters.get('not_modified', 0),
+            'bytes_downloaded': counters.get('bytes', 0),
+            'throttled': counters.get('throttled', 0),
+            'stages': stages,
+            'by_url_class': by_class,
+        }
+
+    def progress_line(self):
+        s = self.summary()
+        return (
+            f"{s['players']} players ({s['players_per_min']}/min), "
+            f"{s['requests']} requests, {s['cache_hit_rate']:.0%} cache hits, "
+            f"{s['bytes_downloaded'] / 1e6:.1f}MB, {s['throttled']} throttled, "
+            f"{s['elapsed_s']:.0f}s elapsed"
+        )
+
+    def log_summary(self):
+        s = self.summary()
+        logger.info(f"Run summary: {self.progress_line()}")
+        for stage, classes in s['stages'].items():
+            for url_class, t in classes.items():
+                logger.info(
+                    f"  {stage:<8}{url_class:<14}{t['count']:>6} calls "
+                    f"{t['total_s']:>9.1f}s total {t['mean_ms']:>9.1f}ms mean {t['max_ms']:>9.1f}ms max"
+                )
+        return s
+
+class ProgressReporter:
+    """
+    Background thread that logs metrics.progress_line() every `interval` seconds.
+    """
+    def __init__(self, metrics, interval):
+        self.metrics = metrics
+        self.interval = interval
+        self.stopped = threading.Event()
+        self.thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        while not self.stopped.wait(self.interval):
+            logger.info(f"Progress: {self.metrics.progress_line()}")
+
+    def start(self):
+        if self.interval:
+            self.thread.start()
+        return self
+
+    def stop(self):
+        self.stopped.set()
+
+metrics = ScrapeMetrics()
@@ -2,12 +2,74 @@ import requests
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 from bs4 import BeautifulSoup, Comment
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlparse
+import multiprocessing
+import re
+import threading
 import time
 import logging
 
+from cache import ResponseCache, url_class
+from metrics import metrics
+
 logger = logging.getLogger(__name__)
 
-REQUEST_DELAY = 2  # seconds between requests to avoid rate limiting
+REQUEST_DELAY = 3  # default seconds between requests to the same host
+MAX_WORKERS = 8    # concurrent fetches across all hosts
+
+# Requests per second allowed for each host, and how many may go out back-to-back
+HOST_RATES = {
+    'www.basketball-reference.com': 1 / REQUEST_DELAY,
+    'www.sports-reference.com':     1 / REQUEST_DELAY,
+}
+HOST_BURST = 1
+
+# AIMD bounds for the adaptive per-host rate (requests per second). The
+# ceiling is the sports-reference sites' published limit of 20 requests a
+# minute; going over it gets the IP jailed for an hour, so it is never probed.
+MIN_RATE = 1 / 30
+PUBLISHED_RATE = 20 / 60
+HOST_MAX_RATES = {
+    'www.basketball-reference.com': PUBLISHED_RATE,
+    'www.sports-reference.com':     PUBLISHED_RATE,
+}
+RATE_STEP = 0.01          # additive increase after each fast success
+BACKOFF_FACTOR = 0.5      # multiplicative decrease on 429
+SLOW_FACTOR = 0.8         # multiplicative decrease on a slow response
+SLOW_RESPONSE = 3.0       # seconds; slower responses count as congestion
+JAIL_SECONDS = 3600       # a 429 blocks the host for at least this long
+
+USE_CACHE = True  # set False to always hit the network
+
+# Offline fixtures (see replay.py): a Recorder saves every page get_soup
+# receives; a ReplayTransport serves pages from disk instead of the network
+recorder = None
+transport = None
+
+# 'fast' extracts only the fragments the extractors read and parses them with
+# lxml; 'full' builds the whole document and merges commented-out tables
+PARSE_MODE = 'fast'
+try:
+    import lxml  # noqa: F401
+    FAST_PARSER = 'lxml'
+except ImportError:
+    FAST_PARSER = 'html.parser'
+
+# Fragments the extractors need: stat tables (often inside comments), the
+# player/team meta block, and the SR/CBB link on BBRef player pages
+TARGET_TABLES = (
+    'players_advanced', 'players_per_min', 'players_per_poss',
+    'players_per_game', 'per_game_stats', 'stats'
+)
+TARGET_OPENERS = re.compile(
+    r'<(table)\b[^>]*\bid="(?:' + '|'.join(TARGET_TABLES) + r')"'
+    r'|<(div)\b[^>]*\b(?:id="meta"|data-template="Partials/Teams/Summary")'
+)
+# anchor text may be wrapped in inline tags, so match anything short of </a>
+TARGET_ANCHORS = re.compile(
+    r'<a\b[^>]*>(?:(?!</a>)[\s\S])*?More College Stats on SR/CBB(?:(?!</a>)[\s\S])*</a>'
+)
 
 session = requests.Session()
 session.headers.update({
@@ -21,39 +83,296 @@ session.headers.update({
     'Connection': 'keep-alive'
 })
 
-# Retry setup: retry up to 3 times on 429/500/502/503/504
+# Retry setup: retry up to 3 times on 500/502/503/504; 429s go through the
+# adaptive limiter instead so the host's rate is lowered
 retries = Retry(
     total=3,
     backoff_factor=1,
-    status_forcelist=[429, 500, 502, 503, 504],
+    status_forcelist=[500, 502, 503, 504],
     allowed_methods=["GET"]
 )
-session.mount('https://', HTTPAdapter(max_retries=retries))
-session.mount('http://', HTTPAdapter(max_retries=retries))
+adapter = HTTPAdapter(max_retries=retries, pool_maxsize=MAX_WORKERS)
+session.mount('https://', adapter)
+session.mount('http://', adapter)
 
-def polite_sleep():
-    logger.debug(f"{REQUEST_DELAY:.1f}s sleep")
-    time.sleep(REQUEST_DELAY)
+class TokenBucket:
+    """
+    Thread-safe token bucket. acquire() reserves a token and sleeps
+    (outside the lock) until it is available, so waiting callers queue up
+    in arrival order instead of spinning.
+    """
+    def __init__(self, rate, capacity=HOST_BURST):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
 
-def get_soup(url):
+    def acquire(self):
+        """
+        Take a token, sleeping until one is available. Returns the seconds slept.
+        """
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= 1
+            wait = -self.tokens / self.rate if self.tokens < 0 else 0.0
+        if wait > 0:
+            logger.debug(f"{wait:.1f}s rate-limit wait")
+            time.sleep(wait)
+        return max(wait, 0.0)
+
+class RateLimited(Exception):
     """
-    Fetch a URL, parse HTML (including tables inside comments), 
-    and return a BeautifulSoup object. Returns None on HTTP 429.
+    Raised when a host answers 429, and for every request to it until the
+    block (JAIL_SECONDS or Retry-After, whichever is longer) has passed.
     """
-    logger.debug(f"Fetching URL: {url}")
-    try:
-        resp = session.get(url, timeout=10)
-        resp.raise_for_status()
-    except requests.exceptions.HTTPError as e:
-        if e.response and e.response.status_code == 429:
-            logger.warning(f"429 Too Many Requests: {url}")
-            return None
+
+class AdaptiveRateLimiter(TokenBucket):
+    """
+    Token bucket whose rate follows AIMD: each fast success adds RATE_STEP
+    up to max_rate, and a slow response trims it by SLOW_FACTOR. A 429 is
+    fatal for the host: the rate is halved and acquire() raises RateLimited
+    until the block expires, rather than waiting to probe the host again.
+    The block is checked again after the token wait, so callers already
+    queued when the 429 lands don't go on to send their requests.
+    """
+    def __init__(self, rate, max_rate, capacity=HOST_BURST):
+        super().__init__(rate, capacity)
+        self.max_rate = max_rate
+        self.rate = min(rate, max_rate)
+        self.blocked_until = 0.0
+
+    def check(self):
+        """
+        Raise RateLimited if the host is blocked.
+        """
+        with self.lock:
+            blocked = self.blocked_until - time.monotonic()
+        if blocked > 0:
+            raise RateLimited(f"host blocked for another {blocked:.0f}s after a 429")
+
+    def acquire(self):
+        self.check()
+        waited = super().acquire()
+        self.check()
+        return waited
+
+    def on_success(self, latency):
+        with self.lock:
+            if latency > SLOW_RESPONSE:
+                self.rate = max(MIN_RATE, self.rate * SLOW_FACTOR)
+            else:
+                self.rate = min(self.max_rate, self.rate + RATE_STEP)
+
+    def on_throttle(self, retry_after):
+        block = max(retry_after, JAIL_SECONDS)
+        with self.lock:
+            self.rate = max(MIN_RATE, self.rate * BACKOFF_FACTOR)
+            self.tokens = min(self.tokens, 0)
+            self.blocked_until = max(self.blocked_until, time.monotonic() + block)
+            rate = self.rate
+        logger.error(f"Throttled: host blocked for {block:.0f}s, rate now {rate:.3f} req/s")
+
+class SharedRateLimiter(AdaptiveRateLimiter):
+    """
+    AdaptiveRateLimiter whose state lives in shared memory behind a process
+    lock, so worker processes started with install_limiters() all draw from
+    one budget per host. time.monotonic() is system-wide, so timestamps
+    compare across processes.
+    """
+    SHARED_FIELDS = ('rate', 'tokens', 'updated', 'blocked_until')
+
+    def __init__(self, rate, max_rate, capacity=HOST_BURST, ctx=multiprocessing):
+        self.__dict__['_shared'] = {f: ctx.Value('d', 0.0, lock=False) for f in self.SHARED_FIELDS}
+        super().__init__(rate, max_rate, capacity)
+        self.lock = ctx.Lock()
+
+    def __getattr__(self, name):
+        shared = self.__dict__.get('_shared', {})
+        if name in shared:
+            return shared[name].value
+        raise AttributeError(name)
+
+    def __setattr__(self, name, value):
+        if name in self.SHARED_FIELDS:
+            self._shared[name].value = value
         else:
-            raise
-    soup = BeautifulSoup(resp.text, 'html.parser')
+            super().__setattr__(name, value)
+
+def retry_after_seconds(resp):
+    """
+    Parse a Retry-After header (delta-seconds or HTTP date), falling back to
+    JAIL_SECONDS.
+    """
+    value = resp.headers.get('Retry-After') if resp is not None else None
+    if not value:
+        return JAIL_SECONDS
+    if value.strip().isdigit():
+        return int(value)
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return JAIL_SECONDS
+
+_limiters = {}
+_limiters_lock = threading.Lock()
+
+def limiter_for(url):
+    """
+    Return the shared adaptive limiter for the URL's host, creating it on first use.
+    """
+    host = urlparse(url).netloc
+    with _limiters_lock:
+        if host not in _limiters:
+            rate = HOST_RATES.get(host, 1 / REQUEST_DELAY)
+            _limiters[host] = AdaptiveRateLimiter(rate, HOST_MAX_RATES.get(host, rate))
+        return _limiters[host]
+
+def shared_limiters(ctx=multiprocessing):
+    """
+    Build a SharedRateLimiter for every host in HOST_RATES, to hand to
+    worker processes through install_limiters.
+    """
+    return {
+        host: SharedRateLimiter(rate, HOST_MAX_RATES.get(host, rate), ctx=ctx)
+        for host, rate in HOST_RATES.items()
+    }
+
+def install_limiters(limiters):
+    """
+    Use the given per-host limiters in this process (e.g. as a process pool
+    initializer), so rate limits are shared with the parent's other workers.
+    """
+    with _limiters_lock:
+        _limiters.update(limiters)
+
+_cache = None
+_cache_lock = threading.Lock()
+
+def get_cache():
+    """
+    Lazily open the shared on-disk response cache.
+    """
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = ResponseCache()
+        return _cache
+
+def fetch_html(url):
+    """
+    Return the HTML for url from the replay transport if one is set, else
+    from the network/cache, recording it if a recorder is set.
+    """
+    if transport is not None:
+        return transport.fetch(url)
+    html = _fetch_html(url)
+    if recorder is not None:
+        recorder.save(url, html)
+    return html
+
+def _fetch_html(url):
+    """
+    Return the HTML for url, serving fresh pages from the on-disk cache and
+    revalidating stale ones with ETag/Last-Modified. A 429 blocks the host
+    (see AdaptiveRateLimiter.on_throttle) and raises RateLimited.
+    """
+    kind = url_class(url)
+    cache = get_cache() if USE_CACHE else None
+    entry = cache.get(url) if cache else None
+    if entry and entry.fresh:
+        logger.debug(f"Cache hit: {url}")
+        metrics.incr('cache_hits', url_class=kind)
+        return entry.text
+
+    limiter = limiter_for(url)
+    metrics.record('wait', limiter.acquire(), kind)
+    # another worker may have been throttled since our token came through
+    limiter.check()
+    logger.debug(f"Fetching URL: {url}")
+    start = time.perf_counter()
+    resp = session.get(url, timeout=10, headers=entry.validators() if entry else None)
+    latency = time.perf_counter() - start
+    metrics.record('fetch', latency, kind)
+    metrics.incr('requests', url_class=kind)
+    metrics.incr('bytes', len(resp.content), url_class=kind)
+    if resp.status_code == 429:
+        logger.error(f"429 Too Many Requests: {url}")
+        metrics.incr('throttled', url_class=kind)
+        limiter.on_throttle(retry_after_seconds(resp))
+        raise RateLimited(url)
+    resp.raise_for_status()
+    limiter.on_success(latency)
+
+    if resp.status_code == 304 and entry:
+        logger.debug(f"Not modified: {url}")
+        metrics.incr('not_modified', url_class=kind)
+        cache.renew(url)
+        return entry.text
+    if cache:
+        cache.put(url, resp.text, resp.headers.get('ETag'), resp.headers.get('Last-Modified'))
+    return resp.text
+
+def _element_end(html, start, tag):
+    """
+    Return the index just past the </tag> that closes the element opened at start.
+    """
+    depth = 0
+    for m in re.compile(rf'<(/?){tag}\b').finditer(html, start):
+        depth += -1 if m.group(1) else 1
+        if depth == 0:
+            close = html.find('>', m.end())
+            return len(html) if close == -1 else close + 1
+    return len(html)
+
+def extract_fragments(html):
+    """
+    Slice the target tables, meta/summary divs and SR/CBB anchors out of the
+    raw HTML, in document order. Tables inside comments are found the same
+    way because the comment body is still plain markup in the raw string.
+    """
+    spans = []
+    for m in TARGET_OPENERS.finditer(html):
+        if spans and m.start() < spans[-1][1]:
+            continue  # nested inside a fragment we already took
+        tag = m.group(1) or m.group(2)
+        spans.append((m.start(), _element_end(html, m.start(), tag)))
+    for m in TARGET_ANCHORS.finditer(html):
+        if not any(a <= m.start() < b for a, b in spans):
+            spans.append(m.span())
+    spans.sort()
+    return [html[a:b] for a, b in spans]
+
+def parse_html(html):
+    """
+    Build the soup the extractors read. In fast mode only the targeted
+    fragments are parsed; pages with none of them fall back to a full parse.
+    """
+    if PARSE_MODE == 'fast':
+        fragments = extract_fragments(html)
+        if fragments:
+            return BeautifulSoup('\n'.join(fragments), FAST_PARSER)
+
+    soup = BeautifulSoup(html, 'html.parser')
     # Some tables wrapped in HTML comments
     for comment in soup.find_all(string=lambda text: isinstance(text, Comment)):
         if 'table' in comment:
             soup.append(BeautifulSoup(comment, 'html.parser'))
-    polite_sleep()
+    return soup
+
+def get_soup(url):
+    """
+    Fetch a URL, parse HTML (including tables inside comments), 
+    and return a BeautifulSoup object. Raises RateLimited once the host has
+    answered 429. Safe to call from several threads; each host's rate limit
+    is shared.
+    """
+    html = fetch_html(url)
+    start = time.perf_counter()
+    soup = parse_html(html)
+    elapsed = time.perf_counter() - start
+    metrics.record('parse', elapsed, url_class(url))
+    logger.debug(f"Parsed {url} ({len(html) // 1024}KB, {PARSE_MODE}) in {elapsed * 1000:.1f}ms")
     return soup
@@ -0,0 +1,125 @@
+"""
+Incremental label refresh for an existing draft dataset.
+
+    python refresh.py raw-data/drafts-2008-to-2024.csv [--out refreshed.csv]
+
+College, team and meta fields of drafted players never change, so only
+each active player's BBRef page is re-fetched to update the NBA career
+fields (NBA_*, MAIN NBA TEAM, NBA Team Development, PREV_YR_*). Players
+whose careers have ended are left untouched.
+"""
+import argparse
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+
+import pandas as pd
+
+import network
+from network import get_soup, MAX_WORKERS
+from scraper import get_draft_picks, get_nba_career, apply_nba_career
+
+logger = logging.getLogger(__name__)
+
+# A career counts as over once the player has missed this many seasons in a row
+INACTIVE_SEASONS = 2
+# Draftees still waiting on a debut after this many seasons are treated as done
+NO_DEBUT_SEASONS = 3
+
+def current_season(today=None):
+    """
+    NBA seasons are named by the year they end in and tip off in October.
+    """
+    today = today or date.today()
+    return today.year + 1 if today.month >= 10 else today.year
+
+def career_ended(row, season):
+    """
+    True if the stored row shows a finished career. Rows scraped before
+    NBA_last_season existed are always refreshed.
+    """
+    last = row.get('NBA_last_season')
+    if last is None or pd.isna(last):
+        return False
+    if int(last) == 0:
+        return season - int(row['Draft Year']) > NO_DEBUT_SEASONS
+    return season - int(last) >= INACTIVE_SEASONS
+
+def bbref_urls(years):
+    """
+    Map (Draft Year, Pick Number) -> BBRef player URL, one draft page per year.
+    Every numbered pick is included: only the player page is re-fetched, so
+    the college checks of scraper.plan_fetches don't apply, and which
+    careers are over is decided from the stored rows (career_ended).
+    """
+    urls = {}
+    for year in years:
+        for pick in get_draft_picks(year):
+            if pick['pick'] and pick['pick'].isdigit():
+                urls[(year, int(pick['pick']))] = pick['bbref_url']
+    return urls
+
+def refresh_record(record, url):
+    """
+    Re-fetch one player's BBRef page and rewrite the NBA career fields.
+    """
+    _, career_stats, main_team = get_nba_career(get_soup(url))
+    apply_nba_career(record, career_stats, main_team)
+    return record
+
+def refresh(df, season=None, max_workers=MAX_WORKERS):
+    """
+    Return a copy of df with NBA career fields refreshed for active players.
+    """
+    season = season or current_season()
+    records = df.to_dict(orient='records')
+    active = [i for i, r in enumerate(records) if not career_ended(r, season)]
+    logger.info(f"Refreshing {len(active)} of {len(records)} players; "
+                f"{len(records) - len(active)} careers have ended")
+
+    urls = bbref_urls(sorted({int(records[i]['Draft Year']) for i in active}))
+    jobs = []
+    for i in active:
+        key = (int(records[i]['Draft Year']), int(records[i]['Pick Number']))
+        if key in urls:
+            jobs.append((i, urls[key]))
+        else:
+            logger.warning(f"No draft page entry for {records[i]['Name']} {key}; leaving as is")
+
+    def run(job):
+        i, url = job
+        try:
+            refresh_record(records[i], url)
+        except Exception:
+            logger.exception(f"Failed to refresh {records[i]['Name']}")
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        list(pool.map(run, jobs))
+
+    out = pd.DataFrame(records)
+    # keep the original column order, with any new career fields at the end
+    return out[list(df.columns) + [c for c in out.columns if c not in df.columns]]
+
+def main():
+    parser = argparse.ArgumentParser(description="Refresh NBA career fields for active players.")
+    parser.add_argument('dataset', help="CSV produced by main.py")
+    parser.add_argument('--out', help="output CSV (defaults to overwriting the dataset)")
+    parser.add_argument('--season', type=int, help="season to refresh against (defaults to the current one)")
+    parser.add_argument('--no-cache', action='store_true', help="always re-download player pages")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s — %(levelname)s — %(message)s")
+    if args.no_cache:
+        network.USE_CACHE = False
+
+    df = pd.read_csv(args.dataset)
+    out = refresh(df, args.season)
+    path = args.out or args.dataset
+    tmp = f"{path}.tmp"
+    out.to_csv(tmp, index=False)
+    os.replace(tmp, path)
+    logger.info(f"Wrote refreshed dataset to {path}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+import zlib
+
+logger = logging.getLogger(__name__)
+
+REPLAY_DIR = os.path.join("raw-data", "replay")
+
+def fixture_name(url):
+    """
+    Readable, collision-free file name for a URL's recorded HTML.
+    """
+    slug = re.sub(r'[^A-Za-z0-9]+', '-', url.split('://', 1)[-1]).strip('-')[-80:]
+    return f"{slug}-{hashlib.sha256(url.encode('utf-8')).hexdigest()[:12]}.html.z"
+
+class Recorder:
+    """
+    Saves every page get_soup receives (network or cache) as zlib-compressed
+    HTML under fixture_dir, with an index.json mapping URL -> file.
+    """
+    def __init__(self, fixture_dir):
+        self.fixture_dir = fixture_dir
+        self.lock = threading.Lock()
+        os.makedirs(fixture_dir, exist_ok=True)
+        self.index_path = os.path.join(fixture_dir, 'index.json')
+        self.index = {}
+        if os.path.exists(self.index_path):
+            with open(self.index_path) as f:
+                self.index = json.load(f)
+
+    def save(self, url, html):
+        name = fixture_name(url)
+        with open(os.path.join(self.fixture_dir, name), 'wb') as f:
+            f.write(zlib.compress(html.encode('utf-8'), 6))
+        with self.lock:
+            self.index[url] = name
+            with open(self.index_path, 'w') as f:
+                json.dump(self.index, f, indent=1)
+
+class ReplayTransport:
+    """
+    Serves recorded HTML back from a Recorder's fixture_dir, with no network,
+    cache or rate limiting. Unrecorded URLs raise KeyError.
+    """
+    def __init__(self, fixture_dir):
+        self.fixture_dir = fixture_dir
+        with open(os.path.join(fixture_dir, 'index.json')) as f:
+            self.index = json.load(f)
+        logger.debug(f"Replaying {len(self.index)} pages from {fixture_dir}")
+
+    def fetch(self, url):
+        name = self.index.get(url)
+        if name is None:
+            raise KeyError(f"No recorded page for {url} in {self.fixture_dir}")
+        with open(os.path.join(self.fixture_dir, name), 'rb') as f:
+            return zlib.decompress(f.read()).decode('utf-8')
@@ -1,12 +1,18 @@
 import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-import pandas as pd
 import re
+import time
 
-from network import get_soup
+from network import get_soup, MAX_WORKERS
+from metrics import metrics
+from store import KeySet
 from extractors import (
-    extract_height_weight, extract_sr_cbb_link, get_stat,
-    get_advanced_stats, get_per40_stats, get_per100_stats, get_team_summary, get_college_season_summary, get_nba_career_stats
+    extract_height_weight, extract_sr_cbb_link, decode_row, map_columns, COLLEGE_PER_GAME_COLUMNS, NBA_CAREER_COLUMNS,
+    ADVANCED_COLUMNS, PER40_COLUMNS, PER100_COLUMNS, TEAM_SUMMARY_FIELDS, COLLEGE_SUMMARY_FIELDS,
+    get_advanced_stats, get_per40_stats, get_per100_stats, get_team_summary, get_college_team_summary, get_nba_career_stats,
+    prefetch_college_summaries,
 )
 
 logger = logging.getLogger(__name__)
@@ -14,6 +20,34 @@ logger = logging.getLogger(__name__)
 BBREF_BASE = 'https://www.basketball-reference.com'
 CBB_BASE = 'https://www.sports-reference.com'
 
+# BBRef player URLs found to have no SR/CBB college stats link. Entries
+# expire so a link added to the page later (or a misread page) is picked up.
+NO_COLLEGE_PATH = os.path.join("raw-data", "no-college.sqlite")
+NO_COLLEGE_TTL = 30 * 24 * 3600
+no_college = KeySet(NO_COLLEGE_PATH, ttl=NO_COLLEGE_TTL)
+
+# Pages a pick can need, named by cache.url_class, in the order they are fetched
+FULL_PLAN = ('player', 'college', 'college_team', 'team')
+
+def _floats(fields):
+    return {field: 'float' for field in fields}
+
+# Every column process_player can emit, in output order, with its type
+RECORD_COLUMNS = {
+    'Draft Year': 'int', 'Pick Number': 'int', 'NBA Team': 'str', 'POS': 'str',
+    'Name': 'str', 'Age': 'float', 'College': 'str', 'Height': 'int', 'Weight': 'int',
+    'Height/Weight': 'float', 'NBA Relatives': 'int', 'Seasons Played (College)': 'int',
+    **_floats(['COLLEGE_G', 'COLLEGE_GS', 'COLLEGE_GS%']),
+    **_floats(c for c in COLLEGE_PER_GAME_COLUMNS if c not in ('COLLEGE_G', 'COLLEGE_GS')),
+    'COLLEGE_Height': 'int', 'COLLEGE_Weight': 'int',
+    **_floats(ADVANCED_COLUMNS), **_floats(PER40_COLUMNS), **_floats(PER100_COLUMNS),
+    **_floats(COLLEGE_SUMMARY_FIELDS),
+    'MAIN NBA TEAM': 'str', 'NBA_seasons': 'int',
+    **_floats(NBA_CAREER_COLUMNS), 'NBA_GS%': 'float', 'NBA_last_season': 'int',
+    'NBA Team Development': 'int', 'College Strength': 'int',
+    **_floats(TEAM_SUMMARY_FIELDS),
+}
+
 TEAM_PLAYER_DEVELOPMENT = {
     # Great reputation
     'SAS': 4, 'GSW': 4, 'BOS': 4, 'TOR': 4, 'MIA': 4, 'OKC': 4,
@@ -178,119 +212,135 @@ def get_player_meta(bbref_url):
     position_abbrev = split_and_map(position)
 
     # ===== Getting nba career stats and main nba team ========
-    table = soup.find('table', id='per_game_stats')
-
-    # No NBA games played
-    if not table or not table.find('tfoot'):
+    played, career_stats, main_team = get_nba_career(soup)
+    if not played:
         return (
             relatives,
             cbb_url,
             birth_date,
             '', # no pos abbreviation for nba
+            career_stats,
+            '' # no main nba team
+        )
+    return relatives, cbb_url, birth_date, position_abbrev, career_stats, main_team
+
+
+def get_nba_career(soup):
+    """
+    From a BBRef player page, return (played, career_stats, main_team):
+    career per-game stats plus NBA_GS% and NBA_last_season, and the team the
+    player logged the most games for over his first four seasons.
+    """
+    table = soup.find('table', id='per_game_stats')
+
+    # No NBA games played
+    if not table or not table.find('tfoot'):
+        return (
+            False,
             {
-                'seasons':        0,
-                'games':          0,
-                'games_started':  0,
-                'mp_per_g':       0,
-                'fg_per_g':       0,
-                'fga_per_g':      0,
-                'fg_pct':         0,
-                'fg3_per_g':      0,
-                'fg3a_per_g':     0,
-                'fg3_pct':        0,
-                'fg2_per_g':      0,
-                'fg2a_per_g':     0,
-                'fg2_pct':        0,
-                'efg_pct':        0,
-                'ft_per_g':       0,
-                'fta_per_g':      0,
-                'ft_pct':         0,
-                'orb_per_g':      0,
-                'drb_per_g':      0,
-                'trb_per_g':      0,
-                'ast_per_g':      0,
-                'stl_per_g':      0,
-                'blk_per_g':      0,
-                'tov_per_g':      0,
-                'pf_per_g':       0,
-                'pts_per_g':      0,
-                'GS%':            0,
+                'NBA_seasons': 0,
+                **{field: 0.0 for field in NBA_CAREER_COLUMNS},
+                'NBA_GS%': 0.0,
+                'NBA_last_season': 0,
             },
             '' # no main nba team
         )
 
     # Played in NBA
-    else:
-        tfoot = table and table.find('tfoot')
-
-        # — locate the one <tr> whose first <th> starts with a number + " Yr" —
-        career_tr = None
-        for tr in tfoot.find_all('tr'):
-            th = tr.find('th', {'data-stat': 'year_id'})
-            if not th:
-                continue
-            text = th.get_text(strip=True)
-            if re.match(r'\d+\s*Yr', text):
-                career_tr = tr
-                year_text = text
-                break
-
-        # — extract the number of seasons —
-        nba_seasons = int(re.match(r'\d+', year_text).group())
-        career_stats = get_nba_career_stats(career_tr, nba_seasons) # initialize dict
-
-        # — compute NBA games‐started % across career —
-        games = career_stats.get('NBA_G', 0)
-        gs   = career_stats.get('NBA_GS', 0)
-        career_stats['NBA_GS%'] = round((gs / games * 100), 3) if games > 0 else 0.0
-
-
-        # === compute MAIN NBA TEAM over first four seasons, excluding any 2TM rows ===
-        tbody = table.find('tbody')
-        all_rows = tbody.find_all('tr')
-
-        # 1) collect the earliest four distinct seasons (by csk)
-        seasons = []
-        for r in all_rows:
-            th = r.find('th', {'data-stat': 'year_id'})
-            if not th or not th.get('csk'): 
-                continue
-            yr = int(th['csk'])
-            if yr not in seasons:
-                seasons.append(yr)
-        seasons = sorted(seasons)[:4]
-
-        # 2) sum up games for each team in those seasons (skip any '2TM' or '3TM' rows)
-        team_games = {}
-        for r in all_rows:
-            th = r.find('th', {'data-stat': 'year_id'})
-            if not th or not th.get('csk'):
-                continue
-            yr = int(th['csk'])
-            if yr not in seasons:
-                continue
-            team_td = r.find('td', {'data-stat': 'team_name_abbr'})
-            team = team_td.text.strip() if team_td else ''
-            if team == '2TM' or team == '3TM' or not team:
-                continue
-            games_td = r.find('td', {'data-stat': 'games'})
-            games = float(games_td.text.strip()) if games_td and games_td.text.strip() else 0.0
-            team_games[team] = team_games.get(team, 0) + games
-
-        main_team = max(team_games, key=team_games.get) if team_games else ''
-
-        return relatives, cbb_url, birth_date, position_abbrev, career_stats, main_team
+    tfoot = table.find('tfoot')
+
+    # — locate the one <tr> whose first <th> starts with a number + " Yr" —
+    career_tr = None
+    for tr in tfoot.find_all('tr'):
+        th = tr.find('th', {'data-stat': 'year_id'})
+        if not th:
+            continue
+        text = th.get_text(strip=True)
+        if re.match(r'\d+\s*Yr', text):
+            career_tr = tr
+            year_text = text
+            break
+
+    # — extract the number of seasons —
+    nba_seasons = int(re.match(r'\d+', year_text).group())
+    career_stats = get_nba_career_stats(career_tr, nba_seasons) # initialize dict
+
+    # — compute NBA games‐started % across career —
+    games = career_stats.get('NBA_G', 0)
+    gs   = career_stats.get('NBA_GS', 0)
+    career_stats['NBA_GS%'] = round((gs / games * 100), 3) if games > 0 else 0.0
+
+
+    # === compute MAIN NBA TEAM over first four seasons, excluding any 2TM rows ===
+    tbody = table.find('tbody')
+    all_rows = tbody.find_all('tr')
+
+    # 1) collect the earliest four distinct seasons (by csk)
+    seasons = []
+    for r in all_rows:
+        th = r.find('th', {'data-stat': 'year_id'})
+        if not th or not th.get('csk'): 
+            continue
+        yr = int(th['csk'])
+        if yr not in seasons:
+            seasons.append(yr)
+    # most recent season played, used by refresh.py to skip finished careers
+    career_stats['NBA_last_season'] = max(seasons) if seasons else 0
+    seasons = sorted(seasons)[:4]
+
+    # 2) sum up games for each team in those seasons (skip any '2TM' or '3TM' rows)
+    team_games = {}
+    for r in all_rows:
+        th = r.find('th', {'data-stat': 'year_id'})
+        if not th or not th.get('csk'):
+            continue
+        yr = int(th['csk'])
+        if yr not in seasons:
+            continue
+        team_td = r.find('td', {'data-stat': 'team_name_abbr'})
+        team = team_td.text.strip() if team_td else ''
+        if team == '2TM' or team == '3TM' or not team:
+            continue
+        games = decode_row(r).get('games', 0.0)
+        team_games[team] = team_games.get(team, 0) + games
+
+    main_team = max(team_games, key=team_games.get) if team_games else ''
 
+    return True, career_stats, main_team
+
+
+def college_team_link(row):
+    """
+    Return the SR/CBB team-season link from a college per-game row, or None.
+    """
+    team_cell = row.find('td', {'data-stat': 'team_name_abbr'})
+    if team_cell:
+        a = team_cell.find('a')
+        if a and a.get('href'):
+            return f"{CBB_BASE}{a['href']}"
+    return None
 
 def get_college_stats(cbb_url, nba_team, college):
     """
     Given a SR/CBB URL, fetch college stats, meta, and team performance:
     - height (cm), weight (kg), seasons played
     - college team season summary metrics prefixed with COLLEGE_
+    The stats come back as a plain dict ({} if the page or table is missing).
+    """
+    height, weight, seasons, stats, team_link = read_college_page(cbb_url, nba_team, college)
+    if stats:
+        stats.update(get_college_team_summary(team_link))
+    return height, weight, seasons, stats
+
+def read_college_page(cbb_url, nba_team, college):
+    """
+    get_college_stats without the team summary: returns (height, weight,
+    seasons, stats, team_link), where team_link is the SR/CBB team-season
+    page of the player's last college season (or None).
     """
     soup = get_soup(cbb_url)
     if not soup:
-        return 0, 0, 0, pd.DataFrame()
+        return 0, 0, 0, {}, None
 
     # height & weight
     height, weight = extract_height_weight(soup)
@@ -298,66 +348,37 @@ def get_college_stats(cbb_url, nba_team, college):
     # per-game stats table
     per_game = soup.find('table', id='players_per_game')
     if not per_game:
-        return height, weight, 0, pd.DataFrame()
+        return height, weight, 0, {}, None
 
     rows = per_game.find('tbody').find_all('tr')
     rows = [r for r in rows if not r.get('class') or 'thead' not in r.get('class')]
     if not rows:
-        return height, weight, 0, pd.DataFrame()
+        return height, weight, 0, {}, None
 
     last_row = rows[-1]
     seasons = len(rows)
 
-    # build basic stats dict
-    stats = {
-        'COLLEGE_G': get_stat(last_row, 'games'),
-        'COLLEGE_GS': get_stat(last_row, 'games_started'),
-        'COLLEGE_GS%': round(
-            get_stat(last_row, 'games_started') / get_stat(last_row, 'games'), 3
-        ) if get_stat(last_row, 'games') > 0 else 0.0,
-        'COLLEGE_MPG': get_stat(last_row, 'mp_per_g'),
-        'COLLEGE_FG': get_stat(last_row, 'fg_per_g'),
-        'COLLEGE_FGA': get_stat(last_row, 'fga_per_g'),
-        'COLLEGE_FG%': get_stat(last_row, 'fg_pct'),
-        'COLLEGE_3P': get_stat(last_row, 'fg3_per_g'),
-        'COLLEGE_3PA': get_stat(last_row, 'fg3a_per_g'),
-        'COLLEGE_3P%': get_stat(last_row, 'fg3_pct'),
-        'COLLEGE_FT': get_stat(last_row, 'ft_per_g'),
-        'COLLEGE_FTA': get_stat(last_row, 'fta_per_g'),
-        'COLLEGE_FT%': get_stat(last_row, 'ft_pct'),
-        'COLLEGE_DRB': get_stat(last_row, 'drb_per_g'),
-        'COLLEGE_ORB': get_stat(last_row, 'orb_per_g'),
-        'COLLEGE_TRB': get_stat(last_row, 'trb_per_g'),
-        'COLLEGE_AST': get_stat(last_row, 'ast_per_g'),
-        'COLLEGE_STL': get_stat(last_row, 'stl_per_g'),
-        'COLLEGE_BLK': get_stat(last_row, 'blk_per_g'),
-        'COLLEGE_TOV': get_stat(last_row, 'tov_per_g'),
-        'COLLEGE_PF': get_stat(last_row, 'pf_per_g'),
-        'COLLEGE_PTS': get_stat(last_row, 'pts_per_g'),
+    # build basic stats dict, with games-started % right after GS
+    per_game_stats = map_columns(decode_row(last_row), COLLEGE_PER_GAME_COLUMNS)
+    games, started = per_game_stats['COLLEGE_G'], per_game_stats['COLLEGE_GS']
+    stats = {}
+    for field, value in per_game_stats.items():
+        stats[field] = value
+        if field == 'COLLEGE_GS':
+            stats['COLLEGE_GS%'] = round(started / games, 3) if games > 0 else 0.0
+    stats.update({
         'COLLEGE_Height': height,
         'COLLEGE_Weight': weight,
         'NBA Team': nba_team or '',
         'College': college or ''
-    }
+    })
 
     # advanced, per-40, per-100 stats
     stats.update(get_advanced_stats(soup))
     stats.update(get_per40_stats(soup))
     stats.update(get_per100_stats(soup))
 
-    # extract college team summary link
-    team_cell = last_row.find('td', {'data-stat': 'team_name_abbr'})
-    team_link = None
-    if team_cell:
-        a = team_cell.find('a')
-        if a and a.get('href'):
-            team_link = f"{CBB_BASE}{a['href']}"
-
-    stats.update(get_college_season_summary(get_soup(team_link)))
-
-    df = pd.DataFrame([stats])
-
-    return height, weight, seasons, df
+    return height, weight, seasons, stats, college_team_link(last_row)
 
 
 def calculate_age(birth_date, draft_year):
@@ -380,6 +401,16 @@ def process_player(pick_info, draft_year):
     Given a dict with 'pick', 'team', 'name', 'bbref_url', 'college' and draft_year,
     fetch meta info (including Position), college stats (raw), and return a record dict.
     """
+    collected = collect_player(pick_info, draft_year)
+    return finish_player(*collected) if collected else None
+
+def collect_player(pick_info, draft_year):
+    """
+    First half of process_player: the player and college pages. Returns
+    (record, career_stats, main_team, team_link) for finish_player, or None
+    if the player is skipped. Split out so process_picks can prefetch the
+    whole class's college team pages in between.
+    """
     name = pick_info['name']
     team = pick_info['team']
     college = pick_info['college']
@@ -388,16 +419,17 @@ def process_player(pick_info, draft_year):
 
     if not cbb_url:
         logger.info(f"Skipping {name} – no college stats link")
+        # only a page that was actually read can show the link is missing
+        if relatives is not None:
+            no_college.add(pick_info['bbref_url'])
         return None
 
     age = calculate_age(birth_date, draft_year)
 
-    height, weight, seasons, raw_df = get_college_stats(cbb_url, team, college)
-    if raw_df.empty:
+    height, weight, seasons, stats, team_link = read_college_page(cbb_url, team, college)
+    if not stats:
         return None
 
-    stats = raw_df.iloc[0].to_dict()
-
     record = {
         'Draft Year': draft_year,
         'Pick Number': int(pick_info['pick']) if pick_info['pick'] and pick_info['pick'].isdigit() else 0,
@@ -413,7 +445,22 @@ def process_player(pick_info, draft_year):
         'Seasons Played (College)': seasons
     }
     record.update(stats)
+    return record, career_stats, main_team, team_link
 
+def finish_player(record, career_stats, main_team, team_link):
+    """
+    Second half of process_player: college team summary and NBA career fields.
+    """
+    record.update(get_college_team_summary(team_link))
+    apply_nba_career(record, career_stats, main_team)
+    return record
+
+def apply_nba_career(record, career_stats, main_team):
+    """
+    Write the NBA-career-dependent fields into a record: career stats, MAIN
+    NBA TEAM, its development score and its pre-draft season summary.
+    College Strength is (re)derived from the record's College.
+    """
     # Record nba career stats
     record['MAIN NBA TEAM'] = main_team
     for stat, val in career_stats.items():
@@ -438,13 +485,67 @@ def process_player(pick_info, draft_year):
     
     return record
 
+def plan_fetches(pick_info, pages=FULL_PLAN):
+    """
+    Decide which of pages (url classes, see FULL_PLAN) a pick needs before
+    anything is requested. A plan that includes the college pages is empty
+    for picks with no college in the draft table (international, G League)
+    or recently found to lack a SR/CBB link, since process_player would
+    discard them.
+    """
+    if 'college' in pages and (not pick_info.get('college') or pick_info['bbref_url'] in no_college):
+        return ()
+    return pages
+
 # Called in main.py
-def write_record(record, output_file, header_written):
+def process_picks(picks, draft_year, max_workers=MAX_WORKERS):
     """
-    Append a single player's record to CSV.
-    If header_written is False, write header row first.
-    Returns True (header is now written).
+    Run process_player for every named pick concurrently and yield
+    (pick, record, error) in draft order. record is None for skipped
+    players, including picks whose fetch plan is empty (never requested);
+    error is the exception if processing the pick failed. Planned pages are
+    counted per url class next to the requests actually made.
+    Player and college pages are read for the whole class first, then the
+    college team pages they link to are prefetched once per (school,
+    season) before the records are finished. Per-host rate limits are
+    enforced in get_soup, so overlapping players only wait on the host
+    budget, not on each other.
     """
-    df = pd.DataFrame([record])
-    df.to_csv(output_file, mode='a', header=not header_written, index=False)
-    return True
+    extract_time = {}
+
+    def stage(pick, fn, *args):
+        start, io_before = time.perf_counter(), metrics.thread_io()
+        try:
+            return fn(*args), None
+        except Exception as e:
+            logger.exception(f"Failed to process {pick['name']} ({draft_year})")
+            return None, e
+        finally:
+            io = metrics.thread_io() - io_before
+            extract_time[pick['bbref_url']] = extract_time.get(pick['bbref_url'], 0.0) + time.perf_counter() - start - io
+
+    def collect(pick):
+        plan = plan_fetches(pick)
+        if not plan:
+            logger.info(f"Skipping {pick['name']} – no college to fetch")
+            metrics.incr('planned_skips')
+            return None, None
+        for kind in plan:
+            metrics.incr('planned', url_class=kind)
+        return stage(pick, collect_player, pick, draft_year)
+
+    def finish(item):
+        pick, (collected, error) = item
+        if collected:
+            record, error = stage(pick, finish_player, *collected)
+        else:
+            record = None
+        if pick['bbref_url'] in extract_time:
+            metrics.record('extract', extract_time[pick['bbref_url']], 'player')
+        return pick, record, error
+
+    picks = [p for p in picks if p['name'] != '']
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        collected = list(pool.map(collect, picks))
+        prefetch_college_summaries(c[3] for c, _ in collected if c)
+        yield from pool.map(finish, zip(picks, collected))
@@ -0,0 +1,123 @@
+import csv
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+
+try:
+    import pyarrow as pa
+    import pyarrow.ipc
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+
+FORMATS = {'csv': '.csv', 'parquet': '.parquet', 'arrow': '.arrow'}
+BATCH_SIZE = 50  # records buffered before each flush
+COLUMN_TYPES = ('int', 'float', 'str')
+
+def arrow_schema(columns):
+    """
+    pa.schema for a {column: 'int' | 'float' | 'str'} mapping. Every field
+    is nullable, so records missing a column write nulls.
+    """
+    types = {'int': pa.int64(), 'float': pa.float64(), 'str': pa.string()}
+    return pa.schema([(name, types[kind]) for name, kind in columns.items()])
+
+class RecordSink:
+    """
+    Buffered writer for scraped player records. Rows are collected as dicts
+    and flushed in batches against a fixed schema: columns maps every output
+    column to 'int', 'float' or 'str' (scraper.RECORD_COLUMNS), so neither
+    the column set nor the Arrow types depend on which records come first.
+    When appending to a CSV its existing header sets the column order.
+    Writes CSV, or Parquet / Arrow IPC when pyarrow is installed; Arrow
+    formats are written to a temp file and only appear on close(), so they
+    don't support appending.
+    """
+    def __init__(self, path, columns, fmt='csv', append=False, batch_size=BATCH_SIZE):
+        if fmt not in FORMATS:
+            raise ValueError(f"Unknown output format {fmt!r}; expected one of {sorted(FORMATS)}")
+        if fmt != 'csv' and pa is None:
+            raise ImportError(f"pyarrow is required to write {fmt} output")
+        unknown = {kind for kind in columns.values() if kind not in COLUMN_TYPES}
+        if unknown:
+            raise ValueError(f"Unknown column type(s) {sorted(unknown)}; expected one of {COLUMN_TYPES}")
+        self.path = path
+        self.fmt = fmt
+        self.columns = list(columns)
+        self.schema = arrow_schema(columns) if fmt != 'csv' else None
+        self.batch_size = batch_size
+        self.buffer = []
+        self.written = 0
+        self.writer = None
+
+        exists = os.path.exists(path) and os.path.getsize(path) > 0
+        if append and fmt != 'csv':
+            raise ValueError(f"{fmt} output can't be appended to; rewrite it instead")
+        if exists and not append:
+            os.remove(path)
+        self.header_written = append and exists
+        if self.header_written:
+            with open(path, newline='') as f:
+                header = next(csv.reader(f))
+            if header != self.columns:
+                logger.warning(f"{path} header differs from the record schema; keeping the file's columns")
+            self.columns = header
+
+    def write(self, record):
+        """
+        Buffer a record, flushing when the batch is full. Returns the number
+        of records flushed (0 if the record is still buffered).
+        """
+        extra = [k for k in record if k not in self.columns]
+        if extra:
+            logger.warning(f"Dropping columns not in the record schema: {extra}")
+        self.buffer.append([record.get(c) for c in self.columns])
+        if len(self.buffer) >= self.batch_size:
+            return self.flush()
+        return 0
+
+    def flush(self):
+        """
+        Write out buffered records. Returns how many were written.
+        """
+        if not self.buffer:
+            return 0
+        if self.fmt == 'csv':
+            with open(self.path, 'a', newline='') as f:
+                w = csv.writer(f)
+                if not self.header_written:
+                    w.writerow(self.columns)
+                    self.header_written = True
+                w.writerows(self.buffer)
+        else:
+            self._flush_arrow()
+        logger.debug(f"Flushed {len(self.buffer)} records to {self.path}")
+        flushed = len(self.buffer)
+        self.written += flushed
+        self.buffer = []
+        return flushed
+
+    def _flush_arrow(self):
+        data = {c: [row[i] for row in self.buffer] for i, c in enumerate(self.columns)}
+        table = pa.table(data, schema=self.schema)
+        if self.writer is None:
+            tmp = f"{self.path}.tmp"
+            if self.fmt == 'parquet':
+                self.writer = pq.ParquetWriter(tmp, self.schema)
+            else:
+                self.writer = pa.ipc.new_file(tmp, self.schema)
+        self.writer.write_table(table)
+
+    def close(self):
+        self.flush()
+        if self.writer is not None:
+            self.writer.close()
+            os.replace(f"{self.path}.tmp", self.path)
+            self.writer = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,127 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+
+class _SQLiteTier:
+    """
+    The SQLite file behind a store, opened (and created) on first use so
+    importing a module that declares a store touches nothing on disk.
+    Worker processes each hold their own connection and wait on each
+    other's writes. Callers serialize access with their own lock.
+    """
+    def __init__(self, path, table, columns):
+        self.path = path
+        self.schema = f"CREATE TABLE IF NOT EXISTS {table} ({columns})"
+        self.db = None
+
+    def execute(self, sql, params=()):
+        if self.db is None:
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            self.db = sqlite3.connect(self.path, check_same_thread=False, timeout=60)
+            self.db.execute(self.schema)
+            self.db.commit()
+        return self.db.execute(sql, params)
+
+    def write(self, sql, params=()):
+        self.execute(sql, params)
+        self.db.commit()
+
+class SummaryStore:
+    """
+    Thread-safe memo of parsed summaries with an in-memory tier and an
+    optional SQLite tier that persists between runs. Concurrent lookups
+    of the same missing key wait on a single computation instead of each
+    fetching the page. Each value is written as its own row, so worker
+    processes sharing the file never overwrite each other's entries, and a
+    key missing from memory is looked up in the file before computing it.
+    """
+    def __init__(self, path=None):
+        self.path = path
+        self.lock = threading.Lock()
+        self.data = {}
+        self.pending = {}
+        self.db = _SQLiteTier(path, 'summaries', 'key TEXT PRIMARY KEY, value TEXT NOT NULL') if path else None
+
+    def get(self, key):
+        with self.lock:
+            return self._lookup(key)
+
+    def _lookup(self, key):
+        if key not in self.data and self.db is not None:
+            row = self.db.execute("SELECT value FROM summaries WHERE key = ?", (key,)).fetchone()
+            if row:
+                self.data[key] = json.loads(row[0])
+        return self.data.get(key)
+
+    def get_or_compute(self, key, compute, persist=True):
+        """
+        Return the stored value for key, or call compute() once and store
+        its result. Falsy results (failed fetches) are not stored.
+        persist=False keeps the value in memory only.
+        """
+        with self.lock:
+            value = self._lookup(key)
+            if value is not None:
+                return value
+            event = self.pending.get(key)
+            owner = event is None
+            if owner:
+                event = self.pending[key] = threading.Event()
+        if not owner:
+            event.wait()
+            with self.lock:
+                if key in self.data:
+                    return self.data[key]
+            return self.get_or_compute(key, compute, persist)
+
+        try:
+            value = compute()
+            if value:
+                with self.lock:
+                    self.data[key] = value
+                    if persist and self.db is not None:
+                        self.db.write(
+                            "INSERT OR REPLACE INTO summaries (key, value) VALUES (?, ?)",
+                            (key, json.dumps(value))
+                        )
+            return value
+        finally:
+            with self.lock:
+                del self.pending[key]
+            event.set()
+
+class KeySet:
+    """
+    Thread-safe set of string keys persisted to SQLite, for indexes such as
+    players known to have no college stats page. Membership checks read
+    the file, so keys added by other worker processes are seen too. With a
+    ttl (seconds) a key drops out that long after it was last added.
+    """
+    def __init__(self, path=None, ttl=None):
+        self.path = path
+        self.ttl = ttl
+        self.lock = threading.Lock()
+        self.keys = {}  # key -> added_at
+        self.db = _SQLiteTier(path, 'keys', 'key TEXT PRIMARY KEY, added_at REAL NOT NULL') if path else None
+
+    def _live(self, added_at):
+        return self.ttl is None or added_at + self.ttl > time.time()
+
+    def __contains__(self, key):
+        with self.lock:
+            added_at = self.keys.get(key)
+            if added_at is None and self.db is not None:
+                row = self.db.execute("SELECT added_at FROM keys WHERE key = ?", (key,)).fetchone()
+                if row:
+                    added_at = self.keys[key] = row[0]
+            return added_at is not None and self._live(added_at)
+
+    def add(self, key):
+        with self.lock:
+            if key in self.keys and self._live(self.keys[key]):
+                return
+            now = self.keys[key] = time.time()
+            if self.db is not None:
+                self.db.write("INSERT OR REPLACE INTO keys (key, added_at) VALUES (?, ?)", (key, now))
@@ -0,0 +1,135 @@
+from datetime import date
+
+import pytest
+
+import cache
+import network
+from cache import IMMUTABLE, PLAYER_TTL, CURRENT_TTL, ResponseCache, season_finished, ttl_for, url_class
+
+BBREF = 'https://www.basketball-reference.com'
+SR = 'https://www.sports-reference.com'
+
+class FakeTime:
+    """
+    Stands in for cache.time; time() returns whatever now is set to.
+    """
+    def __init__(self, now):
+        self.now = now
+
+    def time(self):
+        return self.now
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeTime(1_700_000_000.0)
+    monkeypatch.setattr(cache, 'time', clock)
+    return clock
+
+def test_url_classes():
+    assert url_class(f'{BBREF}/draft/NBA_2015.html') == 'draft'
+    assert url_class(f'{BBREF}/teams/BOS/2015.html') == 'team'
+    assert url_class(f'{BBREF}/players/t/townska01.html') == 'player'
+    assert url_class(f'{SR}/cbb/players/karl-anthony-towns-1.html') == 'college'
+    assert url_class(f'{SR}/cbb/schools/kentucky/men/2015.html') == 'college_team'
+    assert url_class(f'{BBREF}/leagues/') == 'other'
+
+def test_season_finishes_in_july():
+    assert not season_finished(2025, today=date(2025, 6, 30))
+    assert season_finished(2025, today=date(2025, 7, 1))
+    assert season_finished(2024, today=date(2025, 1, 1))
+
+def test_ttl_policy(monkeypatch):
+    monkeypatch.setattr(cache, 'date', type('D', (), {'today': staticmethod(lambda: date(2025, 3, 1))}))
+    assert ttl_for(f'{BBREF}/draft/NBA_2015.html') is IMMUTABLE
+    assert ttl_for(f'{BBREF}/draft/NBA_2025.html') == CURRENT_TTL
+    assert ttl_for(f'{BBREF}/teams/BOS/2025.html') == CURRENT_TTL
+    assert ttl_for(f'{SR}/cbb/players/karl-anthony-towns-1.html') is IMMUTABLE
+    assert ttl_for(f'{BBREF}/players/t/townska01.html') == PLAYER_TTL
+    assert ttl_for(f'{BBREF}/leagues/') == CURRENT_TTL
+
+def test_entries_expire(tmp_path, clock):
+    store = ResponseCache(str(tmp_path))
+    player = f'{BBREF}/players/t/townska01.html'
+    store.put(player, '<html>a</html>', etag='"v1"')
+    store.put(f'{BBREF}/draft/NBA_2015.html', '<html>b</html>')
+    assert store.get(player).fresh
+    assert store.get(f'{BBREF}/draft/NBA_2015.html').expires_at is None
+
+    clock.now += PLAYER_TTL + 1
+    entry = store.get(player)
+    assert not entry.fresh
+    assert entry.text == '<html>a</html>'
+    assert entry.validators() == {'If-None-Match': '"v1"'}
+    assert store.get(f'{BBREF}/draft/NBA_2015.html').fresh
+
+def test_eviction_drops_least_recently_used(tmp_path, clock):
+    urls = [f'{BBREF}/draft/NBA_{year}.html' for year in (2011, 2012, 2013)]
+    store = ResponseCache(str(tmp_path))
+    store.put(urls[0], urls[0] * 50)
+    # room for two of the three (equal-sized) pages
+    store.max_bytes = 2.5 * store.db.execute("SELECT size FROM entries").fetchone()[0]
+    clock.now += 1
+    store.put(urls[1], urls[1] * 50)
+    clock.now += 1
+    store.get(urls[0])                      # now urls[1] is least recently used
+    clock.now += 1
+    store.put(urls[2], urls[2] * 50)
+    assert store.get(urls[1]) is None
+    assert store.get(urls[0]) is not None
+    assert store.get(urls[2]) is not None
+
+class FakeResponse:
+    def __init__(self, status_code, text='', headers=None):
+        self.status_code = status_code
+        self.text = text
+        self.content = text.encode('utf-8')
+        self.headers = headers or {}
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise network.requests.HTTPError(self.status_code)
+
+class FakeLimiter:
+    def acquire(self):
+        return 0.0
+
+    def check(self):
+        pass
+
+    def on_success(self, latency):
+        pass
+
+    def on_throttle(self, retry_after):
+        pass
+
+@pytest.fixture
+def offline(tmp_path, monkeypatch):
+    """
+    Route _fetch_html through a temporary cache and a scripted session;
+    returns (cache, queued responses, headers sent with each request).
+    """
+    store = ResponseCache(str(tmp_path))
+    responses, calls = [], []
+
+    def get(url, timeout=None, headers=None):
+        calls.append(headers)
+        return responses.pop(0)
+
+    monkeypatch.setattr(network, 'get_cache', lambda: store)
+    monkeypatch.setattr(network, 'limiter_for', lambda url: FakeLimiter())
+    monkeypatch.setattr(network.session, 'get', get)
+    return store, responses, calls
+
+def test_stale_entry_is_revalidated(offline, clock):
+    store, responses, calls = offline
+    url = f'{BBREF}/players/t/townska01.html'
+    responses.append(FakeResponse(200, '<html>v1</html>', {'ETag': '"v1"'}))
+    assert network._fetch_html(url) == '<html>v1</html>'
+    assert network._fetch_html(url) == '<html>v1</html>'   # fresh: no request
+    assert calls == [None]
+
+    clock.now += PLAYER_TTL + 1
+    responses.append(FakeResponse(304))
+    assert network._fetch_html(url) == '<html>v1</html>'
+    assert calls[1] == {'If-None-Match': '"v1"'}
+    assert store.get(url).fresh                            # 304 renewed the expiry
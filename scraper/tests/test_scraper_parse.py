@@ -0,0 +1,137 @@
+import pytest
+
+import network
+import scraper
+from extractors import (
+    extract_height_weight, extract_sr_cbb_link, get_advanced_stats,
+    get_per40_stats, get_per100_stats, get_college_season_summary,
+)
+
+CBB_URL = 'https://www.sports-reference.com/cbb/players/jane-doe-1.html'
+BBREF_URL = 'https://www.basketball-reference.com/players/d/doeja01.html'
+
+def stat_table(table_id, rows):
+    body = ''.join(
+        '<tr>' + ''.join(f'<td data-stat="{k}">{v}</td>' for k, v in row.items()) + '</tr>'
+        for row in rows
+    )
+    return f'<table class="stats_table" id="{table_id}"><thead><tr><th>Season</th></tr></thead><tbody>{body}</tbody></table>'
+
+# A trimmed SR/CBB player page: per-game table in the document, the others
+# commented out the way the site ships them, plus layout the extractors skip.
+COLLEGE_PAGE = f"""<!DOCTYPE html>
+<html><head><title>Jane Doe</title></head><body>
+<div id="header"><table id="nav"><tr><td>nav</td></tr></table></div>
+<div id="info"><div id="meta"><div><h1>Jane Doe</h1>
+<p><strong>Position:</strong> Forward</p>
+<p><span>6-9</span>,&nbsp;<span>230lb</span> (206cm,&nbsp;104kg)</p></div></div></div>
+<div class="table_container">
+{stat_table('players_per_game', [
+    {'games': '30', 'games_started': '10', 'mp_per_g': '20.1', 'pts_per_g': '9.5'},
+    {'team_name_abbr': '<a href="/cbb/schools/duke/men/2015.html">Duke</a>',
+     'games': '35', 'games_started': '35', 'mp_per_g': '31.0', 'pts_per_g': '17.2', 'fg3_pct': '.381'},
+])}
+</div>
+<!--
+{stat_table('players_advanced', [{'per': '20.0'}, {'per': '27.5', 'ts_pct': '.612', 'bpm': '9.1', 'usg_pct': ''}])}
+-->
+<div class="placeholder"></div>
+<!--
+{stat_table('players_per_min', [{'pts_per_min': '22.2', 'blk_per_min': '2.1'}])}
+-->
+<!-- {stat_table('players_per_poss', [{'pts_per_poss': '30.3', 'off_rtg': '121.0'}])} -->
+<table id="unrelated"><tbody><tr><td data-stat="per">99</td></tr></tbody></table>
+</body></html>
+"""
+
+# A trimmed BBRef player page: meta block with the SR/CBB link wrapped in an
+# inline tag, and the career table with its tfoot.
+PLAYER_PAGE = f"""<!DOCTYPE html>
+<html><body>
+<div id="meta"><div>
+<p><strong>Position:</strong> Small Forward and Power Forward ▪ <strong>Shoots:</strong> Right</p>
+<p><strong>Born: </strong><span id="necro-birth" data-birth="1995-02-03">February 3, 1995</span></p>
+<p><strong>Relatives</strong>: <a href="/a">A</a>, <a href="/b">B</a></p>
+<p><a href="{CBB_URL}?utm=1"><em>More College Stats on SR/CBB</em></a></p>
+</div></div>
+<table id="per_game_stats"><tbody>
+<tr><th data-stat="year_id" csk="2016">2015-16</th><td data-stat="team_name_abbr">BOS</td><td data-stat="games">60</td></tr>
+<tr><th data-stat="year_id" csk="2017">2016-17</th><td data-stat="team_name_abbr">BOS</td><td data-stat="games">70</td></tr>
+</tbody><tfoot>
+<tr><th data-stat="year_id">2 Yrs</th><td data-stat="games">130</td><td data-stat="games_started">40</td><td data-stat="pts_per_g">8.1</td></tr>
+</tfoot></table>
+</body></html>
+"""
+
+TEAM_PAGE = """<html><body>
+<div id="info"><div data-template="Partials/Teams/Summary">
+<p><strong>Record:</strong> 30-5 (1st of 15)</p>
+<p><strong>PS/G:</strong> 80.2</p><p><strong>PA/G:</strong> 64.1</p>
+<p><strong>SRS:</strong> 21.3</p><p><strong>SOS:</strong> 9.85 (5th of 363)</p>
+</div></div>
+<table id="roster"><tr><td>x</td></tr></table>
+</body></html>
+"""
+
+@pytest.fixture(params=['fast', 'full'])
+def parse(request, monkeypatch):
+    monkeypatch.setattr(network, 'PARSE_MODE', request.param)
+    return network.parse_html
+
+def college_fields(soup):
+    return {
+        'hw': extract_height_weight(soup),
+        'advanced': get_advanced_stats(soup),
+        'per40': get_per40_stats(soup),
+        'per100': get_per100_stats(soup),
+    }
+
+def test_fast_parse_keeps_only_target_fragments():
+    fragments = network.extract_fragments(COLLEGE_PAGE)
+    assert [f.split('>')[0] for f in fragments] == [
+        '<div id="meta"',
+        '<table class="stats_table" id="players_per_game"',
+        '<table class="stats_table" id="players_advanced"',
+        '<table class="stats_table" id="players_per_min"',
+        '<table class="stats_table" id="players_per_poss"',
+    ]
+
+@pytest.mark.parametrize('page', [COLLEGE_PAGE, TEAM_PAGE])
+def test_fast_and_full_extract_the_same(page, monkeypatch):
+    monkeypatch.setattr(network, 'PARSE_MODE', 'fast')
+    fast = network.parse_html(page)
+    monkeypatch.setattr(network, 'PARSE_MODE', 'full')
+    full = network.parse_html(page)
+    assert college_fields(fast) == college_fields(full)
+    assert get_college_season_summary(fast) == get_college_season_summary(full)
+
+def test_college_page(parse, monkeypatch):
+    monkeypatch.setattr(scraper, 'get_soup', lambda url: parse(COLLEGE_PAGE))
+    height, weight, seasons, stats, team_link = scraper.read_college_page(CBB_URL, 'BOS', 'Duke')
+    assert (height, weight, seasons) == (206, 104, 2)
+    assert stats['COLLEGE_G'] == 35 and stats['COLLEGE_GS%'] == 1.0
+    assert stats['COLLEGE_3P%'] == pytest.approx(0.381)
+    assert stats['C_PER'] == 27.5 and stats['C_USG%'] == 0.0
+    assert stats['C_BLK/40'] == 2.1 and stats['C_ORtg'] == 121.0
+    assert team_link == 'https://www.sports-reference.com/cbb/schools/duke/men/2015.html'
+
+def test_player_page(parse, monkeypatch):
+    monkeypatch.setattr(scraper, 'get_soup', lambda url: parse(PLAYER_PAGE))
+    relatives, cbb_url, birth, position, career, team = scraper.get_player_meta(BBREF_URL)
+    assert (relatives, cbb_url, birth, position) == (2, CBB_URL, '1995-02-03', 'SF,PF')
+    assert career['NBA_seasons'] == 2 and career['NBA_G'] == 130
+    assert career['NBA_last_season'] == 2017
+    assert team == 'BOS'
+
+def test_team_summary(parse):
+    summary = get_college_season_summary(parse(TEAM_PAGE))
+    assert summary['CT_Win%'] == round(30 / 35, 3)
+    assert summary['CT_SOS'] == 9.85 and summary['CT_SRS'] == 21.3
+
+def test_page_without_targets_falls_back_to_full_parse(monkeypatch):
+    monkeypatch.setattr(network, 'PARSE_MODE', 'fast')
+    soup = network.parse_html('<html><body><p>(201cm, 95kg)</p></body></html>')
+    assert extract_height_weight(soup) == (201, 95)
+
+def test_sr_cbb_link_in_inline_tag(parse):
+    assert extract_sr_cbb_link(parse(PLAYER_PAGE)) == CBB_URL
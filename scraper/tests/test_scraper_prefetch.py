@@ -0,0 +1,25 @@
+import requests
+
+import extractors
+from network import RateLimited
+
+def test_team_prefetch_skips_failed_teams(monkeypatch):
+    fetched = []
+
+    def get_team_summary(team, season):
+        if team == 'BOS':
+            raise RateLimited('host blocked')
+        if team == 'CHI':
+            raise requests.HTTPError('404')
+        fetched.append(team)
+
+    monkeypatch.setattr(extractors, 'get_team_summary', get_team_summary)
+    extractors.prefetch_team_summaries(2015, max_workers=4)
+    assert 'BOS' not in fetched and 'CHI' not in fetched
+    assert len(fetched) == 28
+
+def test_team_prefetch_uses_the_season_abbreviations(monkeypatch):
+    fetched = []
+    monkeypatch.setattr(extractors, 'get_team_summary', lambda team, season: fetched.append(team))
+    extractors.prefetch_team_summaries(2005, max_workers=1)
+    assert 'SEA' in fetched and 'OKC' not in fetched
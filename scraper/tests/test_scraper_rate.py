@@ -0,0 +1,100 @@
+import pytest
+
+import network
+from network import AdaptiveRateLimiter, RateLimited, TokenBucket
+
+class FakeClock:
+    """
+    Stands in for network.time: monotonic() only moves when sleep() is called.
+    """
+    def __init__(self):
+        self.now = 1000.0
+        self.slept = []
+        self.on_sleep = None      # called mid-sleep, as another thread would act
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.slept.append(seconds)
+        if self.on_sleep is not None:
+            self.on_sleep()
+        self.now += seconds
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(network, 'time', clock)
+    return clock
+
+def test_bucket_spaces_requests_at_the_rate(clock):
+    bucket = TokenBucket(rate=1 / 3)
+    assert bucket.acquire() == 0.0          # the burst token
+    assert bucket.acquire() == pytest.approx(3.0)
+    assert bucket.acquire() == pytest.approx(3.0)
+    assert clock.now == pytest.approx(1006.0)
+
+def test_bucket_refills_while_idle(clock):
+    bucket = TokenBucket(rate=1 / 3)
+    bucket.acquire()
+    clock.now += 10                          # longer than one interval, capped at capacity
+    assert bucket.acquire() == 0.0
+    assert bucket.acquire() == pytest.approx(3.0)
+
+def test_rate_never_exceeds_published_limit(clock):
+    limiter = AdaptiveRateLimiter(network.PUBLISHED_RATE, network.PUBLISHED_RATE)
+    for _ in range(50):
+        limiter.on_success(0.1)
+    assert limiter.rate == network.PUBLISHED_RATE
+    for _ in range(21):
+        limiter.acquire()
+    # 20 requests a minute: 21 back-to-back acquires span a full minute
+    assert clock.now - 1000.0 == pytest.approx(60.0)
+
+def test_additive_increase_and_slow_decrease(clock):
+    limiter = AdaptiveRateLimiter(0.1, network.PUBLISHED_RATE)
+    limiter.on_success(0.1)
+    assert limiter.rate == pytest.approx(0.1 + network.RATE_STEP)
+    limiter.on_success(network.SLOW_RESPONSE + 1)
+    assert limiter.rate == pytest.approx((0.1 + network.RATE_STEP) * network.SLOW_FACTOR)
+
+def test_throttle_blocks_the_host(clock):
+    limiter = AdaptiveRateLimiter(0.2, network.PUBLISHED_RATE)
+    limiter.on_throttle(retry_after=60)
+    assert limiter.rate == pytest.approx(0.2 * network.BACKOFF_FACTOR)
+    with pytest.raises(RateLimited):
+        limiter.acquire()
+    # Retry-After shorter than the jail still blocks for JAIL_SECONDS
+    clock.now += 61
+    with pytest.raises(RateLimited):
+        limiter.acquire()
+    clock.now += network.JAIL_SECONDS
+    limiter.acquire()
+    assert clock.slept == []
+
+def test_rate_floor(clock):
+    limiter = AdaptiveRateLimiter(network.MIN_RATE, network.PUBLISHED_RATE)
+    limiter.on_throttle(retry_after=0)
+    limiter.on_success(network.SLOW_RESPONSE + 1)
+    assert limiter.rate == network.MIN_RATE
+
+def test_queued_waiter_is_blocked_by_a_429(clock):
+    limiter = AdaptiveRateLimiter(0.2, network.PUBLISHED_RATE)
+    limiter.acquire()
+    # another worker gets a 429 while this one sleeps for its token
+    clock.on_sleep = lambda: limiter.on_throttle(retry_after=60)
+    with pytest.raises(RateLimited):
+        limiter.acquire()
+    assert len(clock.slept) == 1
+
+def test_no_request_once_the_host_is_blocked(clock, monkeypatch):
+    limiter = AdaptiveRateLimiter(0.2, network.PUBLISHED_RATE)
+    # the 429 lands between this worker's token and its request
+    monkeypatch.setattr(limiter, 'acquire', lambda: limiter.on_throttle(retry_after=60) or 0.0)
+    monkeypatch.setattr(network, 'limiter_for', lambda url: limiter)
+    monkeypatch.setattr(network, 'USE_CACHE', False)
+    sent = []
+    monkeypatch.setattr(network.session, 'get', lambda url, **kw: sent.append(url))
+    with pytest.raises(RateLimited):
+        network._fetch_html('https://www.basketball-reference.com/draft/NBA_2015.html')
+    assert sent == []
@@ -0,0 +1,64 @@
+import csv
+
+import pytest
+
+from scraper import RECORD_COLUMNS
+from sink import RecordSink
+
+# what a second-round pick with no college page looks like next to a full one
+SPARSE = {'Draft Year': 2015, 'Pick': 41, 'Player': 'A', 'NBA_G': 0.0}
+FULL = {**{c: (1 if kind == 'int' else 1.5 if kind == 'float' else 'x') for c, kind in RECORD_COLUMNS.items()},
+        'Player': 'B'}
+
+def read_csv(path):
+    with open(path, newline='') as f:
+        return list(csv.reader(f))
+
+def test_csv_header_is_the_record_schema(tmp_path):
+    path = tmp_path / 'out.csv'
+    with RecordSink(str(path), RECORD_COLUMNS, batch_size=1) as sink:
+        sink.write(SPARSE)
+        sink.write(FULL)
+    rows = read_csv(path)
+    assert rows[0] == list(RECORD_COLUMNS)
+    assert len(rows) == 3 and all(len(r) == len(RECORD_COLUMNS) for r in rows)
+
+def test_append_keeps_the_existing_header(tmp_path):
+    path = tmp_path / 'out.csv'
+    path.write_text('Player,Pick\nA,1\n')
+    with RecordSink(str(path), RECORD_COLUMNS, append=True) as sink:
+        sink.write({'Player': 'B', 'Pick': 2, 'NBA_G': 10.0})
+    assert read_csv(path) == [['Player', 'Pick'], ['A', '1'], ['B', '2']]
+
+def test_unknown_column_type():
+    with pytest.raises(ValueError):
+        RecordSink('unused.csv', {'Pick': 'decimal'})
+
+@pytest.mark.parametrize('fmt', ['parquet', 'arrow'])
+def test_arrow_schema_does_not_depend_on_record_order(tmp_path, fmt):
+    pa = pytest.importorskip('pyarrow')
+    import pyarrow.parquet as pq
+    from sink import arrow_schema
+
+    def read(path):
+        if fmt == 'parquet':
+            return pq.read_table(path)
+        with pa.memory_map(str(path)) as source:
+            return pa.ipc.open_file(source).read_all()
+
+    tables = []
+    for order in ([SPARSE, FULL], [FULL, SPARSE]):
+        path = tmp_path / f'{len(tables)}.{fmt}'
+        # batch of one: the first flush only sees the first record
+        with RecordSink(str(path), RECORD_COLUMNS, fmt=fmt, batch_size=1) as sink:
+            for record in order:
+                sink.write(record)
+        tables.append(read(path))
+    assert tables[0].schema.equals(arrow_schema(RECORD_COLUMNS))
+    assert tables[1].schema.equals(tables[0].schema)
+    assert tables[0].column('COLLEGE_GS%').null_count == 1
+
+def test_arrow_formats_refuse_append(tmp_path):
+    pytest.importorskip('pyarrow')
+    with pytest.raises(ValueError):
+        RecordSink(str(tmp_path / 'out.parquet'), RECORD_COLUMNS, fmt='parquet', append=True)
@@ -0,0 +1,68 @@
+import hashlib
+import numpy as np
+import pandas as pd
+from positions import GROUPS, classify
+
+# ─── Paths ───────────────────────────────────────────────────────────────────
+TRAIN_PATH = "data/cleaned/TRAINING.csv"
+TEST_PATH  = "data/cleaned/drafts-2025-to-2025.csv"
+
+# ─── Columns ─────────────────────────────────────────────────────────────────
+TARGET     = "Player Tier"
+ID_COLUMNS = ["Name", "Draft Year", "Pick Number", "POS"]
+ID_DTYPES  = {"Name": "string", "Draft Year": "int16", "Pick Number": "Int16", "POS": "category"}
+
+# ─── Loading ─────────────────────────────────────────────────────────────────
+def load(path, features, years=None, target=True):
+    """
+    Read only the id, feature and (optionally) target columns of path with
+    compact dtypes, tag each row with its Position Group and sort by group
+    so partition() can hand out contiguous slices.
+
+    Features are float32, which is what the forests split on internally.
+    """
+    header = pd.read_csv(path, nrows=0).columns
+    wanted = list(dict.fromkeys(ID_COLUMNS + list(features) + ([TARGET] if target else [])))
+    missing = [c for c in wanted if c not in header]
+    if missing:
+        raise KeyError(f"{path}: missing columns {missing}")
+
+    dtypes = {c: "float32" for c in features}
+    dtypes.update(ID_DTYPES)
+    if target:
+        dtypes[TARGET] = "float64"
+    df = pd.read_csv(path, usecols=wanted, dtype=dtypes)[wanted]
+
+    if years is not None:
+        df = df[df["Draft Year"].between(*years)]
+    df["Position Group"] = classify(df["POS"])
+    # stable sort keeps the file's row order within each group
+    return df.sort_values("Position Group", kind="stable").reset_index(drop=True)
+
+def partition(df):
+    """
+    Split a frame from load() into {group: rows}. Rows are already sorted by
+    group, so each part is a positional slice rather than a masked copy.
+    Players whose POS fits no group are dropped.
+    """
+    codes = df["Position Group"].cat.codes.to_numpy()
+    # unmatched rows (code -1) sort last, so the group counts give the boundaries
+    bounds = np.concatenate([[0], np.cumsum(np.bincount(codes[codes >= 0], minlength=len(GROUPS)))])
+    return {g: df.iloc[bounds[i]:bounds[i + 1]] for i, g in enumerate(GROUPS)}
+
+def row_hashes(df, features):
+    """
+    One hash per row over the name, draft year, features and target, as
+    16-digit hex strings; a row's hash changes when any of them does.
+    """
+    cols = ["Name", "Draft Year"] + sorted(features) + [TARGET]
+    return [f"{h:016x}" for h in pd.util.hash_pandas_object(df[cols], index=False).to_numpy()]
+
+def data_hash(df, features):
+    """
+    Hash of the rows, features and target a model or evaluation sees, so
+    unrelated columns can change without invalidating anything.
+    """
+    cols = ["Name", "Draft Year"] + sorted(features) + [TARGET]
+    hashed = pd.util.hash_pandas_object(df[cols], index=False).to_numpy()
+    return hashlib.sha256(hashed.tobytes()).hexdigest()[:16]
@@ -0,0 +1,152 @@
+"""
+Cached LOO evaluation of feature subsets, plus greedy feature selection.
+
+    python training/feature_cache.py Guard --direction backward
+    python training/feature_cache.py Big --direction forward --mode year
+
+Each evaluation is stored under a key built from the position group, the
+sorted feature set, the forest params, the LOO mode and a hash of the
+rows it was run on. Forests are fit with the columns in canonical_order(),
+so a group's FEATURES list scores exactly as train_and_LOO.py fits it. Re-running an experiment whose inputs haven't changed
+reads the predictions back instead of refitting anything.
+"""
+import argparse
+import hashlib
+import json
+import os
+
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import RandomForestRegressor
+
+from dataset import TRAIN_PATH, TARGET, data_hash, load, partition
+from loo import run_loo
+from train_and_LOO import FEATURES, MIN_YEAR, MAX_YEAR, N_EST, RANDOM_SEED
+
+CACHE_DIR = "training/eval-cache"
+GROUP_KEYS = {"Guard": "guards", "Wing": "wings", "Big": "bigs"}
+
+def canonical_order(group, features):
+    """
+    features in the order the group's FEATURES list has them, with any
+    others after it alphabetically. Column order changes which splits a
+    forest draws, so every subset is fit in this one order.
+    """
+    base = FEATURES[GROUP_KEYS[group]]
+    feats = set(features)
+    return [f for f in base if f in feats] + sorted(feats - set(base))
+
+class EvalCache:
+    """
+    One .npz per evaluation (LOO predictions and metrics) in cache_dir,
+    named by the hash of its key.
+    """
+    def __init__(self, cache_dir=CACHE_DIR):
+        self.cache_dir = cache_dir
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(cache_dir, exist_ok=True)
+
+    @staticmethod
+    def key(group, features, params, mode, dhash):
+        blob = json.dumps([group, sorted(features), params, mode, dhash], sort_keys=True, default=str)
+        return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.npz")
+
+    def get(self, key):
+        try:
+            with np.load(self._path(key)) as f:
+                return f["preds"], json.loads(str(f["metrics"]))
+        except (OSError, KeyError, ValueError):
+            return None
+
+    def put(self, key, preds, metrics):
+        tmp = self._path(key) + ".tmp.npz"
+        np.savez(tmp, preds=preds, metrics=json.dumps(metrics))
+        os.replace(tmp, self._path(key))
+
+    def evaluate(self, group, df, features, params, mode="loo"):
+        """
+        LOO predictions and metrics for one feature subset, from the cache
+        when possible. The key is the sorted set; the forest is fit in
+        canonical_order(), so the same set always gives the same forest.
+        """
+        features = canonical_order(group, features)
+        key = self.key(group, features, params, mode, data_hash(df, features))
+        cached = self.get(key)
+        if cached is not None:
+            self.hits += 1
+            return cached
+        self.misses += 1
+
+        y = df[TARGET].to_numpy()
+        preds, seconds = run_loo(RandomForestRegressor(**params), df[features], y,
+                                 mode=mode, groups=df["Draft Year"])
+        err = preds - y
+        metrics = {
+            "rmse": float(np.sqrt(np.nanmean(err ** 2))),
+            "mae": float(np.nanmean(np.abs(err))),
+            "seconds": round(seconds, 2),
+            "features": features,
+        }
+        self.put(key, preds, metrics)
+        return preds, metrics
+
+# ─── Greedy Selection ────────────────────────────────────────────────────────
+def greedy_select(cache, group, df, start, candidates, params, direction="backward", mode="loo"):
+    """
+    Greedy forward (add) or backward (drop) selection from start, one
+    feature per step, stopping once no single move lowers RMSE.
+    Returns (features, rmse, history).
+    """
+    current = canonical_order(group, start)
+    _, best = cache.evaluate(group, df, current, params, mode)
+    history = [{"step": 0, "move": None, "rmse": best["rmse"], "n_features": len(current)}]
+
+    while True:
+        if direction == "forward":
+            moves = [("+", f, current + [f]) for f in candidates if f not in current]
+        else:
+            moves = [("-", f, [c for c in current if c != f]) for f in current] if len(current) > 1 else []
+        if not moves:
+            break
+        scored = []
+        for sign, feat, feats in moves:
+            _, m = cache.evaluate(group, df, feats, params, mode)
+            scored.append((m["rmse"], sign, feat, feats))
+        rmse, sign, feat, feats = min(scored, key=lambda s: s[0])
+        if rmse >= best["rmse"]:
+            break
+        current, best = canonical_order(group, feats), {"rmse": rmse}
+        history.append({"step": len(history), "move": f"{sign}{feat}", "rmse": rmse, "n_features": len(current)})
+        print(f"{group}: {sign}{feat} -> RMSE {rmse:.4f} ({len(current)} features)")
+    return current, best["rmse"], history
+
+def main():
+    parser = argparse.ArgumentParser(description="Greedy feature selection for one position group, cached per subset.")
+    parser.add_argument("group", choices=list(GROUP_KEYS))
+    parser.add_argument("--direction", choices=["forward", "backward"], default="backward")
+    parser.add_argument("--mode", choices=["loo", "year", "oob"], default="loo")
+    parser.add_argument("--candidates", nargs="+", help="features forward selection may add "
+                        "(defaults to every group's FEATURES list)")
+    parser.add_argument("--n-estimators", type=int, default=N_EST)
+    args = parser.parse_args()
+
+    base = FEATURES[GROUP_KEYS[args.group]]
+    candidates = args.candidates or sorted({f for feats in FEATURES.values() for f in feats})
+    df = partition(load(TRAIN_PATH, sorted(set(candidates) | set(base)), years=(MIN_YEAR, MAX_YEAR)))[args.group]
+    params = {"n_estimators": args.n_estimators, "random_state": RANDOM_SEED}
+
+    cache = EvalCache()
+    # forward selection grows from the current list; backward prunes it
+    features, rmse, history = greedy_select(cache, args.group, df, base, candidates, params,
+                                            args.direction, args.mode)
+    print(pd.DataFrame(history).to_string(index=False))
+    print(f"\n{args.group} ({args.direction}): RMSE {rmse:.4f} with {len(features)} features")
+    print(features)
+    print(f"Cache: {cache.hits} hits, {cache.misses} misses")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+import os
+import time
+import numpy as np
+from joblib import Parallel, delayed
+from sklearn.base import clone
+from sklearn.model_selection import LeaveOneOut, LeaveOneGroupOut
+
+# ─── Modes ───────────────────────────────────────────────────────────────────
+# "loo"  – exact leave-one-out, one forest per held-out player
+# "year" – leave-one-draft-year-out, one forest per draft class
+# "oob"  – single forest; each player is scored by the trees that never saw it
+MODES = ("loo", "year", "oob")
+
+def split_jobs(n_folds, n_jobs=-1):
+    """
+    Split a core budget between concurrent folds and trees per fold so the
+    two never multiply past it: as many folds in parallel as there are cores
+    (or folds), and the leftover cores go to each forest's trees.
+    """
+    total = (os.cpu_count() or 1) if n_jobs in (None, -1) else n_jobs
+    fold_jobs = max(1, min(n_folds, total))
+    tree_jobs = max(1, total // fold_jobs)
+    return fold_jobs, tree_jobs
+
+def _fit_predict(model, X, y, train, test):
+    model.fit(X[train], y[train])
+    return test, model.predict(X[test])
+
+def run_loo(model, X, y, mode="loo", groups=None, n_jobs=-1, verbose=0):
+    """
+    Out-of-sample predictions for every row of X.
+
+    model is an unfitted RandomForestRegressor (cloned per fold); groups
+    holds each row's draft year for mode="year". Returns (preds, seconds).
+    Folds are fit with the model's own random_state, so "loo" matches
+    cross_val_predict(model, X, y, cv=LeaveOneOut()) exactly.
+    """
+    if mode not in MODES:
+        raise ValueError(f"Unknown LOO mode {mode!r}; expected one of {MODES}")
+    X = np.asarray(X, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    start = time.perf_counter()
+
+    if mode == "oob":
+        _, tree_jobs = split_jobs(1, n_jobs)
+        forest = clone(model).set_params(oob_score=True, bootstrap=True, n_jobs=tree_jobs)
+        forest.fit(X, y)
+        return forest.oob_prediction_, time.perf_counter() - start
+
+    if mode == "year":
+        if groups is None:
+            raise ValueError('mode="year" needs the draft year of each row in groups')
+        folds = list(LeaveOneGroupOut().split(X, y, groups))
+    else:
+        folds = list(LeaveOneOut().split(X))
+
+    fold_jobs, tree_jobs = split_jobs(len(folds), n_jobs)
+    base = clone(model).set_params(n_jobs=tree_jobs)
+    results = Parallel(n_jobs=fold_jobs, verbose=verbose)(
+        delayed(_fit_predict)(clone(base), X, y, train, test) for train, test in folds
+    )
+    preds = np.empty(len(y))
+    for test, fold_preds in results:
+        preds[test] = fold_preds
+    return preds, time.perf_counter() - start
@@ -0,0 +1,40 @@
+import json
+import os
+from datetime import datetime, timezone
+
+from dataset import data_hash, row_hashes
+
+# ─── Model Sidecars ──────────────────────────────────────────────────────────
+# Every <group>.pkl gets a <group>.json next to it recording what it was
+# trained on, so refreshes can tell which groups the new data touches.
+
+def meta_path(model_path):
+    return os.path.splitext(model_path)[0] + ".json"
+
+def read_meta(model_path):
+    try:
+        with open(meta_path(model_path)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def write_meta(model_path, model, df, features, params, strategy="full"):
+    """
+    params are the config the forest was built from; strategy is "full",
+    "group" or "warm". trees is the forest's actual size. row_hashes lets
+    the next refresh tell which rows this model never saw.
+    """
+    meta = {
+        "data_hash":  data_hash(df, features),
+        "features":   list(features),
+        "params":     params,
+        "trees":      len(model.estimators_),
+        "rows":       len(df),
+        "years":      [int(df["Draft Year"].min()), int(df["Draft Year"].max())],
+        "strategy":   strategy,
+        "trained_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "row_hashes": row_hashes(df, features),
+    }
+    with open(meta_path(model_path), "w") as f:
+        json.dump(meta, f, indent=2)
+    return meta
@@ -0,0 +1,59 @@
+import re
+from itertools import combinations
+import numpy as np
+import pandas as pd
+
+# ─── Position Groups ─────────────────────────────────────────────────────────
+# Shared by training and the web API so a player is always routed to the
+# same model; web/backend/positions.py is a verbatim copy (the backend
+# deploys on its own), kept in sync by test_backend_positions.py. Groups
+# are listed in routing order.
+GROUPS    = ["Guard", "Wing", "Big"]
+POSITIONS = ["PG", "SG", "SF", "PF", "C"]
+SPLIT_RE  = re.compile(r"[,\-/\s]+")
+
+def group_of(parts):
+    """
+    Position Group for a set of listed positions, or None if it fits none.
+    Guards list only PG/SG; wings list SF, or PF alongside something else,
+    but never C; bigs list C or only PF.
+    """
+    if not parts:
+        return None
+    if parts <= {"PG", "SG"}:
+        return "Guard"
+    if "C" not in parts and ("SF" in parts or ("PF" in parts and len(parts) > 1)):
+        return "Wing"
+    if "C" in parts or parts == {"PF"}:
+        return "Big"
+    return None
+
+# every combination of listed positions, precomputed once
+GROUP_TABLE = {
+    frozenset(combo): group_of(set(combo))
+    for n in range(1, len(POSITIONS) + 1)
+    for combo in combinations(POSITIONS, n)
+}
+
+def classify_one(pos_str):
+    """
+    Position Group for a single POS string such as "PG,SG" or "F-C".
+    """
+    if not isinstance(pos_str, str):
+        return None
+    parts = frozenset(p for p in SPLIT_RE.split(pos_str.upper()) if p)
+    if parts in GROUP_TABLE:
+        return GROUP_TABLE[parts]
+    return group_of(set(parts))
+
+def classify(pos: pd.Series) -> pd.Series:
+    """
+    Categorical Position Group for a whole POS column. Each distinct POS
+    string is looked up once and the result is broadcast through the
+    category codes, so the cost doesn't grow with the number of players.
+    """
+    pos = pos.astype("category")
+    # trailing entry catches code -1 (missing POS)
+    lookup = np.array([classify_one(v) for v in pos.cat.categories] + [None], dtype=object)
+    labels = lookup[pos.cat.codes.to_numpy()]
+    return pd.Series(pd.Categorical(labels, categories=GROUPS), index=pos.index, name="Position Group")
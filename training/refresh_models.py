@@ -0,0 +1,170 @@
+"""
+Incremental model refresh after a label update or a new draft class.
+
+    python training/refresh_models.py                  # refit only the groups whose data changed
+    python training/refresh_models.py --strategy warm  # swap the oldest trees for new ones instead
+    python training/refresh_models.py --verify         # held-out check against the previous model
+                                                       # (and, for warm, against a refit)
+
+Each model's sidecar JSON (see model_meta.py) records the hash of the rows
+it was trained on. Groups whose hash still matches are left alone; groups
+whose FEATURES or params changed need a full train_and_LOO.py run, since
+their LOO results are stale too.
+"""
+import argparse
+import copy
+import os
+import time
+
+import joblib
+import numpy as np
+from sklearn.ensemble import RandomForestRegressor
+from sklearn.model_selection import LeaveOneGroupOut
+
+from dataset import TRAIN_PATH, TARGET, data_hash, row_hashes, load, partition
+from loo import run_loo
+from model_meta import read_meta, write_meta
+from train_and_LOO import FEATURES, MIN_YEAR, MAX_YEAR, N_EST, RANDOM_SEED, OUT_DIR
+
+ADD_TREES = 100      # trees replaced per warm refresh; the forest stays at N_EST
+VERIFY_TOL = 0.05    # held-out RMSE the refresh may lose to the previous model before warning
+WARM_TOL   = 0.05    # held-out RMSE a warm refresh may lose to a refit before warning
+
+GROUP_NAMES = {"guards": "Guard", "wings": "Wing", "bigs": "Big"}
+
+def params():
+    return {"n_estimators": N_EST, "random_state": RANDOM_SEED}
+
+def refit(X, y):
+    return RandomForestRegressor(**params(), n_jobs=-1).fit(X, y)
+
+def grow(model, X, y, seed, add_trees=ADD_TREES, max_trees=N_EST):
+    """
+    Fit add_trees new trees on the updated rows with warm_start, then retire
+    the oldest so the forest keeps at most max_trees. The new trees are
+    drawn from seed (e.g. derived from the data hash): with a fixed tree
+    count, the model's own random_state would hand every refresh the same
+    tree seeds.
+    """
+    model.set_params(warm_start=True, n_estimators=len(model.estimators_) + add_trees,
+                     random_state=seed, n_jobs=-1)
+    model.fit(X, y)
+    model.estimators_ = model.estimators_[-max_trees:]
+    model.set_params(warm_start=False, n_estimators=len(model.estimators_), random_state=RANDOM_SEED)
+    return model
+
+def unseen_rows(meta, df, feats):
+    """
+    Mask of the rows the previous model wasn't trained on (new players or
+    changed labels). Sidecars written before row hashes were recorded fall
+    back to the draft years after the last one it saw.
+    """
+    if meta.get("row_hashes"):
+        seen = set(meta["row_hashes"])
+        return np.array([h not in seen for h in row_hashes(df, feats)])
+    return df["Draft Year"].to_numpy() > meta["years"][1]
+
+def refresh_loo(previous, X, y, years, strategy, seed):
+    """
+    Leave-one-draft-year-out predictions of the refresh itself: a refit of
+    each fold, or the previous forest grown on it for the warm strategy.
+    """
+    if strategy != "warm":
+        preds, _ = run_loo(RandomForestRegressor(**params()), X, y, mode="year", groups=years)
+        return preds
+    preds = np.empty(len(y))
+    for train, test in LeaveOneGroupOut().split(X, y, years):
+        fold = grow(copy.deepcopy(previous), X.iloc[train], y.iloc[train], seed)
+        preds[test] = fold.predict(X.iloc[test])
+    return preds
+
+def rmse(pred, y):
+    return float(np.sqrt(np.mean((np.asarray(pred) - np.asarray(y)) ** 2)))
+
+def verify(name, previous, meta, df, strategy, seed):
+    """
+    Score the refresh on rows none of the compared models saw. The previous
+    model predicts the rows it was never trained on; the refresh is scored
+    by its year-LOO predictions on the same rows. A warm refresh is also
+    scored against a refit's year-LOO predictions there, and flagged if it
+    trails by more than WARM_TOL. The refit's LOO RMSE over all rows is
+    reported too; a grown forest's isn't, since its old trees saw every
+    held-out year except the new ones.
+    Returns (previous, refreshed, refit) RMSEs on the unseen rows, or None.
+    """
+    feats = FEATURES[name]
+    X, y = df[feats], df[TARGET]
+    years = df["Draft Year"].to_numpy()
+    preds = refresh_loo(previous, X, y, years, strategy, seed)
+    refit_preds = refresh_loo(previous, X, y, years, "group", seed) if strategy == "warm" else preds
+    line = f"  {name}: refit year-LOO RMSE {rmse(refit_preds, y):.3f} on all {len(y)} rows;"
+    unseen = unseen_rows(meta, df, feats) if previous is not None else np.zeros(len(y), dtype=bool)
+    if not unseen.any():
+        print(f"{line} no rows the previous model didn't see, nothing to compare")
+        return None
+    before = rmse(previous.predict(X[unseen]), y[unseen])
+    after = rmse(preds[unseen], y[unseen])
+    refit_after = rmse(refit_preds[unseen], y[unseen])
+    if after > refit_after + WARM_TOL:
+        status = "WARNING: warm refresh trails a refit; rerun with --strategy group"
+    elif after > before + VERIFY_TOL:
+        status = "WARNING: consider a full retrain"
+    else:
+        status = "OK"
+    compared = f"previous {before:.3f} vs refreshed {after:.3f}"
+    if strategy == "warm":
+        compared += f" vs refit {refit_after:.3f}"
+    print(f"{line} on {unseen.sum()} new/relabelled rows {compared} — {status}")
+    return before, after, refit_after
+
+def refresh_group(name, df, strategy="group", check=False, force=False):
+    path = f"{OUT_DIR}/{name}.pkl"
+    feats = FEATURES[name]
+    meta = read_meta(path)
+    current = data_hash(df, feats)
+    config_changed = meta is None or meta["features"] != feats or meta["params"] != params()
+    if config_changed:
+        if not force:
+            print(f"{name}: model config changed or no metadata; run train_and_LOO.py for a full retrain")
+            return None
+        strategy = "group"
+    elif meta["data_hash"] == current:
+        print(f"{name}: up to date ({meta['data_hash']})")
+        return None
+
+    # the previous forest is only comparable (or growable) if its config still holds
+    previous = joblib.load(path) if not config_changed and os.path.exists(path) else None
+    if previous is None:
+        strategy = "group"
+    seed = int(current[:8], 16)
+    start = time.perf_counter()
+    X, y = df[feats], df[TARGET]
+    if strategy == "warm":
+        model = grow(copy.deepcopy(previous), X, y, seed)
+    else:
+        model = refit(X, y)
+    print(f"{name}: refreshed ({strategy}) on {len(df)} players, "
+          f"{len(model.estimators_)} trees, in {time.perf_counter() - start:.1f}s")
+    if check:
+        verify(name, previous, meta, df, strategy, seed)
+
+    joblib.dump(model, path)
+    return write_meta(path, model, df, feats, params(), strategy)
+
+def main():
+    parser = argparse.ArgumentParser(description="Refresh the group models whose training data changed.")
+    parser.add_argument("--strategy", choices=["group", "warm"], default="group",
+                        help="refit the changed group, or grow its forest with warm_start")
+    parser.add_argument("--verify", action="store_true",
+                        help="compare each refresh's held-out error against the previous model (and a refit, for warm)")
+    parser.add_argument("--force", action="store_true",
+                        help="refit groups whose config changed instead of asking for a full retrain")
+    args = parser.parse_args()
+
+    all_feats = [f for feats in FEATURES.values() for f in feats]
+    groups = partition(load(TRAIN_PATH, all_feats, years=(MIN_YEAR, MAX_YEAR)))
+    for name, group in GROUP_NAMES.items():
+        refresh_group(name, groups[group], args.strategy, args.verify, args.force)
+
+if __name__ == "__main__":
+    main()
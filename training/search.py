@@ -0,0 +1,192 @@
+"""
+Hyperparameter search over the position-group forests.
+
+    python training/search.py --configs 100 --workers 8 --out training/search-results.csv
+
+Configs (n_estimators, max_depth, max_features, feature subset) are sampled
+per group and raced with successive halving: every config is scored on a
+few held-out folds, the best 1/eta move on to eta times as many folds,
+and so on until the survivors have seen every fold. Fold splits and
+column-sliced matrices are built once per worker, and a promoted config
+only fits the folds it hasn't seen yet.
+"""
+import argparse
+import math
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import RandomForestRegressor
+from sklearn.model_selection import LeaveOneOut, LeaveOneGroupOut
+
+from dataset import TRAIN_PATH, TARGET, load, partition
+from train_and_LOO import FEATURES, MIN_YEAR, MAX_YEAR, RANDOM_SEED
+
+# ─── Search Space ────────────────────────────────────────────────────────────
+N_ESTIMATORS = [100, 250, 500]
+MAX_DEPTH    = [None, 6, 10, 16]
+MAX_FEATURES = [1.0, 0.5, 0.33, "sqrt"]
+# candidates a subset may pull in on top of the group's current FEATURES list
+EXTRA_FEATURES = [
+    "Height/Weight", "C_PER", "C_USG%", "C_OBPM", "C_DBPM", "C_BPM",
+    "C_3P%", "C_3PA/40", "C_FTA/40", "C_TRB/40", "C_BLK/40", "C_STL/40", "C_BLK%", "C_ORB%",
+]
+DROP_P = 0.15   # chance of dropping each current feature
+ADD_P  = 0.15   # chance of adding each extra feature
+
+GROUP_KEYS = {"Guard": "guards", "Wing": "wings", "Big": "bigs"}
+OUT_PATH   = "training/search-results.csv"
+CHUNK      = 8      # folds per pool task, so late rungs with few survivors still fill the pool
+
+def sample_configs(group, n, rng):
+    """
+    n configs for one group. The first is the current hand-tuned setup so
+    every search reports the baseline alongside the candidates.
+    """
+    base = FEATURES[GROUP_KEYS[group]]
+    extras = [f for f in EXTRA_FEATURES if f not in base]
+    configs = [{"n_estimators": 500, "max_depth": None, "max_features": 1.0, "features": tuple(base)}]
+    while len(configs) < n:
+        feats = [f for f in base if rng.random() >= DROP_P] + [f for f in extras if rng.random() < ADD_P]
+        if not feats:
+            continue
+        configs.append({
+            "n_estimators": int(rng.choice(N_ESTIMATORS)),
+            "max_depth":    MAX_DEPTH[rng.integers(len(MAX_DEPTH))],
+            "max_features": MAX_FEATURES[rng.integers(len(MAX_FEATURES))],
+            "features":     tuple(feats),
+        })
+    return configs
+
+def make_folds(df, mode, rng):
+    """
+    Fold splits for one group, shuffled once so that any prefix of the
+    list is a fair sample for the early rungs.
+    """
+    if mode == "year":
+        folds = list(LeaveOneGroupOut().split(df, groups=df["Draft Year"]))
+    else:
+        folds = list(LeaveOneOut().split(df))
+    order = rng.permutation(len(folds))
+    return [folds[i] for i in order]
+
+# ─── Worker ──────────────────────────────────────────────────────────────────
+# Set once per process by _init_worker so trials only ship their config.
+_DATA = {}
+
+def _init_worker(data):
+    global _DATA
+    _DATA = data
+
+@lru_cache(maxsize=256)
+def _columns(group, features):
+    frame, _, _ = _DATA[group]
+    return np.ascontiguousarray(frame[list(features)].to_numpy(dtype=np.float32))
+
+def _run_trial(group, config, fold_ids):
+    """
+    Fit one config on the given folds; returns ({fold: preds}, seconds).
+    """
+    start = time.perf_counter()
+    _, y, folds = _DATA[group]
+    X = _columns(group, config["features"])
+    params = {k: v for k, v in config.items() if k != "features"}
+    preds = {}
+    for f in fold_ids:
+        train, test = folds[f]
+        model = RandomForestRegressor(**params, random_state=RANDOM_SEED, n_jobs=1)
+        model.fit(X[train], y[train])
+        preds[f] = model.predict(X[test])
+    return preds, time.perf_counter() - start
+
+# ─── Successive Halving ──────────────────────────────────────────────────────
+def score(y, folds, fold_preds):
+    idx = np.concatenate([folds[f][1] for f in fold_preds])
+    pred = np.concatenate(list(fold_preds.values()))
+    err = pred - y[idx]
+    return float(np.sqrt(np.mean(err ** 2))), float(np.mean(np.abs(err)))
+
+def search_group(pool, group, configs, y, folds, eta=3, min_folds=8):
+    """
+    Race configs for one group and return one result row per config and rung.
+    """
+    n_folds = len(folds)
+    seen = [dict() for _ in configs]      # fold -> held-out predictions, per config
+    seconds = [0.0] * len(configs)
+    alive = list(range(len(configs)))
+    budget = min(min_folds, n_folds)
+    rows = []
+
+    for rung in range(n_folds):
+        futures = []
+        for cid in alive:
+            todo = [f for f in range(budget) if f not in seen[cid]]
+            for i in range(0, len(todo), CHUNK):
+                futures.append((cid, pool.submit(_run_trial, group, configs[cid], todo[i:i + CHUNK])))
+        for cid, fut in futures:
+            preds, secs = fut.result()
+            seen[cid].update(preds)
+            seconds[cid] += secs
+
+        scores = {}
+        for cid in alive:
+            rmse, mae = score(y, folds, seen[cid])
+            scores[cid] = rmse
+            cfg = configs[cid]
+            rows.append({
+                "Group": group, "Config": cid, "Rung": rung, "Folds": budget,
+                "RMSE": rmse, "MAE": mae, "Seconds": round(seconds[cid], 2),
+                "n_estimators": cfg["n_estimators"], "max_depth": cfg["max_depth"],
+                "max_features": cfg["max_features"], "n_features": len(cfg["features"]),
+                "Features": "|".join(cfg["features"]),
+            })
+        best = min(scores, key=scores.get)
+        print(f"{group} rung {rung}: {len(alive)} configs on {budget}/{n_folds} folds, "
+              f"best RMSE {scores[best]:.3f} (config {best})")
+        if budget >= n_folds:
+            break
+        alive = sorted(alive, key=scores.get)[:max(1, math.ceil(len(alive) / eta))]
+        budget = min(n_folds, budget * eta)
+    return rows
+
+def main():
+    parser = argparse.ArgumentParser(description="Successive-halving search over forest configs per position group.")
+    parser.add_argument("--configs", type=int, default=100, help="configs sampled per group")
+    parser.add_argument("--groups", nargs="+", default=list(GROUP_KEYS), choices=list(GROUP_KEYS))
+    parser.add_argument("--mode", choices=["loo", "year"], default="loo",
+                        help="hold out one player or one draft year per fold")
+    parser.add_argument("--eta", type=int, default=3, help="keep the best 1/eta configs per rung")
+    parser.add_argument("--min-folds", type=int, default=8, help="folds every config is scored on")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--seed", type=int, default=RANDOM_SEED)
+    parser.add_argument("--out", default=OUT_PATH)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    candidates = {f for feats in FEATURES.values() for f in feats} | set(EXTRA_FEATURES)
+    groups = partition(load(TRAIN_PATH, sorted(candidates), years=(MIN_YEAR, MAX_YEAR)))
+
+    data, folds, configs = {}, {}, {}
+    for group in args.groups:
+        df = groups[group].reset_index(drop=True)
+        folds[group] = make_folds(df, args.mode, rng)
+        data[group] = (df[sorted(candidates)], df[TARGET].to_numpy(), folds[group])
+        configs[group] = sample_configs(group, args.configs, rng)
+
+    start = time.perf_counter()
+    rows = []
+    with ProcessPoolExecutor(args.workers, initializer=_init_worker, initargs=(data,)) as pool:
+        for group in args.groups:
+            rows += search_group(pool, group, configs[group], data[group][1], folds[group],
+                                 eta=args.eta, min_folds=args.min_folds)
+
+    results = pd.DataFrame(rows).sort_values(["Group", "Folds", "RMSE"], ascending=[True, False, True])
+    results.to_csv(args.out, index=False)
+    print(f"Searched {sum(len(c) for c in configs.values())} configs in "
+          f"{time.perf_counter() - start:.0f}s; results in {args.out}")
+
+if __name__ == "__main__":
+    main()
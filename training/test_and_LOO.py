@@ -1,43 +1,19 @@
 import pandas as pd
 import numpy as np
 import joblib
-import re
 from sklearn.ensemble import RandomForestRegressor
-from sklearn.model_selection import LeaveOneOut, cross_val_predict
+from loo import run_loo
+from dataset import TRAIN_PATH, TEST_PATH, load, partition
 
 # ─── Configuration ─────────────────────────────────────────────────────
 MIN_YEAR_LOO      = 2011
 MAX_YEAR_LOO      = 2011
 TEST_YEARS        = [2025]
-TRAIN_PATH        = "data/cleaned/TRAINING.csv"
-TEST_PATH         = "data/cleaned/drafts-2025-to-2025.csv"
 GUARD_MODEL_PATH  = "training/guards.pkl"
 WING_MODEL_PATH   = "training/wings.pkl"
 BIG_MODEL_PATH    = "training/bigs.pkl"
 OUTPUT_CSV        = "training/2025.csv"
-
-# ─── Position Predicates ────────────────────────────────────────────────
-def is_guard_only(pos_str: str) -> bool:
-    parts = re.split(r"[,\-/\s]+", pos_str.upper())
-    parts = [p for p in parts if p]
-    GUARD_POS = {"PG", "SG"}
-    return all(p in GUARD_POS for p in parts)
-
-def is_wing(pos_str: str) -> bool:
-    parts = re.split(r"[,\-/\s]+", pos_str.upper())
-    parts = [p for p in parts if p]
-    if "C" in parts:
-        return False
-    if "SF" in parts:
-        return True
-    if "PF" in parts and len(parts) > 1:
-        return True
-    return False
-
-def is_big(pos_str: str) -> bool:
-    parts = re.split(r"[,\-/\s]+", pos_str.upper())
-    parts = [p for p in parts if p]
-    return ("C" in parts) or all(p == "PF" for p in parts)
+LOO_MODE          = "loo"   # "loo", "year" or "oob"; see loo.py
 
 # ─── Feature Lists ───────────────────────────────────────────────────────
 FEATURES_GUARDS = [
@@ -62,50 +38,45 @@ FEATURES_BIGS = [
         "C_FGA/40", "C_FTA/40", "C_3PA/40", "C_3P%", "C_PTS/40", "C_AST/40", "C_TRB/40", "C_BLK/40"
 ]
 
-def run_loo(df, features):
-    loo = LeaveOneOut()
-    model = RandomForestRegressor(n_estimators=500, random_state=123456789, n_jobs=-1)
-    X = df[features]
-    y = df["Player Tier"]
-    return cross_val_predict(model, X, y, cv=loo, n_jobs=-1, verbose=1)
+def run_group_loo(df, features):
+    model = RandomForestRegressor(n_estimators=500, random_state=123456789)
+    preds, seconds = run_loo(model, df[features], df["Player Tier"],
+                             mode=LOO_MODE, groups=df["Draft Year"], verbose=1)
+    print(f"{len(df)} players in {seconds:.1f}s")
+    return preds
 
 parts = []
 
-df_train = pd.read_csv(TRAIN_PATH)
-df_train = df_train[df_train["Draft Year"].between(MIN_YEAR_LOO, MAX_YEAR_LOO)]
-for name, pred_fn, feats in [("Guard", is_guard_only, FEATURES_GUARDS),
-                             ("Wing", is_wing, FEATURES_WINGS),
-                             ("Big", is_big, FEATURES_BIGS)]:
-    df_grp = df_train[df_train["POS"].apply(pred_fn)].reset_index(drop=True)
-    missing = set(feats) - set(df_grp.columns)
-    if missing:
-        raise KeyError(f"Missing cols for {name}: {missing}")
+FEATURES = {"Guard": FEATURES_GUARDS, "Wing": FEATURES_WINGS, "Big": FEATURES_BIGS}
+MODEL_PATHS = {"Guard": GUARD_MODEL_PATH, "Wing": WING_MODEL_PATH, "Big": BIG_MODEL_PATH}
+all_feats = [f for feats in FEATURES.values() for f in feats]
+
+df_train = load(TRAIN_PATH, all_feats, years=(MIN_YEAR_LOO, MAX_YEAR_LOO))
+for name, df_grp in partition(df_train).items():
+    feats = FEATURES[name]
     print(f"Running LOO for {name}s...")
-    preds = run_loo(df_grp, feats)
-    df_grp["Predicted Score"] = preds
-    df_grp["Actual Tier"]    = df_grp["Player Tier"]
-    df_grp["Position Group"] = name
-    parts.append(df_grp[["Name","Draft Year","Pick Number","POS","Predicted Score","Actual Tier","Position Group"]])
+    preds = run_group_loo(df_grp, feats)
+    parts.append(df_grp[["Name","Draft Year","Pick Number","POS"]].assign(**{
+        "Predicted Score": preds,
+        "Actual Tier":     df_grp["Player Tier"],
+        "Position Group":  name,
+    }))
 
 # Direct predictions
-df_test = pd.read_csv(TEST_PATH)
-df_test = df_test[df_test["Draft Year"].isin(TEST_YEARS)].reset_index(drop=True)
-for name, pred_fn, feats, mpath in [("Guard", is_guard_only, FEATURES_GUARDS, GUARD_MODEL_PATH),
-                                    ("Wing", is_wing, FEATURES_WINGS, WING_MODEL_PATH),
-                                    ("Big", is_big, FEATURES_BIGS, BIG_MODEL_PATH)]:
-    df_grp = df_test[df_test["POS"].apply(pred_fn)].reset_index(drop=True)
-    print(f"Loading model for {name}s from {mpath}...")
-    model = joblib.load(mpath)
-    feat_names = list(model.feature_names_in_)
-    missing = set(feat_names) - set(df_grp.columns)
-    if missing:
-        raise KeyError(f"Missing cols for {name} test: {missing}")
-    X_test = df_grp[feat_names]
+models = {name: joblib.load(mpath) for name, mpath in MODEL_PATHS.items()}
+model_feats = [f for m in models.values() for f in m.feature_names_in_]
+df_test = load(TEST_PATH, model_feats, years=(min(TEST_YEARS), max(TEST_YEARS)), target=False)
+df_test = df_test[df_test["Draft Year"].isin(TEST_YEARS)]
+for name, df_grp in partition(df_test).items():
+    print(f"Predicting {name}s with {MODEL_PATHS[name]}...")
+    model = models[name]
+    X_test = df_grp[list(model.feature_names_in_)]
     preds = model.predict(X_test)
-    df_grp["Predicted Score"] = preds
-    df_grp["Actual Tier"]     = np.nan
-    df_grp["Position Group"]  = name
-    parts.append(df_grp[["Name","Draft Year","Pick Number","POS","Predicted Score","Actual Tier","Position Group"]])
+    parts.append(df_grp[["Name","Draft Year","Pick Number","POS"]].assign(**{
+        "Predicted Score": preds,
+        "Actual Tier":     np.nan,
+        "Position Group":  name,
+    }))
 
 all_df = pd.concat(parts, ignore_index=True)
 all_df.sort_values(["Draft Year","Predicted Score"], ascending=[True,False], inplace=True)
@@ -0,0 +1,54 @@
+import numpy as np
+import pytest
+from joblib import parallel_backend
+from sklearn.ensemble import RandomForestRegressor
+from sklearn.model_selection import LeaveOneGroupOut, LeaveOneOut, cross_val_predict
+
+from loo import run_loo, split_jobs
+
+@pytest.fixture(scope="module")
+def data():
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(24, 5))
+    y = X[:, 0] * 2 + rng.normal(scale=0.3, size=24)
+    years = np.repeat(np.arange(2011, 2017), 4)
+    return X, y, years
+
+def forest():
+    return RandomForestRegressor(n_estimators=10, max_features=0.6, random_state=100)
+
+@pytest.mark.parametrize("n_jobs", [1, 2])
+def test_loo_matches_cross_val_predict(data, n_jobs):
+    X, y, _ = data
+    # threads rather than worker processes: same fold scheduling, no start-up cost
+    with parallel_backend("threading"):
+        preds, _ = run_loo(forest(), X, y, mode="loo", n_jobs=n_jobs)
+    np.testing.assert_array_equal(preds, cross_val_predict(forest(), X, y, cv=LeaveOneOut()))
+
+def test_year_matches_leave_one_group_out(data):
+    X, y, years = data
+    preds, _ = run_loo(forest(), X, y, mode="year", groups=years, n_jobs=1)
+    expected = cross_val_predict(forest(), X, y, cv=LeaveOneGroupOut(), groups=years)
+    np.testing.assert_array_equal(preds, expected)
+
+def test_oob_matches_fitted_forest(data):
+    X, y, _ = data
+    preds, _ = run_loo(forest(), X, y, mode="oob", n_jobs=1)
+    fitted = forest().set_params(oob_score=True).fit(X, y)
+    np.testing.assert_array_equal(preds, fitted.oob_prediction_)
+
+def test_year_needs_groups(data):
+    X, y, _ = data
+    with pytest.raises(ValueError):
+        run_loo(forest(), X, y, mode="year")
+
+def test_unknown_mode(data):
+    X, y, _ = data
+    with pytest.raises(ValueError):
+        run_loo(forest(), X, y, mode="kfold")
+
+@pytest.mark.parametrize("n_folds, n_jobs, expected", [
+    (500, 8, (8, 1)), (3, 8, (3, 2)), (1, 8, (1, 8)), (10, 1, (1, 1)),
+])
+def test_split_jobs_stays_within_budget(n_folds, n_jobs, expected):
+    assert split_jobs(n_folds, n_jobs) == expected
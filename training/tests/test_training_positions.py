@@ -0,0 +1,59 @@
+import re
+from itertools import permutations
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from dataset import TRAIN_PATH
+from positions import POSITIONS, classify, classify_one
+
+ROOT = Path(__file__).resolve().parents[2]
+
+# ─── Baseline predicates ─────────────────────────────────────────────────────
+# The per-group filters train_and_LOO.py applied before positions.py existed;
+# classify must put every player in the one group whose predicate holds.
+def is_guard_only(pos_str: str) -> bool:
+    parts = re.split(r"[,\-/\s]+", pos_str.upper())
+    return all(p in {"PG","SG"} for p in parts if p)
+
+def is_wing(pos_str: str) -> bool:
+    parts = [p for p in re.split(r"[,\-/\s]+", pos_str.upper()) if p]
+    if "C" in parts: return False
+    if "SF" in parts: return True
+    return "PF" in parts and len(parts)>1
+
+def is_big(pos_str: str) -> bool:
+    parts = [p for p in re.split(r"[,\-/\s]+", pos_str.upper()) if p]
+    return "C" in parts or all(p=="PF" for p in parts)
+
+PREDICATES = [("Guard", is_guard_only), ("Wing", is_wing), ("Big", is_big)]
+
+def baseline(pos_str):
+    matches = [group for group, pred in PREDICATES if pred(pos_str)]
+    assert len(matches) <= 1, f"{pos_str!r} matched {matches}"
+    return matches[0] if matches else None
+
+# every ordering of one to three distinct positions, in the separators BBRef uses
+POS_STRINGS = [
+    sep.join(combo)
+    for n in (1, 2, 3)
+    for combo in permutations(POSITIONS, n)
+    for sep in (",", "-", " / ")
+] + ["pg", "sf,", "G"]
+
+@pytest.mark.parametrize("pos_str", POS_STRINGS)
+def test_classify_one_matches_baseline(pos_str):
+    assert classify_one(pos_str) == baseline(pos_str)
+
+def test_classify_matches_baseline_on_training_data():
+    pos = pd.read_csv(ROOT / TRAIN_PATH, usecols=["POS"])["POS"]
+    groups = classify(pos).astype(object)
+    assert list(groups) == [baseline(p) for p in pos]
+
+def test_classify_keeps_index_and_missing():
+    pos = pd.Series(["C", None, "PG"], index=[10, 11, 12])
+    groups = classify(pos)
+    assert list(groups.index) == [10, 11, 12]
+    assert list(groups.cat.categories) == ["Guard", "Wing", "Big"]
+    assert pd.isna(groups[11])
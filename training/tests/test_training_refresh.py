@@ -0,0 +1,44 @@
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.ensemble import RandomForestRegressor
+
+import refresh_models
+from dataset import TARGET, row_hashes
+
+FEATS = ["a", "b"]
+
+@pytest.fixture
+def small(monkeypatch):
+    monkeypatch.setattr(refresh_models, "FEATURES", {"guards": FEATS})
+    monkeypatch.setattr(refresh_models, "params", lambda: {"n_estimators": 20, "random_state": 0})
+
+def frame(n_years=6, per_year=12, seed=0):
+    rng = np.random.default_rng(seed)
+    n = n_years * per_year
+    df = pd.DataFrame({
+        "Name": [f"p{i}" for i in range(n)],
+        "Draft Year": np.repeat(np.arange(2011, 2011 + n_years), per_year),
+        "a": rng.normal(size=n), "b": rng.normal(size=n),
+    })
+    df[TARGET] = 3 * df["a"] + rng.normal(scale=0.1, size=n)
+    return df
+
+def test_warm_refresh_is_checked_against_a_refit(small, capsys):
+    df = frame()
+    old = df[df["Draft Year"] < 2016]
+    # a previous forest fit on labels that no longer hold: growing it keeps its bad trees
+    previous = RandomForestRegressor(n_estimators=400, random_state=0).fit(old[FEATS], -old[TARGET])
+    meta = {"row_hashes": row_hashes(old, FEATS)}
+    before, warm, refit = refresh_models.verify("guards", previous, meta, df, "warm", seed=1)
+    assert warm > refit + refresh_models.WARM_TOL
+    assert "warm refresh trails a refit" in capsys.readouterr().out
+
+def test_refit_is_not_compared_with_itself(small, capsys):
+    df = frame()
+    old = df[df["Draft Year"] < 2016]
+    previous = RandomForestRegressor(n_estimators=20, random_state=0).fit(old[FEATS], old[TARGET])
+    meta = {"row_hashes": row_hashes(old, FEATS)}
+    before, after, refit = refresh_models.verify("guards", previous, meta, df, "group", seed=1)
+    assert after == refit
+    assert "vs refit" not in capsys.readouterr().out
@@ -1,31 +1,17 @@
 import pandas as pd
-import re
 import joblib
 from sklearn.ensemble import RandomForestRegressor
-from sklearn.model_selection import LeaveOneOut, cross_val_predict
+from loo import run_loo
+from dataset import TRAIN_PATH, load, partition
+from model_meta import write_meta
 
 # ─── Config ─────────────────────────────────────────────────────────────────
 MIN_YEAR    = 2011
 MAX_YEAR    = 2021
-TRAIN_PATH  = "data/cleaned/TRAINING.csv"
 OUT_DIR     = "training"   # where to save the .pkl models
 RANDOM_SEED = 100
 N_EST       = 500
-
-# ─── Position Predicates ─────────────────────────────────────────────────────
-def is_guard_only(pos_str: str) -> bool:
-    parts = re.split(r"[,\-/\s]+", pos_str.upper())
-    return all(p in {"PG","SG"} for p in parts if p)
-
-def is_wing(pos_str: str) -> bool:
-    parts = [p for p in re.split(r"[,\-/\s]+", pos_str.upper()) if p]
-    if "C" in parts: return False
-    if "SF" in parts: return True
-    return "PF" in parts and len(parts)>1
-
-def is_big(pos_str: str) -> bool:
-    parts = [p for p in re.split(r"[,\-/\s]+", pos_str.upper()) if p]
-    return "C" in parts or all(p=="PF" for p in parts)
+LOO_MODE    = "loo"   # "loo" (exact), "year" (leave-one-draft-year-out) or "oob" (out-of-bag estimate)
 
 # ─── Feature Lists ───────────────────────────────────────────────────────────
 FEATURES = {
@@ -54,35 +40,24 @@ FEATURES = {
 }
 
 # ─── Main ────────────────────────────────────────────────────────────────────
-def train_group(name, predicate):
-    df = pd.read_csv(TRAIN_PATH)
-    # filter by year & position
-    df = df[df["Draft Year"].between(MIN_YEAR, MAX_YEAR)]
-    df = df[df["POS"].apply(predicate)].copy()
+def train_group(name, df):
     if df.empty:
         print(f"No {name} in {MIN_YEAR}–{MAX_YEAR}.")
         return None
 
     feats = FEATURES[name]
-    missing = [c for c in feats+["Player Tier"] if c not in df.columns]
-    if missing:
-        raise KeyError(f"{name}: missing columns {missing}")
-
     X = df[feats]
     y = df["Player Tier"]
 
     # LOO predictions
-    loo = LeaveOneOut()
     model = RandomForestRegressor(
         n_estimators=N_EST,
         random_state=RANDOM_SEED,
         n_jobs=-1
     )
-    print(f"Running leave one out testing for {name.capitalize()}…")
-    preds = cross_val_predict(
-        model, X, y,
-        cv=loo, n_jobs=-1, verbose=1
-    )
+    print(f"Running leave one out testing ({LOO_MODE}) for {name.capitalize()}…")
+    preds, seconds = run_loo(model, X, y, mode=LOO_MODE, groups=df["Draft Year"], verbose=1)
+    print(f"{name.capitalize()}: {len(df)} players in {seconds:.1f}s")
     df_out = df.reset_index(drop=True).copy()
     df_out["Predicted Tier"]  = preds
     df_out["Actual Tier"]     = df_out["Player Tier"]
@@ -100,16 +75,18 @@ def train_group(name, predicate):
     # save model
     path = f"{OUT_DIR}/{name}.pkl"
     joblib.dump(model, path)
+    write_meta(path, model, df, feats, {"n_estimators": N_EST, "random_state": RANDOM_SEED})
     print(f"Saved {name} model to {path}\n")
 
     return df_out[["Name","Draft Year","POS","Group","Predicted Tier","Actual Tier"]]
 
 if __name__=="__main__":
+    # one read for every group, pruned to the columns some group uses
+    all_feats = [f for feats in FEATURES.values() for f in feats]
+    groups = partition(load(TRAIN_PATH, all_feats, years=(MIN_YEAR, MAX_YEAR)))
     results = []
-    for grp, pred in [("guards", is_guard_only),
-                      ("wings",  is_wing),
-                      ("bigs",   is_big)]:
-        df_grp = train_group(grp, pred)
+    for grp in ["guards", "wings", "bigs"]:
+        df_grp = train_group(grp, groups[grp[:-1].capitalize()])
         if df_grp is not None:
             results.append(df_grp)
 
@@ -1,121 +1,128 @@
-from flask import Flask, jsonify, request
+from flask import Flask, Response, jsonify, request
 from flask_cors import CORS
-import pandas as pd
 import numpy as np
 from pathlib import Path
-from models import models
+from models import models, model_versions, feature_means, reload_listeners
+from pred_cache import PredictionCache
+from results_store import ResultsStore
+from positions import classify_one
+from batch import predict_batch, parse_players, derive_features, impute
+
+prediction_cache = PredictionCache()
+reload_listeners.append(prediction_cache.clear)
 
 app = Flask(__name__)
-CORS(app, resources={r"/api/*": {"origins": ["http://localhost:3000","http://127.0.0.1:3000"]}})
+CORS(app, resources={r"/api/*": {"origins": ["http://localhost:3000","http://127.0.0.1:3000"]}},
+     expose_headers=['X-Total-Count'])
+
+# results.csv pre-serialized per year (see results_store.py)
+results = ResultsStore(Path(__file__).parent / 'results.csv')
+
+QUERY_PARAMS = {'page', 'limit', 'sort', 'group', 'tier_min', 'tier_max', 'score_min', 'score_max', 'fields'}
+
+def _csv_arg(name):
+    value = request.args.get(name)
+    return [v.strip() for v in value.split(',') if v.strip()] if value else None
+
+def _float_arg(name):
+    value = request.args.get(name)
+    return float(value) if value not in (None, '') else None
 
-# Load and sanitize results.csv
-df = pd.read_csv(Path(__file__).parent / 'results.csv')
-df = df.replace({np.nan: None})
+def query_results(year):
+    """
+    Paged/sorted/filtered/projected results. sort takes a column name,
+    prefixed with '-' for descending; group takes Guard/Wing/Big (plural
+    or any case, comma-separated); fields is a comma-separated projection.
+    The total match count is returned in X-Total-Count.
+    """
+    sort = request.args.get('sort') or None
+    desc = bool(sort) and sort.startswith('-')
+    groups = _csv_arg('group')
+    try:
+        rows, total = results.query(
+            year=year,
+            groups=[g.rstrip('sS').capitalize() for g in groups] if groups else None,
+            tier=(_float_arg('tier_min'), _float_arg('tier_max')),
+            score=(_float_arg('score_min'), _float_arg('score_max')),
+            sort=sort.lstrip('-') if sort else None,
+            desc=desc,
+            page=int(request.args.get('page', 1)),
+            limit=int(request.args['limit']) if request.args.get('limit') else None,
+            fields=_csv_arg('fields'),
+        )
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    resp = jsonify(rows)
+    resp.headers['X-Total-Count'] = str(total)
+    return resp
 
 @app.route('/api/results')
 def get_results():
     year_arg = request.args.get('year')
-    if year_arg is None:
-        filtered = df
+    try:
+        year = int(year_arg) if year_arg is not None else None
+    except ValueError:
+        year = None
+    if QUERY_PARAMS & request.args.keys():
+        return query_results(year)
+    blob = results.get(year)
+
+    encoding, etag, body = blob.pick(request.headers.get('Accept-Encoding'))
+    if request.if_none_match.contains(etag):
+        resp = Response(status=304)
     else:
-        try:
-            year = int(year_arg)
-            filtered = df[df['Draft Year'] == year]
-        except ValueError:
-            filtered = df
-    return jsonify(filtered.to_dict(orient='records'))
+        resp = Response(body, mimetype='application/json')
+        if encoding:
+            resp.headers['Content-Encoding'] = encoding
+    resp.set_etag(etag)
+    resp.headers['Vary'] = 'Accept-Encoding'
+    return resp
 
 @app.route('/api/predict', methods=['POST'])
 def predict():
     data = request.json or {}
     pos  = data.pop('Position Group', None)
+    # a raw POS string (e.g. "SF,PF") is routed the same way training groups players
+    pos_str = data.pop('POS', None)
+    if pos is None and pos_str is not None:
+        group = classify_one(pos_str)
+        pos = f"{group}s" if group else None
     model = models.get(pos)
     if model is None:
-        return jsonify({'error': f"No model for {pos}"}), 400
-
-    # ─── Raw inputs ─────────────────────────────────────────────
-    age        = float(data['Age'])
-    height_in  = float(data['Height'])       # inches
-    weight_lbs = float(data['Weight'])       # lbs
-    ct_win     = float(data['CT_Win%'])
-    ct_sos     = float(data['CT_SOS'])
-    mpg        = float(data['C_MPG'])
-    usg_pct    = float(data['C_USG%'])
-    fga        = float(data['FGA_per_game'])
-    threepa    = float(data['3PA_per_game'])
-    fta        = float(data['FTA_per_game'])
-    ast_raw    = float(data['AST_per_game'])
-    stl_raw    = float(data['STL_per_game'])
-    tov_raw    = float(data['TOV_per_game'])
-    ppg        = float(data['PPG'])
-    off_reb    = float(data['OffReb'])
-    def_reb    = float(data['DefReb'])
-    blk_raw    = float(data.get('BLK_per_game', 0))
-
-    obpm   = float(data.get('C_OBPM', 0))
-    dbpm   = float(data.get('C_DBPM', 0))
-    bpm    = float(data.get('C_BPM', 0))
-    per    = float(data.get('C_PER', 0))
-
-    # ─── Derivations ────────────────────────────────────────────
-    height_cm = height_in * 2.54
-    weight_kg = weight_lbs * 0.45359237
-
-    ts_denom = fga + 0.44 * fta
-    ts_pct   = (ppg / (2 * ts_denom) * 100) if ts_denom else 0
+        return jsonify({'error': f"No model for {pos or pos_str}"}), 400
 
-    ast_to   = ast_raw / tov_raw if tov_raw else 0
-    orb_drb  = off_reb / def_reb if def_reb else 0
-    total_reb = off_reb + def_reb
+    values, errors = parse_players([data])
+    if errors:
+        return jsonify({'error': f"Missing or non-numeric fields: {errors[0]['missing']}"}), 400
+    X, imputed, missing = impute(derive_features(values), values, list(model.feature_names_in_),
+                                 feature_means.get(pos, {}))
+    if missing[0]:
+        return jsonify({'error': f"Missing or non-numeric fields: {missing[0]}"}), 400
+    features = X.to_numpy()[0]
+    score = prediction_cache.get_or_predict(pos, model_versions[pos], features, model.predict)
+    return jsonify({'Predicted Score': score, 'imputed': imputed[0]})
 
-    def per40(x): return (x / mpg * 40) if mpg else 0
-    fga_40     = per40(fga)
-    threepa_40 = per40(threepa)
-    fta_40     = per40(fta)
-    ast_40     = per40(ast_raw)
-    stl_40     = per40(stl_raw)
-    tov_40     = per40(tov_raw)
-    pts_40     = per40(ppg)
-    trb_40     = per40(total_reb)
-    blk_40     = per40(blk_raw)
+@app.route('/api/predict/cache')
+def predict_cache_stats():
+    return jsonify(prediction_cache.stats())
 
-    # ─── Feature vectors ────────────────────────────────────────
-    if pos == 'Guards':
-        features = [
-            age, height_cm, weight_kg,
-            ct_win, ct_sos,
-            mpg, ts_pct, per,
-            ast_to, orb_drb,
-            usg_pct,
-            obpm,
-            fga_40, threepa_40, fta_40, trb_40,
-            ast_40, blk_40, stl_40, tov_40, pts_40
-        ]
-    elif pos == 'Wings':
-        features = [
-            age, height_cm, weight_kg,
-            ct_win, ct_sos,
-            mpg, ts_pct, per,
-            ast_to, orb_drb,
-            usg_pct,
-            bpm,
-            fga_40, threepa_40, fta_40, trb_40,
-            ast_40, blk_40, stl_40, tov_40, pts_40
-        ]
-    else:  # Bigs
-        features = [
-            age, height_cm, weight_kg,
-            ct_win, ct_sos,
-            mpg, ts_pct, per,
-            ast_to, orb_drb,
-            usg_pct,
-            dbpm,
-            fga_40, threepa_40, fta_40, trb_40,
-            ast_40, blk_40, stl_40, tov_40, pts_40
-        ]
+@app.route('/api/predict/batch', methods=['POST'])
+def predict_many():
+    players = (request.json or {}).get('players')
+    if not isinstance(players, list) or not all(isinstance(p, dict) for p in players):
+        return jsonify({'error': "Expected {'players': [{...}, ...]}"}), 400
+    if not players:
+        return jsonify({'predictions': [], 'errors': []})
 
-    score = model.predict([features])[0]
-    return jsonify({'Predicted Score': float(score)})
+    scores, groups, errors, imputed = predict_batch(models, players, feature_means)
+    predictions = [
+        {'index': i,
+         'Position Group': groups.iloc[i],
+         'Predicted Score': None if np.isnan(score) else float(score),
+         'imputed': imputed.get(i, [])}
+        for i, score in enumerate(scores)
+    ]
+    return jsonify({'predictions': predictions, 'errors': errors})
 
 if __name__ == '__main__':
     app.run(host='0.0.0.0', port=5000, debug=True)
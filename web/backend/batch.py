@@ -0,0 +1,151 @@
+import numpy as np
+import pandas as pd
+
+from positions import classify
+
+# ─── Batch inputs ────────────────────────────────────────────────────────────
+# Same per-game form fields as /api/predict, one row per prospect.
+REQUIRED_FIELDS = [
+    'Age', 'Height', 'Weight', 'CT_Win%', 'CT_SOS', 'C_MPG', 'C_USG%',
+    'FGA_per_game', '3PA_per_game', 'FTA_per_game', 'AST_per_game',
+    'STL_per_game', 'TOV_per_game', 'PPG', 'OffReb', 'DefReb',
+]
+# Optional inputs -> the model columns derived from them. A missing one is
+# filled with the group's training mean (models/feature_means.json) for the
+# columns its model uses, and reported back as imputed.
+OPTIONAL_FIELDS = {
+    'BLK_per_game': ['C_BLK/40', 'C_STOCKS/40'],
+    'C_OBPM': ['C_OBPM'], 'C_DBPM': ['C_DBPM'], 'C_BPM': ['C_BPM'], 'C_PER': ['C_PER'],
+    'C_BLK%': ['C_BLK%'], 'C_ORB%': ['C_ORB%'], 'C_3P%': ['C_3P%'],
+}
+FIELDS = REQUIRED_FIELDS + list(OPTIONAL_FIELDS)
+
+def _ratio(num, den):
+    return np.divide(num, den, out=np.zeros(len(num)), where=den != 0)
+
+def parse_players(players):
+    """
+    Numeric frame of the form fields. Returns (frame, errors) where errors
+    lists the players with missing or non-numeric required fields; missing
+    optional fields are left NaN for impute().
+    """
+    raw = pd.DataFrame(players)
+    for col in FIELDS:
+        if col not in raw:
+            raw[col] = np.nan
+    values = raw[FIELDS].apply(pd.to_numeric, errors='coerce')
+    bad = values[REQUIRED_FIELDS].isna()
+    errors = [
+        {'index': int(i), 'missing': list(bad.columns[row])}
+        for i, row in zip(bad.index, bad.to_numpy()) if row.any()
+    ]
+    return values, errors
+
+def derive_features(values):
+    """
+    Model columns, named and scaled as in TRAINING.csv (cm, kg, TS% and 3P%
+    as fractions), computed for every player at once. Columns derived from
+    a missing optional field come out NaN.
+    """
+    v = {c: values[c].to_numpy(dtype=np.float64) for c in values.columns}
+    height_cm = v['Height'] * 2.54
+    weight_kg = v['Weight'] * 0.45359237
+    mpg = v['C_MPG']
+
+    def per40(x):
+        return _ratio(x * 40, mpg)
+
+    out = {
+        'Age':           v['Age'],
+        'Height':        height_cm,
+        'Weight':        weight_kg,
+        'Height/Weight': _ratio(height_cm, weight_kg),
+        'CT_Win%':       v['CT_Win%'],
+        'CT_SOS':        v['CT_SOS'],
+        'C_MPG':         mpg,
+        'C_USG%':        v['C_USG%'],
+        'C_TS%':         _ratio(v['PPG'], 2 * (v['FGA_per_game'] + 0.44 * v['FTA_per_game'])),
+        'C_AST_TO':      _ratio(v['AST_per_game'], v['TOV_per_game']),
+        'C_ORB_DRB':     _ratio(v['OffReb'], v['DefReb']),
+        'C_FGA/40':      per40(v['FGA_per_game']),
+        'C_3PA/40':      per40(v['3PA_per_game']),
+        'C_FTA/40':      per40(v['FTA_per_game']),
+        'C_AST/40':      per40(v['AST_per_game']),
+        'C_STL/40':      per40(v['STL_per_game']),
+        'C_BLK/40':      per40(v['BLK_per_game']),
+        'C_TOV/40':      per40(v['TOV_per_game']),
+        'C_PTS/40':      per40(v['PPG']),
+        'C_TRB/40':      per40(v['OffReb'] + v['DefReb']),
+        'C_STOCKS/40':   per40(v['STL_per_game'] + v['BLK_per_game']),
+    }
+    for col in ['C_OBPM', 'C_DBPM', 'C_BPM', 'C_PER', 'C_BLK%', 'C_ORB%']:
+        out[col] = v[col]
+    # the form takes 3P% as a percentage, like the other shooting splits
+    out['C_3P%'] = v['C_3P%'] / 100
+    return pd.DataFrame(out, index=values.index)
+
+def impute(features, values, columns, means):
+    """
+    The given model columns of features, with the ones derived from a
+    missing optional field filled from means ({column: training mean}).
+    Returns (frame, imputed, missing): per row index, the optional fields
+    that were filled in, and those that couldn't be for lack of a mean.
+    """
+    X = features[columns].copy()
+    imputed = {i: [] for i in X.index}
+    missing = {i: [] for i in X.index}
+    for field, derived in OPTIONAL_FIELDS.items():
+        used = [c for c in derived if c in columns]
+        absent = values.loc[X.index, field].isna()
+        if not used or not absent.any():
+            continue
+        fillable = all(c in means for c in used)
+        if fillable:
+            X.loc[absent, used] = [means[c] for c in used]
+        for i in absent.index[absent]:
+            (imputed if fillable else missing)[i].append(field)
+    return X, imputed, missing
+
+def route(players):
+    """
+    Model key ('Guards', 'Wings', 'Bigs') per player: an explicit Position
+    Group wins, otherwise POS is classified the way training groups players.
+    """
+    raw = pd.DataFrame(players)
+    explicit = raw['Position Group'] if 'Position Group' in raw else pd.Series(None, index=raw.index, dtype=object)
+    pos = raw['POS'] if 'POS' in raw else pd.Series(None, index=raw.index, dtype=object)
+    derived = classify(pos).astype(object).map(lambda g: f"{g}s" if isinstance(g, str) else None)
+    groups = explicit.where(explicit.notna(), derived).astype(object)
+    return groups.where(groups.notna(), None)
+
+def predict_batch(models, players, means):
+    """
+    Score every player with one predict call per position group, filling
+    in missing optional fields from means ({group: {column: mean}}).
+    Returns (scores, groups, errors, imputed) where imputed maps a player's
+    index to the optional fields filled in for it; players that are
+    unroutable or miss a field that can't be filled score None.
+    """
+    values, errors = parse_players(players)
+    groups = route(players)
+    features = derive_features(values)
+    scores = np.full(len(values), np.nan)
+    bad = {e['index'] for e in errors}
+    ok = ~values.index.isin(bad)
+    imputed = {}
+    for key, model in models.items():
+        mask = ok & (groups == key).to_numpy()
+        if not mask.any():
+            continue
+        X, filled, missing = impute(features.loc[mask], values, list(model.feature_names_in_), means.get(key, {}))
+        usable = np.array([not missing[i] for i in X.index])
+        for i in X.index:
+            if missing[i]:
+                errors.append({'index': int(i), 'missing': missing[i]})
+            elif filled[i]:
+                imputed[int(i)] = filled[i]
+        if usable.any():
+            scores[np.flatnonzero(mask)[usable]] = model.predict(X[usable].to_numpy())
+    for i in np.flatnonzero(ok & ~groups.isin(list(models)).to_numpy()):
+        errors.append({'index': int(i), 'error': f"No model for {groups.iloc[i] or players[i].get('POS')}"})
+    return scores, groups, errors, imputed
@@ -1 +1 @@
-from .loader import models
\ No newline at end of file
+from .loader import models, model_versions, feature_means, reload_listeners, reload_models
\ No newline at end of file
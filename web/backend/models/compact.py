@@ -0,0 +1,119 @@
+"""
+Flat, memory-mapped forest format for serving.
+
+    python models/compact.py            # export every models/*.pkl next to itself
+
+Each RandomForestRegressor becomes <name>.npy, one structured array with
+every tree's nodes back to back (child indices already offset into the
+flat array), plus <name>.json with the feature names and tree roots.
+CompactForest maps the .npy read-only, so loading is near-instant and all
+workers on a host share the same pages.
+"""
+import hashlib
+import json
+import sys
+from pathlib import Path
+
+import joblib
+import numpy as np
+
+NODE_DTYPE = np.dtype([
+    ('left',      np.int32),    # -1 on leaves
+    ('right',     np.int32),
+    ('feature',   np.int32),
+    ('threshold', np.float64),
+    ('value',     np.float64),
+])
+
+def file_sha256(path):
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+def export(model, npy_path, source=None):
+    """
+    Write a fitted RandomForestRegressor to npy_path and its .json sidecar.
+    source is the pickle it came from; its hash is recorded so the loader
+    can tell whether the export is still current.
+    """
+    npy_path = Path(npy_path)
+    trees = [est.tree_ for est in model.estimators_]
+    nodes = np.empty(sum(t.node_count for t in trees), dtype=NODE_DTYPE)
+    roots = []
+    offset = 0
+    for t in trees:
+        n = t.node_count
+        block = nodes[offset:offset + n]
+        leaf = t.children_left == -1
+        block['left']      = np.where(leaf, -1, t.children_left + offset)
+        block['right']     = np.where(leaf, -1, t.children_right + offset)
+        block['feature']   = np.where(leaf, 0, t.feature)
+        block['threshold'] = t.threshold
+        block['value']     = t.value[:, 0, 0]
+        roots.append(offset)
+        offset += n
+    np.save(npy_path, nodes)
+
+    names = getattr(model, 'feature_names_in_', None)
+    meta = {
+        'feature_names': [str(f) for f in names] if names is not None else None,
+        'n_features':    int(model.n_features_in_),
+        'roots':         roots,
+        'max_depth':     int(max(est.tree_.max_depth for est in model.estimators_)),
+        'source_sha256': file_sha256(source) if source is not None else None,
+    }
+    npy_path.with_suffix('.json').write_text(json.dumps(meta))
+    return meta
+
+class CompactForest:
+    """
+    Read-only forest over a memory-mapped node array. Mirrors the parts of
+    the sklearn regressor the app uses: predict, feature_names_in_ and
+    n_features_in_.
+    """
+    def __init__(self, npy_path):
+        npy_path = Path(npy_path)
+        meta = json.loads(npy_path.with_suffix('.json').read_text())
+        self.source_sha256 = meta.get('source_sha256')
+        nodes = np.load(npy_path, mmap_mode='r')
+        self.left      = nodes['left']
+        self.right     = nodes['right']
+        self.feature   = nodes['feature']
+        self.threshold = nodes['threshold']
+        self.value     = nodes['value']
+        self.roots     = np.asarray(meta['roots'], dtype=np.int64)
+        self.max_depth = meta['max_depth']
+        self.n_features_in_ = meta['n_features']
+        if meta['feature_names'] is not None:
+            self.feature_names_in_ = np.asarray(meta['feature_names'], dtype=object)
+
+    def predict(self, X):
+        """
+        Walk every (row, tree) pair one level per step. X is cast to
+        float32 like sklearn does, so splits land identically.
+        """
+        X = np.asarray(X, dtype=np.float32)
+        if X.ndim == 1:
+            X = X[None, :]
+        if X.shape[1] != self.n_features_in_:
+            raise ValueError(f"X has {X.shape[1]} features, but the forest expects {self.n_features_in_}")
+        rows = np.arange(len(X))[:, None]
+        idx = np.broadcast_to(self.roots, (len(X), len(self.roots))).copy()
+        for _ in range(self.max_depth):
+            left = self.left[idx]
+            inner = left != -1
+            if not inner.any():
+                break
+            go_left = X[rows, self.feature[idx]] <= self.threshold[idx]
+            idx = np.where(inner, np.where(go_left, left, self.right[idx]), idx)
+        return self.value[idx].mean(axis=1)
+
+def export_dir(models_dir):
+    for pkl in sorted(Path(models_dir).glob('*.pkl')):
+        meta = export(joblib.load(pkl), pkl.with_suffix('.npy'), source=pkl)
+        print(f"Exported {pkl.name}: {len(meta['roots'])} trees -> {pkl.with_suffix('.npy').name}")
+
+if __name__ == '__main__':
+    export_dir(sys.argv[1] if len(sys.argv) > 1 else Path(__file__).parent)
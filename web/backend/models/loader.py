@@ -1,15 +1,64 @@
+import json
+import logging
 import joblib
 from pathlib import Path
+from .compact import CompactForest, file_sha256
+
+logger = logging.getLogger(__name__)
+
+MODEL_FILES = {'Guards': 'guards', 'Wings': 'wings', 'Bigs': 'bigs'}
+
+# group -> identifier of the file the loaded model came from
+model_versions = {}
+# group -> {feature: training mean}, for filling in optional inputs (models/means.py)
+feature_means = {}
+# called with no arguments after every reload (e.g. to drop cached predictions)
+reload_listeners = []
 
 def get_models_dir():
     return Path(__file__).parent
 
+def file_version(path):
+    st = path.stat()
+    return f"{path.name}:{st.st_size}:{st.st_mtime_ns}"
+
+def load_model(base, name):
+    """
+    Prefer the memory-mapped export (models/compact.py); fall back to the
+    pickle when there is none or the pickle's hash no longer matches the one
+    recorded at export (it has been retrained since). File mtimes aren't
+    used: a fresh checkout writes files in arbitrary order.
+    Returns (model, source path).
+    """
+    pkl, npy = base / f'{name}.pkl', base / f'{name}.npy'
+    if npy.exists() and npy.with_suffix('.json').exists():
+        compact = CompactForest(npy)
+        if not pkl.exists() or compact.source_sha256 == file_sha256(pkl):
+            return compact, npy
+        logger.warning(f"{pkl.name} changed since {npy.name} was exported; loading the pickle (re-run models/compact.py)")
+    return joblib.load(pkl), pkl
+
 def load_models():
     base = get_models_dir()
-    return {
-        'Guards': joblib.load(base / 'guards.pkl'),
-        'Wings':  joblib.load(base / 'wings.pkl'),
-        'Bigs':   joblib.load(base / 'bigs.pkl'),
-    }
+    loaded = {}
+    for group, name in MODEL_FILES.items():
+        loaded[group], path = load_model(base, name)
+        model_versions[group] = file_version(path)
+    means = base / 'feature_means.json'
+    feature_means.clear()
+    if means.exists():
+        feature_means.update(json.loads(means.read_text()))
+    else:
+        logger.warning(f"No {means.name}; requests missing optional fields will be rejected (run models/means.py)")
+    return loaded
+
+def reload_models():
+    """
+    Reload every model in place and notify the reload listeners.
+    """
+    models.update(load_models())
+    for listener in reload_listeners:
+        listener()
+    return model_versions
 
 models = load_models()
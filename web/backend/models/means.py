@@ -0,0 +1,35 @@
+"""
+Per-group training means of every model feature, used to fill in optional
+form fields a request leaves out (see batch.impute).
+
+    python -m models.means                      # from web/backend; reads data/cleaned/TRAINING.csv
+    python -m models.means path/to/TRAINING.csv
+
+Writes models/feature_means.json: {model key: {feature: mean}}.
+"""
+import json
+import sys
+from pathlib import Path
+
+import pandas as pd
+
+from positions import classify
+from .loader import MODEL_FILES, get_models_dir
+
+TRAINING_CSV = Path(__file__).resolve().parents[3] / 'data' / 'cleaned' / 'TRAINING.csv'
+
+def export_means(training_csv, models_dir):
+    df = pd.read_csv(training_csv)
+    groups = classify(df['POS']).astype(object)
+    means = {}
+    for key, name in MODEL_FILES.items():
+        features = json.loads((Path(models_dir) / f'{name}.json').read_text())['feature_names']
+        rows = df.loc[groups == key.rstrip('s'), features]
+        means[key] = {f: round(float(rows[f].mean()), 6) for f in features}
+    path = Path(models_dir) / 'feature_means.json'
+    path.write_text(json.dumps(means, indent=2) + '\n')
+    return path
+
+if __name__ == '__main__':
+    out = export_means(sys.argv[1] if len(sys.argv) > 1 else TRAINING_CSV, get_models_dir())
+    print(f"Wrote {out}")
@@ -0,0 +1,71 @@
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+
+MAX_ENTRIES = 4096
+TTL_SECONDS = 3600
+DECIMALS    = 4     # feature values are rounded to this many places for the key
+
+class PredictionCache:
+    """
+    LRU cache of single-player scores keyed on (position group, model
+    version, rounded feature vector). Misses are scored on the rounded
+    vector too, so every input sharing a key gets the same score whichever
+    arrives first. Entries expire after ttl seconds; clear() is hooked to
+    the model loader so a reload starts empty.
+    """
+    def __init__(self, max_entries=MAX_ENTRIES, ttl=TTL_SECONDS, decimals=DECIMALS):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.decimals = decimals
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def round(self, features):
+        # + 0.0 folds -0.0 into 0.0 so both round to the same bytes
+        return np.round(np.asarray(features, dtype=np.float64), self.decimals) + 0.0
+
+    def key(self, group, version, features):
+        return group, version, self.round(features).tobytes()
+
+    def get_or_predict(self, group, version, features, predict):
+        """
+        Cached score for one feature vector, calling predict on the rounded
+        vector on a miss.
+        """
+        rounded = self.round(features)
+        key = group, version, rounded.tobytes()
+        now = time.monotonic()
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None and entry[1] > now:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+            self.misses += 1
+
+        score = float(predict(rounded[None, :])[0])
+        with self.lock:
+            self.entries[key] = (score, now + self.ttl)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+        return score
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+    def stats(self):
+        with self.lock:
+            total = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / total, 4) if total else 0.0,
+                'entries': len(self.entries),
+            }
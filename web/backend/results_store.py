@@ -0,0 +1,137 @@
+import gzip
+import hashlib
+import json
+
+import numpy as np
+import pandas as pd
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+GZIP_LEVEL = 9
+BROTLI_QUALITY = 11
+# each encoding is a different representation, so it gets its own ETag
+ETAG_SUFFIXES = {None: '', 'gzip': '-gz', 'br': '-br'}
+MAX_LIMIT = 1000     # rows per page when a query asks for more (or for none)
+
+def accepted_encodings(accept_encoding):
+    """
+    The codings an Accept-Encoding header allows, i.e. those listed
+    without q=0 (a malformed q counts as refused).
+    """
+    accepted = set()
+    for part in (accept_encoding or '').split(','):
+        coding, *params = [p.strip() for p in part.split(';')]
+        q = 1.0
+        for param in params:
+            name, _, value = param.partition('=')
+            if name.strip().lower() == 'q':
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        if coding and q > 0:
+            accepted.add(coding.lower())
+    return accepted
+
+class Blob:
+    """
+    One pre-serialized JSON response: raw bytes, whatever compressed
+    variants are available ('gzip', 'br') and an ETag per encoding.
+    """
+    def __init__(self, body):
+        self.body = body
+        digest = hashlib.sha256(body).hexdigest()[:32]
+        self.etags = {enc: digest + suffix for enc, suffix in ETAG_SUFFIXES.items()}
+        self.encoded = {'gzip': gzip.compress(body, GZIP_LEVEL, mtime=0)}
+        if brotli is not None:
+            self.encoded['br'] = brotli.compress(body, quality=BROTLI_QUALITY)
+
+    def pick(self, accept_encoding):
+        """
+        (encoding, etag, bytes) for an Accept-Encoding header, preferring br
+        over gzip when the client takes both; (None, etag, body) if it takes
+        neither. Codings listed with q=0 are refused.
+        """
+        accepted = accepted_encodings(accept_encoding)
+        for enc in ('br', 'gzip'):
+            if enc in accepted and enc in self.encoded:
+                return enc, self.etags[enc], self.encoded[enc]
+        return None, self.etags[None], self.body
+
+class ResultsStore:
+    """
+    results.csv serialized once at startup: an all-years blob plus one
+    per draft year, so serving a request is a dict lookup.
+
+    Paged, sorted, filtered or projected queries go through query(), which
+    works off a stable sort order per column (both directions) computed
+    here, so a request only masks and slices index arrays.
+    """
+    def __init__(self, path):
+        raw = pd.read_csv(path)
+        df = raw.replace({np.nan: None})
+        self.all = self._blob(df)
+        self.years = {int(year): self._blob(rows) for year, rows in df.groupby('Draft Year', sort=True)}
+        self.empty = self._blob(df.iloc[:0])
+
+        self.columns = list(raw.columns)
+        self.records = df.to_dict(orient='records')
+        self.year = raw['Draft Year'].to_numpy()
+        self.group = raw['Position Group'].to_numpy(dtype=object)
+        self.tier = raw['Actual Tier'].to_numpy(dtype=np.float64)
+        self.score = raw['Predicted Score'].to_numpy(dtype=np.float64)
+        # missing values sort last in either direction
+        self.order = {
+            (col, desc): raw.sort_values(col, ascending=not desc, kind='stable', na_position='last').index.to_numpy()
+            for col in self.columns for desc in (False, True)
+        }
+
+    @staticmethod
+    def _blob(rows):
+        # same bytes jsonify produced: sorted keys, compact separators, ASCII
+        body = json.dumps(rows.to_dict(orient='records'), sort_keys=True, separators=(',', ':'))
+        return Blob((body + '\n').encode('utf-8'))
+
+    def get(self, year=None):
+        if year is None:
+            return self.all
+        return self.years.get(year, self.empty)
+
+    def query(self, year=None, groups=None, tier=(None, None), score=(None, None),
+              sort=None, desc=False, page=1, limit=None, fields=None):
+        """
+        Rows matching the filters, ordered by sort (file order if None),
+        as one page of dicts holding only fields. Returns (rows, total).
+        Raises ValueError on an unknown column or a bad page.
+        """
+        unknown = [c for c in ([sort] if sort else []) + list(fields or []) if c not in self.columns]
+        if unknown:
+            raise ValueError(f"Unknown column(s) {unknown}; expected {self.columns}")
+        if page < 1 or (limit is not None and limit < 1):
+            raise ValueError("page and limit must be positive")
+
+        mask = np.ones(len(self.records), dtype=bool)
+        if year is not None:
+            mask &= self.year == year
+        if groups:
+            mask &= np.isin(self.group, list(groups))
+        for values, (lo, hi) in ((self.tier, tier), (self.score, score)):
+            # NaN compares False, so rows without a value drop out of ranged queries
+            if lo is not None:
+                mask &= values >= lo
+            if hi is not None:
+                mask &= values <= hi
+
+        order = self.order[(sort, desc)] if sort else np.arange(len(self.records))
+        matched = order[mask[order]]
+        limit = min(limit or MAX_LIMIT, MAX_LIMIT)
+        start = (page - 1) * limit
+        picked = matched[start:start + limit]
+        if fields:
+            rows = [{f: self.records[i][f] for f in fields} for i in picked]
+        else:
+            rows = [self.records[i] for i in picked]
+        return rows, len(matched)
@@ -0,0 +1,6 @@
+import pytest
+
+@pytest.fixture
+def client():
+    from app import app
+    return app.test_client()
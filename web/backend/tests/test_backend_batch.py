@@ -0,0 +1,125 @@
+import json
+import shutil
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+import app as app_module
+from batch import OPTIONAL_FIELDS, derive_features, parse_players
+from models import feature_means, models
+
+ROOT = Path(__file__).resolve().parents[3]
+
+# per-game form inputs, as the frontend sends them
+PLAYER = {
+    'Age': 19.5, 'Height': 80, 'Weight': 215, 'CT_Win%': 0.72, 'CT_SOS': 8.1,
+    'C_MPG': 30.5, 'C_USG%': 24.3, 'FGA_per_game': 12.1, '3PA_per_game': 4.2,
+    'FTA_per_game': 5.0, 'AST_per_game': 2.8, 'STL_per_game': 1.3,
+    'TOV_per_game': 2.1, 'PPG': 16.4, 'OffReb': 1.5, 'DefReb': 4.9,
+    'BLK_per_game': 0.8, 'C_OBPM': 5.1, 'C_DBPM': 2.0, 'C_BPM': 7.1,
+    'C_PER': 21.7, 'C_BLK%': 3.1, 'C_ORB%': 5.2, 'C_3P%': 36.5,
+}
+
+def single(client, player):
+    resp = client.post('/api/predict', json=dict(player))
+    assert resp.status_code == 200, resp.get_json()
+    return resp.get_json()
+
+def test_batch_matches_single_predictions(client):
+    players = [{**PLAYER, 'POS': pos} for pos in ('PG', 'SF,PF', 'C', 'SG,SF')]
+    players.append({**PLAYER, 'Position Group': 'Bigs', 'POS': 'PG'})  # explicit group wins
+    body = client.post('/api/predict/batch', json={'players': players}).get_json()
+    assert body['errors'] == []
+    assert [p['Position Group'] for p in body['predictions']] == ['Guards', 'Wings', 'Bigs', 'Wings', 'Bigs']
+    for player, pred in zip(players, body['predictions']):
+        assert pred['Predicted Score'] == pytest.approx(single(client, player)['Predicted Score'])
+        assert pred['imputed'] == []
+
+def test_bad_rows_are_reported_not_fatal(client):
+    players = [
+        {**PLAYER, 'POS': 'PG'},
+        {**PLAYER, 'POS': 'PG', 'PPG': 'n/a', 'Age': None},
+        {**PLAYER, 'POS': 'QB'},
+        {**PLAYER, 'POS': 'C'},
+    ]
+    body = client.post('/api/predict/batch', json={'players': players}).get_json()
+    scores = [p['Predicted Score'] for p in body['predictions']]
+    assert scores[0] is not None and scores[3] is not None
+    assert scores[1] is None and scores[2] is None
+    errors = {e['index']: e for e in body['errors']}
+    assert sorted(errors) == [1, 2]
+    assert errors[1]['missing'] == ['Age', 'PPG']
+    assert 'QB' in errors[2]['error']
+
+@pytest.mark.parametrize('payload', [{}, {'players': {}}, {'players': [1, 2]}, []])
+def test_malformed_batch(client, payload):
+    assert client.post('/api/predict/batch', json=payload).status_code == 400
+
+def test_empty_batch(client):
+    assert client.post('/api/predict/batch', json={'players': []}).get_json() == {'predictions': [], 'errors': []}
+
+def test_missing_optional_fields_use_training_means(client):
+    # the Bigs form has no C_BLK% / C_ORB% inputs
+    player = {k: v for k, v in PLAYER.items() if k not in ('C_BLK%', 'C_ORB%')}
+    body = single(client, {**player, 'Position Group': 'Bigs'})
+    assert body['imputed'] == ['C_BLK%', 'C_ORB%']
+
+    model = models['Bigs']
+    columns = list(model.feature_names_in_)
+    values, _ = parse_players([player])
+    X = derive_features(values)[columns]
+    X.loc[0, ['C_BLK%', 'C_ORB%']] = [feature_means['Bigs']['C_BLK%'], feature_means['Bigs']['C_ORB%']]
+    assert body['Predicted Score'] == pytest.approx(float(model.predict(X.to_numpy())[0]))
+
+    batch = client.post('/api/predict/batch', json={'players': [{**player, 'POS': 'C'}]}).get_json()
+    assert batch['predictions'][0]['imputed'] == ['C_BLK%', 'C_ORB%']
+    assert batch['predictions'][0]['Predicted Score'] == pytest.approx(body['Predicted Score'])
+
+def test_optional_fields_a_model_does_not_use_are_not_reported(client):
+    player = {k: v for k, v in PLAYER.items() if k not in OPTIONAL_FIELDS}
+    used = set(models['Guards'].feature_names_in_)
+    expected = [f for f, cols in OPTIONAL_FIELDS.items() if used & set(cols)]
+    assert single(client, {**player, 'POS': 'PG'})['imputed'] == expected
+
+def test_no_means_rejects_missing_optional_fields(client, monkeypatch):
+    monkeypatch.setattr(app_module, 'feature_means', {})
+    player = {k: v for k, v in PLAYER.items() if k != 'C_BLK%'}
+    resp = client.post('/api/predict', json={**player, 'Position Group': 'Bigs'})
+    assert resp.status_code == 400
+    assert 'C_BLK%' in resp.get_json()['error']
+    body = client.post('/api/predict/batch', json={'players': [{**player, 'POS': 'C'}]}).get_json()
+    assert body['predictions'][0]['Predicted Score'] is None
+    assert body['errors'] == [{'index': 0, 'missing': ['C_BLK%']}]
+
+def test_single_predict_errors(client):
+    assert client.post('/api/predict', json={**PLAYER, 'POS': 'QB'}).status_code == 400
+    assert client.post('/api/predict', json={**PLAYER, 'Position Group': 'Centers'}).status_code == 400
+    resp = client.post('/api/predict', json={'Position Group': 'Guards', 'Age': 20})
+    assert resp.status_code == 400
+    assert 'Height' in resp.get_json()['error']
+
+def test_derived_features_use_training_units():
+    values, errors = parse_players([PLAYER])
+    assert errors == []
+    row = derive_features(values).iloc[0]
+    assert row['Height'] == pytest.approx(80 * 2.54)
+    assert row['Weight'] == pytest.approx(215 * 0.45359237)
+    assert row['C_3P%'] == pytest.approx(0.365)
+    assert row['C_PTS/40'] == pytest.approx(16.4 * 40 / 30.5)
+    assert row['C_TS%'] == pytest.approx(16.4 / (2 * (12.1 + 0.44 * 5.0)))
+
+def test_derived_features_match_training_columns():
+    training = pd.read_csv(ROOT / 'data' / 'cleaned' / 'TRAINING.csv', nrows=1)
+    values, _ = parse_players([PLAYER])
+    for model in models.values():
+        assert set(model.feature_names_in_) <= set(derive_features(values).columns) & set(training.columns)
+
+def test_feature_means_are_current(tmp_path):
+    from models import loader
+    from models.means import TRAINING_CSV, export_means
+    for name in loader.MODEL_FILES.values():
+        shutil.copy(loader.get_models_dir() / f'{name}.json', tmp_path)
+    written = export_means(TRAINING_CSV, tmp_path)
+    assert json.loads(written.read_text()) == feature_means, \
+        "models/feature_means.json is stale; re-run python -m models.means"
@@ -0,0 +1,52 @@
+import os
+import shutil
+
+import joblib
+import numpy as np
+import pytest
+
+from models import loader
+from models.compact import CompactForest
+
+MODELS_DIR = loader.get_models_dir()
+
+@pytest.fixture
+def checkout(tmp_path, monkeypatch):
+    """
+    Copy of the models dir as a fresh clone leaves it: exports written
+    first, pickles last, so every pickle is newer than its export.
+    """
+    for name in loader.MODEL_FILES.values():
+        for suffix in ('.npy', '.json'):
+            shutil.copy(MODELS_DIR / f'{name}{suffix}', tmp_path)
+    for name in loader.MODEL_FILES.values():
+        shutil.copy(MODELS_DIR / f'{name}.pkl', tmp_path)
+        later = os.stat(tmp_path / f'{name}.npy').st_mtime + 60
+        os.utime(tmp_path / f'{name}.pkl', (later, later))
+    monkeypatch.setattr(loader, 'get_models_dir', lambda: tmp_path)
+    return tmp_path
+
+def test_fresh_checkout_loads_compact_forests(checkout):
+    loaded = loader.load_models()
+    assert all(isinstance(m, CompactForest) for m in loaded.values())
+
+def test_retrained_pickle_falls_back(checkout):
+    with open(checkout / 'bigs.pkl', 'ab') as f:
+        f.write(b'\0')  # pickle no longer matches the exported hash
+    model, path = loader.load_model(checkout, 'bigs')
+    assert path.suffix == '.pkl'
+    assert not isinstance(model, CompactForest)
+
+@pytest.mark.parametrize('name', list(loader.MODEL_FILES.values()))
+def test_compact_matches_sklearn(name):
+    forest = joblib.load(MODELS_DIR / f'{name}.pkl')
+    compact = CompactForest(MODELS_DIR / f'{name}.npy')
+    assert list(compact.feature_names_in_) == list(forest.feature_names_in_)
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(200, forest.n_features_in_)) * 20 + 10
+    np.testing.assert_array_equal(compact.predict(X), forest.predict(X))
+
+def test_compact_rejects_wrong_width():
+    compact = CompactForest(MODELS_DIR / 'bigs.npy')
+    with pytest.raises(ValueError):
+        compact.predict(np.zeros((1, compact.n_features_in_ + 1)))
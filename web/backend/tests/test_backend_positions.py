@@ -0,0 +1,20 @@
+from pathlib import Path
+
+import pandas as pd
+
+import positions
+
+ROOT = Path(__file__).resolve().parents[3]
+
+def test_vendored_copy_matches_training():
+    vendored = Path(positions.__file__).read_text()
+    assert vendored == (ROOT / 'training' / 'positions.py').read_text(), \
+        "web/backend/positions.py has drifted; copy training/positions.py over it"
+
+def test_imported_from_backend():
+    assert Path(positions.__file__).resolve().parent == ROOT / 'web' / 'backend'
+
+def test_classify_routes_like_classify_one():
+    pos = pd.Series(['PG', 'SG,SF', 'F-C', 'PF', None, 'C', 'SF'])
+    groups = positions.classify(pos).astype(object)
+    assert list(groups.where(groups.notna(), None)) == [positions.classify_one(p) for p in pos]
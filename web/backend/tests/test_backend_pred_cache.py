@@ -0,0 +1,85 @@
+import numpy as np
+import pytest
+
+import app as app_module
+import pred_cache
+from models import reload_models
+from pred_cache import PredictionCache
+
+from test_backend_batch import PLAYER
+
+class CountingModel:
+    def __init__(self):
+        self.calls = 0
+
+    def predict(self, X):
+        self.calls += 1
+        return np.asarray(X).sum(axis=1)
+
+def test_hit_on_equal_rounded_features():
+    cache, model = PredictionCache(decimals=4), CountingModel()
+    assert cache.get_or_predict('Guards', 'v1', [1.0, 2.0], model.predict) == 3.0
+    assert cache.get_or_predict('Guards', 'v1', [1.00001, 2.0], model.predict) == 3.0
+    assert cache.get_or_predict('Guards', 'v1', [-0.0, 3.0], model.predict) == 3.0
+    assert cache.get_or_predict('Guards', 'v1', [0.0, 3.0], model.predict) == 3.0
+    assert model.calls == 2
+    assert cache.stats() == {'hits': 2, 'misses': 2, 'hit_rate': 0.5, 'entries': 2}
+
+class ThresholdModel:
+    """
+    Splits between two inputs that round to the same key.
+    """
+    def predict(self, X):
+        return np.where(np.asarray(X)[:, 0] <= 1.00002, 1.0, 2.0)
+
+@pytest.mark.parametrize('order', [(1.00001, 1.00003), (1.00003, 1.00001)])
+def test_score_does_not_depend_on_arrival_order(order):
+    cache, model = PredictionCache(decimals=4), ThresholdModel()
+    scores = [cache.get_or_predict('Guards', 'v1', [x], model.predict) for x in order]
+    assert scores == [1.0, 1.0]     # both score as the rounded 1.0
+
+def test_group_and_version_are_part_of_the_key():
+    cache, model = PredictionCache(), CountingModel()
+    for group, version in [('Guards', 'v1'), ('Bigs', 'v1'), ('Guards', 'v2')]:
+        cache.get_or_predict(group, version, [1.0], model.predict)
+    assert model.calls == 3
+
+def test_lru_eviction():
+    cache, model = PredictionCache(max_entries=2), CountingModel()
+    for x in (1.0, 2.0, 1.0, 3.0):   # 2.0 is least recently used when 3.0 arrives
+        cache.get_or_predict('Guards', 'v1', [x], model.predict)
+    cache.get_or_predict('Guards', 'v1', [1.0], model.predict)
+    assert model.calls == 3
+    cache.get_or_predict('Guards', 'v1', [2.0], model.predict)
+    assert model.calls == 4
+
+def test_entries_expire(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(pred_cache.time, 'monotonic', lambda: now[0])
+    cache, model = PredictionCache(ttl=10), CountingModel()
+    cache.get_or_predict('Guards', 'v1', [1.0], model.predict)
+    now[0] += 9
+    cache.get_or_predict('Guards', 'v1', [1.0], model.predict)
+    now[0] += 2
+    cache.get_or_predict('Guards', 'v1', [1.0], model.predict)
+    assert model.calls == 2
+
+@pytest.fixture
+def fresh_cache(monkeypatch):
+    cache = PredictionCache()
+    monkeypatch.setattr(app_module, 'prediction_cache', cache)
+    return cache
+
+def test_endpoint_serves_repeats_from_cache(client, fresh_cache):
+    first = client.post('/api/predict', json={**PLAYER, 'POS': 'PG'}).get_json()
+    # same inputs in a different key order and spelled as a group
+    again = client.post('/api/predict', json={'Position Group': 'Guards', **dict(reversed(PLAYER.items()))}).get_json()
+    assert again == first
+    stats = client.get('/api/predict/cache').get_json()
+    assert (stats['hits'], stats['misses'], stats['entries']) == (1, 1, 1)
+
+def test_reload_clears_the_cache(client):
+    client.post('/api/predict', json={**PLAYER, 'POS': 'PG'})
+    assert app_module.prediction_cache.stats()['entries'] > 0
+    reload_models()
+    assert app_module.prediction_cache.stats()['entries'] == 0
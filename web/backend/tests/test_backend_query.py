@@ -0,0 +1,71 @@
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import app as app_module
+from results_store import MAX_LIMIT
+
+RESULTS_CSV = Path(app_module.__file__).parent / 'results.csv'
+
+@pytest.fixture(scope='module')
+def df():
+    return pd.read_csv(RESULTS_CSV)
+
+def records(frame):
+    return frame.replace({np.nan: None}).to_dict(orient='records')
+
+def get(client, query):
+    resp = client.get(f'/api/results?{query}')
+    assert resp.status_code == 200, resp.get_json()
+    return resp.get_json(), int(resp.headers['X-Total-Count'])
+
+def test_pages_cover_the_year_in_file_order(client, df):
+    year = df[df['Draft Year'] == 2015]
+    pages = [get(client, f'year=2015&limit=20&page={p}') for p in (1, 2, 3, 4)]
+    assert [total for _, total in pages] == [len(year)] * 4
+    assert [len(rows) for rows, _ in pages] == [20, 20, len(year) - 40, 0]
+    assert sum((rows for rows, _ in pages), []) == records(year)
+
+def test_limit_is_capped(client, df):
+    rows, total = get(client, 'page=1')
+    assert total == len(df)
+    assert len(rows) == min(len(df), MAX_LIMIT)
+    rows, _ = get(client, f'limit={MAX_LIMIT * 10}')
+    assert len(rows) == min(len(df), MAX_LIMIT)
+
+@pytest.mark.parametrize('column', ['Predicted Score', 'Actual Tier', 'Name'])
+@pytest.mark.parametrize('desc', [False, True])
+def test_sort_is_stable_with_missing_last(client, df, column, desc):
+    rows, _ = get(client, f"sort={'-' if desc else ''}{column}&limit=1000")
+    expected = df.sort_values(column, ascending=not desc, kind='stable', na_position='last')
+    assert rows == records(expected)[:1000]
+
+def test_filters(client, df):
+    rows, total = get(client, 'year=2012&group=guards,Wing&tier_min=2&tier_max=5&score_min=3')
+    mask = ((df['Draft Year'] == 2012) & df['Position Group'].isin(['Guard', 'Wing'])
+            & df['Actual Tier'].between(2, 5) & (df['Predicted Score'] >= 3))
+    assert total == mask.sum() > 0
+    assert rows == records(df[mask])
+
+def test_unlabelled_rows_drop_out_of_tier_ranges(client, df):
+    _, total = get(client, 'tier_min=0')
+    assert total == df['Actual Tier'].notna().sum() < len(df)
+
+def test_field_projection(client, df):
+    rows, _ = get(client, 'fields=Name,Predicted Score&sort=-Predicted Score&limit=3')
+    top = df.sort_values('Predicted Score', ascending=False, kind='stable').head(3)
+    assert rows == records(top[['Name', 'Predicted Score']])
+
+@pytest.mark.parametrize('query', [
+    'sort=Height', 'fields=Name,Salary', 'page=0', 'limit=0', 'page=two', 'tier_min=high',
+])
+def test_bad_queries(client, query):
+    resp = client.get(f'/api/results?{query}')
+    assert resp.status_code == 400
+    assert 'error' in resp.get_json()
+
+def test_plain_year_request_still_uses_the_blob(client):
+    resp = client.get('/api/results?year=2015')
+    assert 'ETag' in resp.headers and 'X-Total-Count' not in resp.headers
@@ -0,0 +1,87 @@
+import gzip
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+import app as app_module
+import results_store
+
+RESULTS_CSV = Path(app_module.__file__).parent / 'results.csv'
+
+@pytest.fixture(scope='module')
+def rows():
+    return pd.read_csv(RESULTS_CSV).replace({float('nan'): None}).to_dict(orient='records')
+
+def test_all_years(client, rows):
+    resp = client.get('/api/results')
+    assert resp.status_code == 200
+    assert resp.get_json() == rows
+
+def test_one_year(client, rows):
+    assert client.get('/api/results?year=2015').get_json() == [r for r in rows if r['Draft Year'] == 2015]
+    assert client.get('/api/results?year=1950').get_json() == []
+
+def test_unparseable_year_returns_everything(client, rows):
+    assert len(client.get('/api/results?year=abc').get_json()) == len(rows)
+
+def test_compressed_variants(client):
+    plain = client.get('/api/results?year=2015')
+    resp = client.get('/api/results?year=2015', headers={'Accept-Encoding': 'gzip, deflate'})
+    assert resp.headers['Content-Encoding'] == 'gzip'
+    assert resp.headers['Vary'] == 'Accept-Encoding'
+    assert gzip.decompress(resp.data) == plain.data
+
+def test_etag_per_encoding(client):
+    plain = client.get('/api/results?year=2015').headers['ETag']
+    gz = client.get('/api/results?year=2015', headers={'Accept-Encoding': 'gzip'}).headers['ETag']
+    assert plain != gz
+    assert gz == plain[:-1] + '-gz"'
+
+@pytest.mark.parametrize('encoding', [None, 'gzip'])
+def test_not_modified(client, encoding):
+    headers = {'Accept-Encoding': encoding} if encoding else {}
+    etag = client.get('/api/results?year=2016', headers=headers).headers['ETag']
+    resp = client.get('/api/results?year=2016', headers={**headers, 'If-None-Match': etag})
+    assert resp.status_code == 304
+    assert resp.data == b''
+    assert resp.headers['ETag'] == etag
+
+def test_etag_of_another_encoding_is_not_a_match(client):
+    etag = client.get('/api/results?year=2016').headers['ETag']
+    resp = client.get('/api/results?year=2016', headers={'Accept-Encoding': 'gzip', 'If-None-Match': etag})
+    assert resp.status_code == 200
+    assert resp.headers['Content-Encoding'] == 'gzip'
+
+def test_etag_changes_with_content(client):
+    years = {client.get(f'/api/results?year={y}').headers['ETag'] for y in (2011, 2012, 2013)}
+    assert len(years) == 3
+
+def test_blob_prefers_brotli():
+    blob = results_store.Blob(b'[]\n')
+    assert blob.pick('identity') == (None, blob.etags[None], b'[]\n')
+    assert blob.pick('gzip;q=1.0')[0] == 'gzip'
+    if 'br' in blob.encoded:
+        assert blob.pick('gzip, br')[:2] == ('br', blob.etags['br'])
+
+@pytest.mark.parametrize('header, expected', [
+    ('br;q=0, gzip', 'gzip'),
+    ('gzip;q=0', None),
+    ('GZIP; q=0.5', 'gzip'),
+    ('gzip, br;q=0.1', 'br'),
+    ('br;q=0.0, gzip;q=0', None),
+    ('gzip;q=bad', None),
+])
+def test_q_zero_refuses_a_coding(header, expected):
+    blob = results_store.Blob(b'[]\n')
+    blob.encoded.setdefault('br', b'br-body')   # whether or not brotli is installed
+    assert blob.pick(header)[0] == expected
+
+def test_refused_coding_is_not_served(client):
+    resp = client.get('/api/results?year=2015', headers={'Accept-Encoding': 'br;q=0, gzip;q=0'})
+    assert 'Content-Encoding' not in resp.headers
+
+def test_body_is_what_jsonify_would_send(client, rows):
+    with app_module.app.test_request_context():
+        expected = app_module.jsonify(rows).get_data()
+    assert client.get('/api/results').data == expected
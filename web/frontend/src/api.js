@@ -4,5 +4,14 @@ const BASE = 'http://127.0.0.1:5000/api';
 export const fetchAllResults = () =>
   axios.get(`${BASE}/results`);
 
+// params: { year, page, limit, sort ('-col' for descending), group,
+//           tier_min, tier_max, score_min, score_max, fields }
+// total matches come back in the X-Total-Count header
+export const fetchResults = params =>
+  axios.get(`${BASE}/results`, { params });
+
 export const predict = data =>
   axios.post(`${BASE}/predict`, data);
+
+export const predictBatch = players =>
+  axios.post(`${BASE}/predict/batch`, { players });